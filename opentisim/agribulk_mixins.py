@@ -4,6 +4,7 @@
 - history_properties_mixin
 - hascapex_properties_mixin
 - hasopex_properties_mixin
+- hascashflow_properties_mixin
 - hasrevenue_properties_mixin
 - hastriggers_properties_mixin
 - quay_wall_properties_mixin
@@ -28,6 +29,9 @@ import pandas as pd
 
 import matplotlib.pyplot as plt
 
+# opentisim package
+from opentisim import scenarios
+
 
 class identifiable_properties_mixin(object):
     """Something that has a name and id
@@ -85,6 +89,19 @@ class hasopex_properties_mixin(object):
         self.residual = residual
 
 
+class hascashflow_properties_mixin(object):
+    """Something has cash flows registered in the ledger of a System
+
+    df: read-only dataframe with the yearly cash flows of the element"""
+
+    @property
+    def df(self):
+        ledger = self.__dict__.get('_ledger')
+        if ledger is None:
+            raise AttributeError("'{}' object has no cash flows registered".format(type(self).__name__))
+        return ledger.frame(self)
+
+
 class hasrevenue_properties_mixin(object):
     """Something has Revenue
 
@@ -312,23 +329,78 @@ class hasscenario_properties_mixin(object):
         self.historic_data = historic_data
         self.scenario_data = scenario_data
 
-    def scenario_random(self, startyear=2019, lifecycle=20, rate=1.02, mu=0.01, sigma=0.065):
-        """trend generated from random growth rate increments"""
-        # package(s) used for probability
+    @property
+    def scenario_data(self):
+        # a scenario bound to a scenario bank is only turned into a dataframe when it is asked for
+        if self._scenario_data is None and self._scenario_bank is not None:
+            bank, path = self._scenario_bank
+            self._scenario_data = pd.DataFrame(data={'year': bank.years, 'volume': bank[path]})
+        return self._scenario_data
+
+    @scenario_data.setter
+    def scenario_data(self, scenario_data):
+        # reassigning the scenario resets the year index of scenario_volume
+        self._scenario_data = scenario_data
+        self._scenario_bank = None
+        self._scenario_volumes = None
+        self.scenario_revision = getattr(self, 'scenario_revision', -1) + 1
+
+    def bind_scenario(self, bank, path):
+        """use a path of a scenarios.ScenarioBank as scenario, scenario_volume reads the volumes directly from the
+        (memory-mapped) bank"""
+        self._scenario_data = None
+        self._scenario_bank = bank, path
+        self._scenario_volumes = bank.years[0], bank[path], np.ones(len(bank.years), dtype=bool)
+        self.scenario_revision += 1
+
+    def scenario_volume(self, year):
+        """volume of the scenario in a given year
+
+        The volumes are indexed per year the first time they are asked for, so the lookup does not filter
+        scenario_data (changes made to scenario_data in place require it to be reassigned). Like
+        scenario_data.loc[scenario_data['year'] == year]['volume'].item() this raises a ValueError if the
+        year is not in the scenario exactly once."""
+
+        if self._scenario_volumes is None:
+            first_year, volumes, unique = 0, np.zeros(0), np.zeros(0, dtype=bool)
+            if len(self._scenario_data):
+                years = self._scenario_data['year'].to_numpy(dtype=int)
+                first_year = years.min()
+                counts = np.bincount(years - first_year)
+                volumes = np.zeros(len(counts), dtype=self._scenario_data['volume'].dtype)
+                volumes[years - first_year] = self._scenario_data['volume'].to_numpy()
+                unique = counts == 1
+            self._scenario_volumes = first_year, volumes, unique
+
+        first_year, volumes, unique = self._scenario_volumes
+        index = year - first_year
+        if not (0 <= index < len(volumes) and unique[index]):
+            raise ValueError('no unique scenario volume for year {}'.format(year))
+
+        return volumes[index].item()
+
+    def scenario_random(self, startyear=2019, lifecycle=20, rate=1.02, mu=0.01, sigma=0.065, seed=None):
+        """trend generated from random growth rate increments
+
+        seed: seed, numpy.random.Generator or scenarios.Antithetic generator to draw from (None draws from the global
+              numpy.random state)"""
         years = range(startyear, startyear + lifecycle)
-        volume = self.historic_data[self.historic_data.year == startyear - 1].volume.item()
 
-        volumes = []
-        for year in years:
-            change = np.random.normal(mu, sigma, 1)
-            new_rate = rate + change
-            volume = volume * new_rate
-            volumes.append(np.int(volume))
+        volumes = self.scenario_paths(1, startyear, lifecycle, rate, mu, sigma, seed)[0]
 
         scenario_data = {'year': years, 'volume': volumes}
 
         self.scenario_data = pd.DataFrame(data=scenario_data)
 
+    def scenario_paths(self, n, startyear=2019, lifecycle=20, rate=1.02, mu=0.01, sigma=0.065, seed=None):
+        """n trends generated from random growth rate increments, starting from the historic volume of the year
+        before startyear (see scenarios.random_growth)
+
+        returns an integer array of shape (n x lifecycle)"""
+        volume = self.historic_data[self.historic_data.year == startyear - 1].volume.item()
+
+        return scenarios.random_growth(volume, lifecycle, n, rate, mu, sigma, seed)
+
     def plot_demand(self, width=0.1, alpha=0.6, fontsize=20):
         """generate a histogram of the demand data"""
         # generate plot
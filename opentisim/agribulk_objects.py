@@ -36,6 +36,7 @@ Quay_wall = type('Quay_wall', (agribulk_mixins.identifiable_properties_mixin,  #
                                agribulk_mixins.history_properties_mixin,  # Give it procurement history
                                agribulk_mixins.hascapex_properties_mixin,  # Give it capex info
                                agribulk_mixins.hasopex_properties_mixin,  # Give it opex info
+                               agribulk_mixins.hascashflow_properties_mixin,  # Give it a cash flow view
                                agribulk_mixins.hasrevenue_properties_mixin,  # Give it revenue info
                                agribulk_mixins.hastriggers_properties_mixin),  # Give it investment triggers (lambda?)
                  {})  # The dictionary is empty because the site type is generic
@@ -46,6 +47,7 @@ Berth = type('Berth', (agribulk_mixins.identifiable_properties_mixin,  # Give it
                        agribulk_mixins.berth_properties_mixin,
                        agribulk_mixins.hascapex_properties_mixin,  # Give it capex info
                        agribulk_mixins.hasopex_properties_mixin,  # Give it opex info
+                       agribulk_mixins.hascashflow_properties_mixin,  # Give it a cash flow view
                        agribulk_mixins.hasrevenue_properties_mixin,  # Give it revenue info
                        agribulk_mixins.hastriggers_properties_mixin),  # Give it investment triggers (lambda?)
              {})  # The dictionary is empty because the site type is generic
@@ -59,6 +61,7 @@ Cyclic_Unloader = type('Cyclic_Unloader', (agribulk_mixins.identifiable_properti
                                            agribulk_mixins.cyclic_properties_mixin,
                                            agribulk_mixins.hascapex_properties_mixin,  # Give it capex info
                                            agribulk_mixins.hasopex_properties_mixin,  # Give it opex info
+                                           agribulk_mixins.hascashflow_properties_mixin,  # Give it a cash flow view
                                            agribulk_mixins.hasrevenue_properties_mixin,  # Give it revenue info
                                            agribulk_mixins.hastriggers_properties_mixin),
                        # Give it investment triggers (lambda?)
@@ -71,6 +74,7 @@ Continuous_Unloader = type('Continuous_Unloader', (agribulk_mixins.identifiable_
                                                    agribulk_mixins.continuous_properties_mixin,
                                                    agribulk_mixins.hascapex_properties_mixin,  # Give it capex info
                                                    agribulk_mixins.hasopex_properties_mixin,  # Give it opex info
+                                                   agribulk_mixins.hascashflow_properties_mixin,  # Give it a cash flow view
                                                    agribulk_mixins.hasrevenue_properties_mixin,  # Give it revenue info
                                                    agribulk_mixins.hastriggers_properties_mixin),
                            # Give it investment triggers (lambda?)
@@ -84,6 +88,7 @@ Conveyor_Quay = type('Conveyor_Quay', (agribulk_mixins.identifiable_properties_m
                              agribulk_mixins.conveyor_properties_mixin,
                              agribulk_mixins.hascapex_properties_mixin,  # Give it capex info
                              agribulk_mixins.hasopex_properties_mixin,  # Give it opex info
+                             agribulk_mixins.hascashflow_properties_mixin,  # Give it a cash flow view
                              agribulk_mixins.hasrevenue_properties_mixin,  # Give it revenue info
                              agribulk_mixins.hastriggers_properties_mixin),  # Give it investment triggers (lambda?)
                 {})  # The dictionary is empty because the site type is generic
@@ -93,6 +98,7 @@ Conveyor_Hinter = type('Conveyor_Hinter', (agribulk_mixins.identifiable_properti
                              agribulk_mixins.conveyor_properties_mixin,
                              agribulk_mixins.hascapex_properties_mixin,  # Give it capex info
                              agribulk_mixins.hasopex_properties_mixin,  # Give it opex info
+                             agribulk_mixins.hascashflow_properties_mixin,  # Give it a cash flow view
                              agribulk_mixins.hasrevenue_properties_mixin,  # Give it revenue info
                              agribulk_mixins.hastriggers_properties_mixin),  # Give it investment triggers (lambda?)
                 {})  # The dictionary is empty because the site type is generic
@@ -105,13 +111,15 @@ Storage = type('Storage', (agribulk_mixins.identifiable_properties_mixin,  # Giv
                            agribulk_mixins.storage_properties_mixin,
                            agribulk_mixins.hascapex_properties_mixin,  # Give it capex info
                            agribulk_mixins.hasopex_properties_mixin,  # Give it opex info
+                           agribulk_mixins.hascashflow_properties_mixin,  # Give it a cash flow view
                            agribulk_mixins.hasrevenue_properties_mixin,  # Give it revenue info
                            agribulk_mixins.hastriggers_properties_mixin),  # Give it investment triggers (lambda?)
                {})  # The dictionary is empty because the site type is generic
 
 # define loading station class functions **will ultimately be placed in package**
 Unloading_station = type('Unloading_station', (agribulk_mixins.identifiable_properties_mixin,  # Give it a name
-                                               agribulk_mixins.unloading_station_properties_mixin),
+                                               agribulk_mixins.unloading_station_properties_mixin,
+                                               agribulk_mixins.hascashflow_properties_mixin),  # Give it a cash flow view
                          {})  # The dictionary is empty because the site type is generic
 
 # The generic Commodity class
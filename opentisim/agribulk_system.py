@@ -1,4 +1,6 @@
 # package(s) for data handling
+import copy
+
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -8,6 +10,9 @@ import matplotlib
 from opentisim.agribulk_objects import *
 from opentisim import agribulk_defaults
 from opentisim import core
+from opentisim.ledger import CashflowLedger
+from opentisim.element_store import ElementStore
+from opentisim.trace import DecisionTrace
 
 
 class System:
@@ -15,10 +20,11 @@ class System:
     The module allows variation of the type of quay crane used and the type of storage used. Terminal development is
     governed by three triggers: the allowable berth occupancy, the allowable dwell time and the allowable station
     occupancy."""
-    def __init__(self, startyear=2019, lifecycle=20, operational_hours=5840, debug=False, elements=[],
+    def __init__(self, startyear=2019, lifecycle=20, operational_hours=5840, debug=False, elements=None,
                  crane_type_defaults=agribulk_defaults.mobile_crane_data,
                  storage_type_defaults=agribulk_defaults.silo_data,
-                 allowable_waiting_service_time_ratio=0.3, allowable_berth_occupancy=0.4, allowable_dwelltime=18 / 365, allowable_station_occupancy=0.4):
+                 allowable_waiting_service_time_ratio=0.3, allowable_berth_occupancy=0.4, allowable_dwelltime=18 / 365, allowable_station_occupancy=0.4,
+                 trace=None):
         # time inputs
         self.startyear = startyear
         self.lifecycle = lifecycle
@@ -27,8 +33,15 @@ class System:
         # provide intermediate outputs via print statements if debug = True
         self.debug = debug
 
-        # collection of all terminal objects
-        self.elements = elements
+        # record of the investment decisions (see trace.DecisionTrace), None records nothing; with debug = True and
+        # without a trace the investment decisions are printed through a trace that echoes them
+        self.trace = DecisionTrace(echo=True) if trace is None and debug else trace
+
+        # collection of all terminal objects (indexed per class, see find_elements)
+        self.elements = ElementStore(elements if elements is not None else [])
+
+        # cash flows of all terminal elements (elements x years x categories)
+        self.ledger = CashflowLedger(startyear, lifecycle)
 
         # default values to use in case various types can be selected
         self.crane_type_defaults = crane_type_defaults
@@ -43,8 +56,13 @@ class System:
         # storage variables for revenue
         self.revenues = []
 
+        # vessel calls and berth and station occupancies per year, calculated once and recalculated when a crane,
+        # berth, station or vessel is added or the demand (scenario_data of the commodities) changes
+        self.occupancy = {}
+        self._occupancy_signature = None
+
     # *** Overall terminal investment strategy for terminal class.
-    def simulate(self):
+    def simulate(self, year_from=None, year_to=None):
         """The 'simulate' method implements the terminal investment strategy for this terminal class.
 
         This method automatically generates investment decisions, parametrically derived from overall demand trends and
@@ -73,9 +91,22 @@ class System:
            6. collect all cash flows (capex, opex, revenues)
            7. calculate PV's and aggregate to NPV
 
+        The investment loop (steps 1 and 2) can be limited to the years year_from up to year_to. Steps 3 to 7 are only
+        carried out once the loop has reached the end of the lifecycle. This allows to simulate a terminal up to year
+        K, fork it (see fork) and resume each fork from year K with its own demand scenario:
+
+           terminal.simulate(year_to=K)
+           branch = terminal.fork()
+           branch.simulate(year_from=K)
+
         """
 
-        for year in range(self.startyear, self.startyear + self.lifecycle):
+        if year_from is None:
+            year_from = self.startyear
+        if year_to is None:
+            year_to = self.startyear + self.lifecycle
+
+        for year in range(year_from, year_to):
             """
             The simulate method is designed according to the following overall objectives for the terminal:
             - strategic objective: To maintain a profitable enterprise (NPV > 0) over the terminal lifecycle
@@ -87,7 +118,7 @@ class System:
                 print('### Simulate year: {} ############################'.format(year))
 
             # 1. for each year estimate the anticipated vessel arrivals based on the expected demand
-            handysize, handymax, panamax, total_calls, total_vol = self.calculate_vessel_calls(year)
+            handysize, handymax, panamax, total_calls, total_vol = self.vessel_calls(year)
             if self.debug:
                 print('--- Cargo volume and vessel calls for {} ---------'.format(year))
                 print('  Total cargo volume: {}'.format(total_vol))
@@ -120,6 +151,10 @@ class System:
                 print('$$$ Check unloading station (coupled with quay cranes) ----------------')
             self.unloading_station_invest(year)
 
+        # the remainder of the lifecycle is simulated when the terminal is resumed
+        if year_to < self.startyear + self.lifecycle:
+            return
+
         # 3. for each year calculate the energy costs (requires insight in realized demands)
         for year in range(self.startyear, self.startyear + self.lifecycle):
             self.calculate_energy_cost(year)
@@ -138,7 +173,13 @@ class System:
         # cash_flows, cash_flows_WACC_real = core.add_cashflow_elements(self)
 
         # 7. calculate PV's and aggregate to NPV
-        core.NPV(self,  Labour(**agribulk_defaults.labour_data))
+        return core.NPV(self,  Labour(**agribulk_defaults.labour_data))
+
+    def fork(self):
+        """Return an independent copy of the terminal, including its elements, cash flows, demurrage and revenues.
+        Forking a partially simulated terminal allows to branch it into several futures (see simulate)."""
+
+        return copy.deepcopy(self)
 
     # *** Individual investment methods for terminal elements
     def berth_invest(self, year, handysize, handymax, panamax):
@@ -176,7 +217,7 @@ class System:
 
         # calculate berth occupancy
         berth_occupancy_planned, berth_occupancy_online, crane_occupancy_planned, crane_occupancy_online = \
-            self.calculate_berth_occupancy(year, handysize, handymax, panamax)
+            self.berth_occupancy(year, handysize, handymax, panamax)
         berths = len(core.find_elements(self, Berth))
 
         if berths != 0:
@@ -217,14 +258,15 @@ class System:
 
             # while planned berth occupancy is too large add a berth when no crane slots are available
             if not (self.check_crane_slot_available()):
-                if self.debug:
-                    print('  *** add Berth to elements')
                 berth = Berth(**agribulk_defaults.berth_data)
                 berth.year_online = year + berth.delivery_time
                 self.elements.append(berth)
+                if self.trace is not None:
+                    self.trace.record(year, 'waiting_service_time_ratio', planned_waiting_service_time_ratio,
+                                      self.allowable_waiting_service_time_ratio, berth)
 
                 berth_occupancy_planned, berth_occupancy_online, crane_occupancy_planned, crane_occupancy_online = \
-                    self.calculate_berth_occupancy(year, handysize, handymax, panamax)
+                    self.berth_occupancy(year, handysize, handymax, panamax)
                 berths = len(core.find_elements(self, Berth))
                 planned_waiting_service_time_ratio = core.occupancy_to_waitingfactor(occupancy=berth_occupancy_planned,
                                                                                  nr_of_servers_chk=berths, poly_order=6)
@@ -257,9 +299,11 @@ class System:
                 quay_wall = Quay_wall(**agribulk_defaults.quay_wall_data)
                 depth = np.sum([draft, quay_wall.max_sinkage, quay_wall.wave_motion, quay_wall.safety_margin])
                 self.quay_invest(year, length, depth)
+                if self.trace is not None:
+                    self.trace.record(year, 'berths', berths, quay_walls, Quay_wall)
 
                 berth_occupancy_planned, berth_occupancy_online, crane_occupancy_planned, crane_occupancy_online = \
-                    self.calculate_berth_occupancy(year, handysize, handymax, panamax)
+                    self.berth_occupancy(year, handysize, handymax, panamax)
                 berths = len(core.find_elements(self, Berth))
                 planned_waiting_service_time_ratio = core.occupancy_to_waitingfactor(occupancy=berth_occupancy_planned,
                                                                                  nr_of_servers_chk=berths, poly_order=6)
@@ -271,9 +315,12 @@ class System:
             # while planned berth occupancy is too large add a crane if a crane is needed
             if self.check_crane_slot_available():
                 self.crane_invest(year)
+                if self.trace is not None:
+                    self.trace.record(year, 'waiting_service_time_ratio', planned_waiting_service_time_ratio,
+                                      self.allowable_waiting_service_time_ratio, self.elements[-1])
 
                 berth_occupancy_planned, berth_occupancy_online, crane_occupancy_planned, crane_occupancy_online = \
-                    self.calculate_berth_occupancy(year, handysize, handymax, panamax)
+                    self.berth_occupancy(year, handysize, handymax, panamax)
                 berths = len(core.find_elements(self, Berth))
                 planned_waiting_service_time_ratio = core.occupancy_to_waitingfactor(occupancy=berth_occupancy_planned,
                                                                                  nr_of_servers_chk=berths, poly_order=6)
@@ -299,8 +346,6 @@ class System:
               - quay_wall.freeboard must be high enough to accommodate largest expected vessel
         """
 
-        if self.debug:
-            print('  *** add Quay to elements')
         # add a Quay_wall element
         quay_wall = Quay_wall(**agribulk_defaults.quay_wall_data)
 
@@ -332,8 +377,6 @@ class System:
         """
 
 
-        if self.debug:
-            print('  *** add Harbour crane to elements')
         # add unloader object
         if (self.crane_type_defaults["crane_type"] == 'Gantry crane' or
                 self.crane_type_defaults["crane_type"] == 'Harbour crane' or
@@ -390,14 +433,8 @@ class System:
         """
 
         # find the total quay_conveyor capacity
-        quay_conveyor_capacity_planned = 0
-        quay_conveyor_capacity_online = 0
-        list_of_elements = core.find_elements(self, Conveyor_Quay)
-        if list_of_elements != []:
-            for element in list_of_elements:
-                quay_conveyor_capacity_planned += element.capacity_steps
-                if year >= element.year_online:
-                    quay_conveyor_capacity_online += element.capacity_steps
+        quay_conveyor_capacity_planned = core.planned_elements(self, Conveyor_Quay, 'capacity_steps')
+        quay_conveyor_capacity_online = core.online_elements(self, Conveyor_Quay, year, 'capacity_steps')
 
         if self.debug:
             print('     a total of {} ton of quay conveyor service capacity is online; {} ton still pending'.format(
@@ -413,8 +450,6 @@ class System:
         # check if total planned capacity of the quay conveyor is smaller than planned capacity of the quay cranes,
         # if so add a conveyor
         while quay_conveyor_capacity_planned < quay_crane_service_rate_planned:
-            if self.debug:
-                print('  *** add Quay Conveyor to elements')
             conveyor_quay = Conveyor_Quay(**agribulk_defaults_quay_conveyor_data)
 
             # - capex
@@ -458,6 +493,9 @@ class System:
             conveyor_quay = core.add_cashflow_data_to_element(self, conveyor_quay)
 
             self.elements.append(conveyor_quay)
+            if self.trace is not None:
+                self.trace.record(year, 'quay_conveyor_capacity', quay_conveyor_capacity_planned,
+                                  quay_crane_service_rate_planned, conveyor_quay)
 
             quay_conveyor_capacity_planned += conveyor_quay.capacity_steps
 
@@ -497,9 +535,9 @@ class System:
             print('     a total of {} ton of {} storage capacity is online; {} ton still pending'.format(
                 storage_capacity_online, agribulk_defaults_storage_data['type'], storage_capacity-storage_capacity_online))
 
-        handysize, handymax, panamax, total_calls, total_vol = self.calculate_vessel_calls(year)
+        handysize, handymax, panamax, total_calls, total_vol = self.vessel_calls(year)
         berth_occupancy_planned, berth_occupancy_online, crane_occupancy_planned, crane_occupancy_online = \
-            self.calculate_berth_occupancy(year, handysize, handymax, panamax)
+            self.berth_occupancy(year, handysize, handymax, panamax)
 
         # here an important bug was fixed! Previous code took the max call size of all vessesls,
         # but it needs to take the max call size of the vessels that actually arrive
@@ -523,13 +561,11 @@ class System:
         commodities = core.find_elements(self, Commodity)
         if commodities != []:
             for commodity in commodities:
-                volume = commodity.scenario_data.loc[commodity.scenario_data['year'] == year]['volume'].item()
+                volume = commodity.scenario_volume(year)
                 storage_capacity_dwelltime = round((volume * 0.05) * 1.1)  # see IJzermans (2019) p.26
 
         # check if sufficient storage capacity is available
         while storage_capacity < max(max_vessel_call_size, storage_capacity_dwelltime):
-            if self.debug:
-                print('  *** add storage to elements')
 
             # add storage object
             storage = Storage(**agribulk_defaults_storage_data)
@@ -555,6 +591,9 @@ class System:
             storage = core.add_cashflow_data_to_element(self, storage)
 
             self.elements.append(storage)
+            if self.trace is not None:
+                self.trace.record(year, 'storage_capacity', storage_capacity,
+                                  max(max_vessel_call_size, storage_capacity_dwelltime), storage)
 
             storage_capacity += storage.capacity
 
@@ -574,7 +613,7 @@ class System:
         - add service capacity until service_trigger is no longer exceeded
         """
 
-        station_occupancy_planned, station_occupancy_online = self.calculate_station_occupancy(year)
+        station_occupancy_planned, station_occupancy_online = self.station_occupancy(year)
         train_calls = self.train_call(year)
 
         if self.debug:
@@ -584,8 +623,6 @@ class System:
 
         while station_occupancy_planned > self.allowable_station_occupancy:
             # add a station when station occupancy is too high
-            if self.debug:
-                print('  *** add unloading station to elements')
 
             station = Unloading_station(**agribulk_defaults.hinterland_station_data)
 
@@ -612,8 +649,11 @@ class System:
             station = core.add_cashflow_data_to_element(self, station)
 
             self.elements.append(station)
+            if self.trace is not None:
+                self.trace.record(year, 'station_occupancy', station_occupancy_planned,
+                                  self.allowable_station_occupancy, station)
 
-            station_occupancy_planned, station_occupancy_online = self.calculate_station_occupancy(year)
+            station_occupancy_planned, station_occupancy_online = self.station_occupancy(year)
 
     def conveyor_hinter_invest(self, year, agribulk_defaults_hinterland_conveyor_data):
         """
@@ -635,14 +675,8 @@ class System:
         """
 
         # find the total service rate
-        hinter_conveyor_capacity_planned = 0
-        hinter_conveyor_capacity_online = 0
-        list_of_elements_conveyor = core.find_elements(self, Conveyor_Hinter)
-        if list_of_elements_conveyor != []:
-            for element in list_of_elements_conveyor:
-                hinter_conveyor_capacity_planned += element.capacity_steps
-                if year >= element.year_online:
-                    hinter_conveyor_capacity_online += element.capacity_steps
+        hinter_conveyor_capacity_planned = core.planned_elements(self, Conveyor_Hinter, 'capacity_steps')
+        hinter_conveyor_capacity_online = core.online_elements(self, Conveyor_Hinter, year, 'capacity_steps')
 
         if self.debug:
             print(
@@ -659,8 +693,6 @@ class System:
 
         # check if the hinter conveyor capacity (planned) at least matches the station unloading rate (planned)
         while hinter_conveyor_capacity_planned < station_service_rate_planned:
-            if self.debug:
-                print('  *** add Hinter Conveyor to elements')
             conveyor_hinter = Conveyor_Hinter(**agribulk_defaults_hinterland_conveyor_data)
 
             # - capex
@@ -686,6 +718,9 @@ class System:
             conveyor_hinter = core.add_cashflow_data_to_element(self, conveyor_hinter)
 
             self.elements.append(conveyor_hinter)
+            if self.trace is not None:
+                self.trace.record(year, 'hinter_conveyor_capacity', hinter_conveyor_capacity_planned,
+                                  station_service_rate_planned, conveyor_hinter)
 
             hinter_conveyor_capacity_planned += conveyor_hinter.capacity_steps
 
@@ -704,10 +739,10 @@ class System:
         """
 
         energy = Energy(**agribulk_defaults.energy_data)
-        handysize, handymax, panamax, total_calls, total_vol = self.calculate_vessel_calls(year)
-        berth_occupancy_planned, berth_occupancy_online, crane_occupancy_planned, crane_occupancy_online = self.calculate_berth_occupancy(
+        handysize, handymax, panamax, total_calls, total_vol = self.vessel_calls(year)
+        berth_occupancy_planned, berth_occupancy_online, crane_occupancy_planned, crane_occupancy_online = self.berth_occupancy(
             year, handysize, handymax, panamax)
-        station_occupancy_planned, station_occupancy_online = self.calculate_station_occupancy(year)
+        station_occupancy_planned, station_occupancy_online = self.station_occupancy(year)
 
         # calculate crane energy
         list_of_elements_1 = core.find_elements(self, Cyclic_Unloader)
@@ -720,10 +755,10 @@ class System:
                 hours = self.operational_hours * crane_occupancy_online
 
                 if consumption * hours * energy.price != np.inf:
-                    element.df.loc[element.df['year'] == year, 'energy'] = consumption * hours * energy.price
+                    self.ledger.set(element, year, 'energy', consumption * hours * energy.price)
 
             else:
-                element.df.loc[element.df['year'] == year, 'energy'] = 0
+                self.ledger.set(element, year, 'energy', 0)
 
         # calculate Quay conveyor energy
         list_of_elements_quay = core.find_elements(self, Conveyor_Quay)
@@ -734,10 +769,10 @@ class System:
                 hours = self.operational_hours * crane_occupancy_online
 
                 if consumption * hours * energy.price != np.inf:
-                    element.df.loc[element.df['year'] == year, 'energy'] = consumption * hours * energy.price
+                    self.ledger.set(element, year, 'energy', consumption * hours * energy.price)
 
             else:
-                element.df.loc[element.df['year'] == year, 'energy'] = 0
+                self.ledger.set(element, year, 'energy', 0)
 
         # calculate storage energy
         list_of_elements_Storage = core.find_elements(self, Storage)
@@ -749,10 +784,10 @@ class System:
                 hours = self.operational_hours
 
                 if consumption * capacity * hours * energy.price != np.inf:
-                    element.df.loc[element.df['year'] == year, 'energy'] = consumption * capacity * hours * energy.price
+                    self.ledger.set(element, year, 'energy', consumption * capacity * hours * energy.price)
 
             else:
-                element.df.loc[element.df['year'] == year, 'energy'] = 0
+                self.ledger.set(element, year, 'energy', 0)
 
         # calculate hinterland conveyor energy
         list_of_elements_hinter = core.find_elements(self, Conveyor_Hinter)
@@ -763,33 +798,31 @@ class System:
                 hours = self.operational_hours * station_occupancy_online
 
                 if consumption * hours * energy.price != np.inf:
-                    element.df.loc[element.df['year'] == year, 'energy'] = consumption * hours * energy.price
+                    self.ledger.set(element, year, 'energy', consumption * hours * energy.price)
 
             else:
-                element.df.loc[element.df['year'] == year, 'energy'] = 0
+                self.ledger.set(element, year, 'energy', 0)
 
         # calculate hinterland station energy
-        station_occupancy_planned, station_occupancy_online = self.calculate_station_occupancy(year)
-
         list_of_elements_Station = core.find_elements(self, Unloading_station)
 
         for element in list_of_elements_Station:
             if year >= element.year_online:
 
                 if element.consumption * self.operational_hours * station_occupancy_online * energy.price != np.inf:
-                    element.df.loc[element.df['year'] == year, 'energy'
-                    ] = element.consumption * self.operational_hours * station_occupancy_online * energy.price
+                    self.ledger.set(element, year, 'energy',
+                                    element.consumption * self.operational_hours * station_occupancy_online * energy.price)
 
             else:
-                element.df.loc[element.df['year'] == year, 'energy'] = 0
+                self.ledger.set(element, year, 'energy', 0)
 
     def calculate_demurrage_cost(self, year):
 
         """Find the demurrage cost per type of vessel and sum all demurrage cost"""
 
-        handysize_calls, handymax_calls, panamax_calls, total_calls, total_vol = self.calculate_vessel_calls(year)
+        handysize_calls, handymax_calls, panamax_calls, total_calls, total_vol = self.vessel_calls(year)
         berth_occupancy_planned, berth_occupancy_online, crane_occupancy_planned, crane_occupancy_online = \
-            self.calculate_berth_occupancy(year, handysize_calls, handymax_calls, panamax_calls)
+            self.berth_occupancy(year, handysize_calls, handymax_calls, panamax_calls)
 
         berths = len(core.find_elements(self, Berth))
 
@@ -868,15 +901,15 @@ class System:
         for commodity in core.find_elements(self, Commodity):
             fee = commodity.handling_fee
             try:
-                volume = commodity.scenario_data.loc[commodity.scenario_data['year'] == year]['volume'].item()
+                volume = commodity.scenario_volume(year)
                 revenues += (volume * fee * safety_factor)
             except:
                 pass
         if self.debug:
             print('     Revenues (demand): {}'.format(revenues))
 
-        handysize, handymax, panamax, total_calls, total_vol = self.calculate_vessel_calls(year)
-        berth_occupancy_planned, berth_occupancy_online, crane_occupancy_planned, crane_occupancy_online = self.calculate_berth_occupancy(
+        handysize, handymax, panamax, total_calls, total_vol = self.vessel_calls(year)
+        berth_occupancy_planned, berth_occupancy_online, crane_occupancy_planned, crane_occupancy_online = self.berth_occupancy(
             year, handysize, handymax, panamax)
 
         # find the total service rate,
@@ -899,6 +932,48 @@ class System:
             pass
 
     # *** General functions
+    def occupancy_signature(self):
+        """The state that the vessel calls and the berth and station occupancies depend on: the number of cranes,
+        berths, stations and vessels and the demand scenarios"""
+
+        commodities = core.find_elements(self, Commodity)
+        elements = tuple(len(core.find_elements(self, obj))
+                         for obj in [Cyclic_Unloader, Continuous_Unloader, Berth, Unloading_station, Vessel])
+
+        return (id(self.elements), getattr(self.elements, 'revision', None), elements,
+                tuple((id(commodity), getattr(commodity, 'scenario_revision', None)) for commodity in commodities))
+
+    def get_occupancy(self, key, calculate, *args):
+        """Return the result of calculate(*args), calculated once per key for as long as the occupancy_signature
+        does not change"""
+
+        signature = self.occupancy_signature()
+        if signature != self._occupancy_signature:
+            self.occupancy = {}
+            self._occupancy_signature = signature
+
+        if key not in self.occupancy:
+            self.occupancy[key] = calculate(*args)
+
+        return self.occupancy[key]
+
+    def vessel_calls(self, year):
+        """Volumes and vessel calls in year (see calculate_vessel_calls), calculated once per state of the terminal"""
+
+        return self.get_occupancy(('vessel_calls', year), self.calculate_vessel_calls, year)
+
+    def berth_occupancy(self, year, handysize_calls, handymax_calls, panamax_calls):
+        """Berth and crane occupancies in year (see calculate_berth_occupancy), calculated once per state of the
+        terminal"""
+
+        return self.get_occupancy(('berth_occupancy', year, handysize_calls, handymax_calls, panamax_calls),
+                                  self.calculate_berth_occupancy, year, handysize_calls, handymax_calls, panamax_calls)
+
+    def station_occupancy(self, year):
+        """Station occupancies in year (see calculate_station_occupancy), calculated once per state of the terminal"""
+
+        return self.get_occupancy(('station_occupancy', year), self.calculate_station_occupancy, year)
+
     def calculate_vessel_calls(self, year=2019):
         """Calculate volumes to be transported and the number of vessel calls (both per vessel type and in total) """
 
@@ -912,7 +987,7 @@ class System:
         commodities = core.find_elements(self, Commodity)
         for commodity in commodities:
             try:
-                volume = commodity.scenario_data.loc[commodity.scenario_data['year'] == year]['volume'].item()
+                volume = commodity.scenario_volume(year)
                 handysize_vol += volume * commodity.handysize_perc / 100
                 handymax_vol += volume * commodity.handymax_perc / 100
                 panamax_vol += volume * commodity.panamax_perc / 100
@@ -947,7 +1022,7 @@ class System:
         commodities = core.find_elements(self, Commodity)
         for commodity in commodities:
             try:
-                volume = commodity.scenario_data.loc[commodity.scenario_data['year'] == year]['volume'].item()
+                volume = commodity.scenario_volume(year)
                 total_vol += volume
             except:
                 pass
@@ -961,10 +1036,9 @@ class System:
         service_rate_planned = 0
         service_rate_online = 0
         if list_of_elements != []:
-            for element in list_of_elements:
-                service_rate_planned += element.effective_capacity
-                if year >= element.year_online:
-                    service_rate_online += element.effective_capacity
+            for unloader in [Cyclic_Unloader, Continuous_Unloader]:
+                service_rate_planned += core.planned_elements(self, unloader, 'effective_capacity')
+                service_rate_online += core.online_elements(self, unloader, year, 'effective_capacity')
 
             time_at_berth_planned_handysize = handysize_calls * agribulk_defaults.handysize_data["mooring_time"]
             time_at_berth_planned_handymax = handymax_calls * agribulk_defaults.handymax_data["mooring_time"]
@@ -1022,14 +1096,12 @@ class System:
         service_rate_online = 0
         if list_of_elements != []:
             # find planned service rate and online service rate
-            for element in list_of_elements:
-                service_rate_planned += element.service_rate
-                if year >= element.year_online:
-                    service_rate_online += element.service_rate
+            service_rate_planned = core.planned_elements(self, Unloading_station, 'service_rate')
+            service_rate_online = core.online_elements(self, Unloading_station, year, 'service_rate')
 
-            handysize, handymax, panamax, total_calls, total_vol = self.calculate_vessel_calls(year)
+            handysize, handymax, panamax, total_calls, total_vol = self.vessel_calls(year)
             berth_occupancy_planned, berth_occupancy_online, crane_occupancy_planned, crane_occupancy_online = \
-                self.calculate_berth_occupancy(year, handysize, handymax, panamax)
+                self.berth_occupancy(year, handysize, handymax, panamax)
 
             # find the service rate for the throughput of the online quay unloaders (effective capacity * occupancy)
             service_rate_throughput = 0
@@ -1084,9 +1156,9 @@ class System:
         station = Unloading_station(**agribulk_defaults.hinterland_station_data)
 
         # - Trains calculated with the throughput
-        handysize, handymax, panamax, total_calls, total_vol = self.calculate_vessel_calls(year)
+        handysize, handymax, panamax, total_calls, total_vol = self.vessel_calls(year)
         berth_occupancy_planned, berth_occupancy_online, crane_occupancy_planned, crane_occupancy_online = \
-            self.calculate_berth_occupancy(year, handysize, handymax, panamax)
+            self.berth_occupancy(year, handysize, handymax, panamax)
 
         service_rate_throughput_online = 0
         for element in (core.find_elements(self, Cyclic_Unloader) + core.find_elements(self, Continuous_Unloader)):
@@ -1245,8 +1317,8 @@ class System:
             storages.append(0)
             storages_capacity.append(0)
 
-            handysize_calls, handymax_calls, panamax_calls, total_calls, total_vol = self.calculate_vessel_calls(year)
-            berth_occupancy_planned, berth_occupancy_online, crane_occupancy_planned, crane_occupancy_online = self.calculate_berth_occupancy(
+            handysize_calls, handymax_calls, panamax_calls, total_calls, total_vol = self.vessel_calls(year)
+            berth_occupancy_planned, berth_occupancy_online, crane_occupancy_planned, crane_occupancy_online = self.berth_occupancy(
                 year, handysize_calls, handymax_calls, panamax_calls)
 
             for element in self.elements:
@@ -41,6 +41,7 @@ Quay_wall = type('Quay_wall', (container_mixins.identifiable_properties_mixin,
                                container_mixins.history_properties_mixin,  # Give it procurement history
                                container_mixins.hascapex_properties_mixin,  # Give it capex info
                                container_mixins.hasopex_properties_mixin,  # Give it opex info
+                               container_mixins.hascashflow_properties_mixin,  # Give it a cash flow view
                                container_mixins.hasrevenue_properties_mixin,  # Give it revenue info
                                container_mixins.hastriggers_properties_mixin,  # Give it investment triggers (lambda?)
                                container_mixins.hasland_properties_mixin),
@@ -52,6 +53,7 @@ Berth = type('Berth', (container_mixins.identifiable_properties_mixin,  # Give i
                        container_mixins.berth_properties_mixin,
                        container_mixins.hascapex_properties_mixin,  # Give it capex info
                        container_mixins.hasopex_properties_mixin,  # Give it opex info
+                       container_mixins.hascashflow_properties_mixin,  # Give it a cash flow view
                        container_mixins.hasrevenue_properties_mixin,  # Give it revenue info
                        container_mixins.hastriggers_properties_mixin),  # Give it investment triggers (lambda?)
              {})  # The dictionary is empty because the site type is generic
@@ -65,6 +67,7 @@ Cyclic_Unloader = type('Cyclic_Unloader', (container_mixins.identifiable_propert
                                            container_mixins.cyclic_properties_mixin,
                                            container_mixins.hascapex_properties_mixin,  # Give it capex info
                                            container_mixins.hasopex_properties_mixin,  # Give it opex info
+                                           container_mixins.hascashflow_properties_mixin,  # Give it a cash flow view
                                            container_mixins.hasrevenue_properties_mixin,  # Give it revenue info
                                            container_mixins.hastriggers_properties_mixin),
                        # Give it investment triggers (lambda?)
@@ -77,6 +80,7 @@ Horizontal_Transport = type('Horizontal_Transport', (container_mixins.identifiab
                                                        container_mixins.transport_properties_mixin,
                                                        container_mixins.hascapex_properties_mixin,  # Give it capex info
                                                        container_mixins.hasopex_properties_mixin,  # Give it opex info
+                                                       container_mixins.hascashflow_properties_mixin,  # Give it a cash flow view
                                                        container_mixins.hastriggers_properties_mixin),  # Give it investment triggers (lambda?)
                {})
 
@@ -104,6 +108,7 @@ Laden_Stack = type('Laden_Stack', (container_mixins.identifiable_properties_mixi
                                container_mixins.history_properties_mixin,
                                 container_mixins.laden_stack_properties_mixin,
                                 container_mixins.hasopex_properties_mixin,
+                                container_mixins.hascashflow_properties_mixin,  # Give it a cash flow view
                                container_mixins.hascapex_properties_mixin,  # Give it capex info
                                container_mixins.hastriggers_properties_mixin,  # Give it investment triggers
                                 container_mixins.hasland_properties_mixin),
@@ -121,6 +126,7 @@ Stack_Equipment = type('Stack_Equipment', (container_mixins.identifiable_propert
                                 container_mixins.stack_equipment_properties_mixin,
                                container_mixins.hascapex_properties_mixin,  # Give it capex info
                                container_mixins.hasopex_properties_mixin,  # Give it opex info
+                               container_mixins.hascashflow_properties_mixin,  # Give it a cash flow view
                                container_mixins.hastriggers_properties_mixin),  # Give it investment triggers
                  {})
 
@@ -132,6 +138,7 @@ Empty_Stack = type('Empty_Stack', (container_mixins.identifiable_properties_mixi
                                container_mixins.history_properties_mixin,
                                 container_mixins.empty_stack_properties_mixin,
                                 container_mixins.hasopex_properties_mixin,
+                                container_mixins.hascashflow_properties_mixin,  # Give it a cash flow view
                                container_mixins.hascapex_properties_mixin,  # Give it capex info
                                container_mixins.hastriggers_properties_mixin,  # Give it investment triggers
                                 container_mixins.hasland_properties_mixin),
@@ -143,6 +150,7 @@ OOG_Stack = type('Empty_Stack', (container_mixins.identifiable_properties_mixin,
                                container_mixins.history_properties_mixin,
                                 container_mixins.oog_stack_properties_mixin,
                                 container_mixins.hasopex_properties_mixin,
+                                container_mixins.hascashflow_properties_mixin,  # Give it a cash flow view
                                container_mixins.hascapex_properties_mixin,  # Give it capex info
                                container_mixins.hastriggers_properties_mixin,  # Give it investment triggers
                                  container_mixins.hasland_properties_mixin),
@@ -154,6 +162,7 @@ Gate = type('Gate', (container_mixins.identifiable_properties_mixin,  # Give it
                                 container_mixins.gate_properties_mixin,
                                container_mixins.hascapex_properties_mixin,  # Give it capex info
                                container_mixins.hasopex_properties_mixin,  # Give it opex info
+                               container_mixins.hascashflow_properties_mixin,  # Give it a cash flow view
                                container_mixins.hastriggers_properties_mixin,  # Give it investment triggers
                                 container_mixins.hasland_properties_mixin),
                     {})
@@ -165,6 +174,7 @@ Empty_Handler = type('Empty_Handler', (container_mixins.identifiable_properties_
                                 container_mixins.empty_handler_properties_mixin,
                                container_mixins.hascapex_properties_mixin,  # Give it capex info
                                container_mixins.hasopex_properties_mixin,  # Give it opex info
+                               container_mixins.hascashflow_properties_mixin,  # Give it a cash flow view
                                container_mixins.hastriggers_properties_mixin),  # Give it investment triggers
                  {})
 
@@ -195,6 +205,7 @@ Energy = type('Energy', (container_mixins.identifiable_properties_mixin,
 General_Services = type('General_Services', (container_mixins.identifiable_properties_mixin,
                                              container_mixins.hasland_properties_mixin,
                                              container_mixins.hasopex_properties_mixin,
+                                             container_mixins.hascashflow_properties_mixin,  # Give it a cash flow view
                                              container_mixins.hascapex_properties_mixin,
                                              container_mixins.general_services_mixin,
                                              container_mixins.history_properties_mixin),
@@ -1,4 +1,7 @@
 # package(s) for data handling
+import copy
+import itertools
+
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -8,6 +11,50 @@ import matplotlib
 from opentisim.container_objects import *
 from opentisim import container_defaults
 from opentisim import core
+from opentisim import montecarlo
+from opentisim import queueing
+from opentisim.ledger import CashflowLedger
+from opentisim.element_store import ElementStore
+from opentisim.trace import DecisionTrace
+
+# Coefficients (highest order first) of the 4th order polynomials that give the waiting time factor (E2/E/n) as a
+# function of the berth occupancy. Row i holds the polynomial for i + 1 berths.
+waiting_time_coefficients = np.array([
+    [79.726, -126.47, 70.660, -14.651, 0.9218],
+    [29.825, -46.489, 25.656, -5.3517, 0.3376],
+    [19.362, -30.388, 16.791, -3.5457, 0.2253],
+    [17.334, -27.745, 15.432, -3.2725, 0.2080],
+    [11.149, -17.339, 9.4010, -1.9687, 0.1247],
+    [10.512, -16.390, 8.8292, -1.8368, 0.1158],
+    [8.4371, -13.226, 7.1446, -1.4902, 0.0941]])
+
+
+def waiting_time_factor(berth_occupancy, berths):
+    """Waiting time factor for the given berth occupancy and number of berths (both may be arrays, e.g. one
+    value per year). The fitted polynomials are used up to 7 berths, beyond that the analytic E2/E2/n
+    approximation of the queueing module. Without berths the factor is infinite."""
+
+    berth_occupancy, berths = np.broadcast_arrays(np.asarray(berth_occupancy, dtype=float),
+                                                  np.asarray(berths, dtype=int))
+    factor = np.full(berth_occupancy.shape, np.inf)
+
+    # Horner evaluation of the fitted polynomials
+    fitted = (berths >= 1) & (berths <= len(waiting_time_coefficients))
+    coefficients = waiting_time_coefficients[berths[fitted] - 1]
+    occupancy = berth_occupancy[fitted]
+    finite = np.isfinite(occupancy)
+    polynomial = np.zeros(fitted.sum())
+    for coefficient in coefficients.T:
+        polynomial = polynomial * np.where(finite, occupancy, 0) + coefficient
+
+    # as max(0, polynomial) did, an infinite occupancy (no berths or cranes online yet) gives a factor of 0
+    factor[fitted] = np.where(finite & ~np.isnan(polynomial), np.maximum(0, polynomial), 0)
+
+    # beyond the fitted polynomials
+    beyond = berths > len(waiting_time_coefficients)
+    factor[beyond] = queueing.waiting_factor(berth_occupancy[beyond], berths[beyond], 'E2/E2/n')
+
+    return factor
 
 
 class System:
@@ -15,12 +62,17 @@ class System:
     The module allows variation of the type of quay crane used and the type of storage used. Terminal development is
     governed by three triggers: the allowable berth occupancy, the allowable dwell time and the allowable station
     occupancy."""
+
+    # element types that use land, per land use category (see land_use)
+    land_use_categories = {'quay': Quay_wall, 'stack': Laden_Stack, 'empty': Empty_Stack, 'oog': OOG_Stack,
+                           'gate': Gate, 'general': General_Services}
+
     def __init__(self, startyear=2019, lifecycle=20, stack_equipment='rs', laden_stack='rs',
-                 operational_hours=7500, debug=False, elements=[],
+                 operational_hours=7500, debug=False, elements=None,
                  crane_type_defaults=container_defaults.sts_crane_data,
                  allowable_berth_occupancy=0.6,
                  laden_perc=0.80, reefer_perc=0.1, empty_perc=0.05, oog_perc=0.05, transhipment_ratio=0.69,
-                 energy_price=0.17, fuel_price=1, land_price=0):
+                 energy_price=0.17, fuel_price=1, land_price=0, trace=None):
         # time inputs
         self.startyear = startyear
         self.lifecycle = lifecycle
@@ -29,8 +81,15 @@ class System:
         # provide intermediate outputs via print statements if debug = True
         self.debug = debug
 
-        # collection of all terminal objects
-        self.elements = elements
+        # record of the investment decisions (see trace.DecisionTrace), None records nothing; with debug = True and
+        # without a trace the investment decisions are printed through a trace that echoes them
+        self.trace = DecisionTrace(echo=True) if trace is None and debug else trace
+
+        # collection of all terminal objects (indexed per class, see find_elements)
+        self.elements = ElementStore(elements if elements is not None else [])
+
+        # cash flows of all terminal elements (elements x years x categories)
+        self.ledger = CashflowLedger(startyear, lifecycle)
 
         # default values to use in case various types can be selected
         self.crane_type_defaults = crane_type_defaults
@@ -56,11 +115,18 @@ class System:
         self.fuel_price = fuel_price
         self.land_price = land_price
 
+        # throughputs and box moves per year, calculated once and recalculated when the demand (scenario_data of the
+        # commodities) or the container split changes. The throughputs can be shared by terminals with the same demand
+        # (see sweep)
+        self.demand_throughput = {}
+        self._demand_signature = None
+        self._box_moves = {}
+
         # storage variables for revenue
         # self.revenues = []
 
     # *** Overall terminal investment strategy for terminal class.
-    def simulate(self):
+    def simulate(self, year_from=None, year_to=None):
         """The 'simulate' method implements the terminal investment strategy for this terminal class.
 
         This method automatically generates investment decisions, parametrically derived from overall demand trends and
@@ -89,9 +155,22 @@ class System:
            6. collect all cash flows (capex, opex, revenues)
            7. calculate PV's and aggregate to NPV
 
+        The investment loop (steps 1 and 2) can be limited to the years year_from up to year_to. Steps 3 to 7 are only
+        carried out once the loop has reached the end of the lifecycle. This allows to simulate a terminal up to year
+        K, fork it (see fork) and resume each fork from year K with its own demand scenario:
+
+           terminal.simulate(year_to=K)
+           branch = terminal.fork()
+           branch.simulate(year_from=K)
+
         """
 
-        for year in range(self.startyear, self.startyear + self.lifecycle):
+        if year_from is None:
+            year_from = self.startyear
+        if year_to is None:
+            year_to = self.startyear + self.lifecycle
+
+        for year in range(year_from, year_to):
             """
             The simulate method is designed according to the following overall objectives for the terminal:
             - strategic objective: To maintain a profitable enterprise (NPV > 0) over the terminal lifecycle
@@ -156,9 +235,12 @@ class System:
                 print('$$$ Check general services -----------------------')
             self.general_services_invest(year)
 
+        # the remainder of the lifecycle is simulated when the terminal is resumed
+        if year_to < self.startyear + self.lifecycle:
+            return
+
         # 3. for each year calculate the general labour, fuel and energy costs (requires insight in realized demands)
-        for year in range(self.startyear, self.startyear + self.lifecycle):
-            self.calculate_energy_cost(year)
+        self.calculate_energy_costs()
 
         for year in range(self.startyear, self.startyear + self.lifecycle):
             self.calculate_general_labour_cost(year)
@@ -198,10 +280,14 @@ class System:
                 "capex": capex,
                 "NPV": NPV}
 
-        cash_flows, cash_flows_WACC_real = self.add_cashflow_elements()
-
         return NPV, data
 
+    def fork(self):
+        """Return an independent copy of the terminal, including its elements, cash flows, demurrage and revenues.
+        Forking a partially simulated terminal allows to branch it into several futures (see simulate)."""
+
+        return copy.deepcopy(self)
+
     # *** Individual investment methods for terminal elements
     def berth_invest(self, year, handysize, handymax, panamax):
         """
@@ -234,7 +320,7 @@ class System:
         # calculate berth occupancy
         berth_occupancy_planned, berth_occupancy_online, crane_occupancy_planned, crane_occupancy_online = self.calculate_berth_occupancy(
             year, handysize, handymax, panamax)
-        factor, waiting_time_occupancy = self.waiting_time(year)
+        factor, waiting_time_occupancy = self.waiting_time(year, berth_occupancy_online, crane_occupancy_online)
         if self.debug:
             print('     Berth occupancy planned (@ start of year): {:.2f} (trigger level: {:.2f})'.format(berth_occupancy_planned, self.allowable_berth_occupancy))
             print('     Berth occupancy online (@ start of year): {:.2f} (trigger level: {:.2f})'.format(berth_occupancy_online, self.allowable_berth_occupancy))
@@ -252,11 +338,12 @@ class System:
 
             # add a berth when no crane slots are available
             if not (self.check_crane_slot_available()):
-                if self.debug:
-                    print('  *** add Berth to elements')
                 berth = Berth(**container_defaults.berth_data)
                 berth.year_online = year + berth.delivery_time
                 self.elements.append(berth)
+                if self.trace is not None:
+                    self.trace.record(year, 'berth_occupancy', berth_occupancy_planned,
+                                      self.allowable_berth_occupancy, berth)
 
                 berth_occupancy_planned, berth_occupancy_online, crane_occupancy_planned, crane_occupancy_online = self.calculate_berth_occupancy(
                     year, handysize, handymax, panamax)
@@ -287,6 +374,8 @@ class System:
                 quay_wall = Quay_wall(**container_defaults.quay_wall_data)
                 depth = np.sum([draft, quay_wall.max_sinkage, quay_wall.wave_motion, quay_wall.safety_margin])
                 self.quay_invest(year, length, depth)
+                if self.trace is not None:
+                    self.trace.record(year, 'berths', berths, quay_walls, Quay_wall)
 
                 berth_occupancy_planned, berth_occupancy_online, crane_occupancy_planned, crane_occupancy_online = self.calculate_berth_occupancy(
                     year, handysize, handymax, panamax)
@@ -297,6 +386,9 @@ class System:
             # check if a crane is needed
             if self.check_crane_slot_available():
                 self.crane_invest(year)
+                if self.trace is not None:
+                    self.trace.record(year, 'berth_occupancy', berth_occupancy_planned,
+                                      self.allowable_berth_occupancy, self.elements[-1])
 
                 berth_occupancy_planned, berth_occupancy_online, crane_occupancy_planned, crane_occupancy_online = self.calculate_berth_occupancy(
                     year, handysize, handymax, panamax)
@@ -316,8 +408,6 @@ class System:
             - quay_wall.freeboard must be high enough to accommodate largest expected vessel
         """
 
-        if self.debug:
-            print('  *** add Quay to elements')
         # add a Quay_wall element
 
         quay_wall = Quay_wall(**container_defaults.quay_wall_data)
@@ -350,8 +440,6 @@ class System:
         - find out how much service capacity is needed
         - add service capacity until service_trigger is no longer exceeded
         """
-        if self.debug:
-            print('  *** add STS crane to elements')
         # add unloader object
         if (self.crane_type_defaults["crane_type"] == 'Gantry crane' or
                 self.crane_type_defaults["crane_type"] == 'Harbour crane' or
@@ -395,20 +483,11 @@ class System:
         - add transport until service_trigger is no longer exceeded
         """
         throughput_online = self.calculate_throughput(year)
-        cranes = 0
-        transport = 0
-        for element in self.elements:
-            if isinstance(element, Cyclic_Unloader):
-                if year >= element.year_online:
-                    cranes += 1
-            if isinstance(element, Horizontal_Transport):
-                if year >= element.year_online:
-                    transport += 1
+        cranes = core.online_elements(self, Cyclic_Unloader, year)
+        transport = core.online_elements(self, Horizontal_Transport, year)
         sts_cranes = cranes
         tractor_online = transport
-
-
-        tractor = Horizontal_Transport(**container_defaults.tractor_trailer_data)
+        tractor_planned = core.planned_elements(self, Horizontal_Transport)
 
         if self.debug:
             # print('     Horizontal transport planned (@ start of year): {}'.format(tractor_planned))
@@ -416,39 +495,14 @@ class System:
             print('     Number of STS cranes (@start of year): {}'.format(sts_cranes))
 
         if self.stack_equipment != 'sc' :
-
-            while sts_cranes > (tractor_online//tractor.required):
-                # add a tractor when not enough to serve number of STS cranes
-                if self.debug:
-                    print('  *** add tractor to elements')
-
-                tractor = Horizontal_Transport(**container_defaults.tractor_trailer_data)
-
-                # - capex
-                unit_rate = tractor.unit_rate
-                mobilisation = tractor.mobilisation
-                tractor.capex = int(unit_rate + mobilisation)
-
-                # - opex
-                tractor.maintenance = unit_rate * tractor.maintenance_perc
-
-                #   labour
-                labour = Labour(**container_defaults.labour_data)
-                tractor.shift = tractor.crew * labour.daily_shifts
-                tractor.labour = tractor.shift * labour.blue_collar_salary
-
-                if year == self.startyear:
-                    tractor.year_online = year + tractor.delivery_time + 1
-                else:
-                    tractor.year_online = year + tractor.delivery_time
-
-                # add cash flow information to tractor object in a dataframe
-                tractor = self.add_cashflow_data_to_element(tractor)
-
-                self.elements.append(tractor)
-
-                list_of_elements_tractor = self.find_elements(Horizontal_Transport)
-                tractor_online = len(list_of_elements_tractor)
+            # add tractors when not enough to serve number of STS cranes
+            tractors = core.ratio_elements(sts_cranes, container_defaults.tractor_trailer_data['required'],
+                                           tractor_online, tractor_planned)
+            self.ratio_invest(year, Horizontal_Transport, container_defaults.tractor_trailer_data, tractors)
+            if tractors and self.trace is not None:
+                self.trace.record(year, 'sts_cranes', sts_cranes,
+                                  tractor_online // container_defaults.tractor_trailer_data['required'],
+                                  Horizontal_Transport, tractors)
 
         return sts_cranes
 
@@ -469,18 +523,20 @@ class System:
             print('     Stack capacity required (@ start of year): {:.2f}'.format(required_capacity))
             print('     Total laden and reefer ground slots required (@ start of year): {:.2f}'.format(total_ground_slots))
 
-        while required_capacity > (stack_capacity_planned):
-            if self.debug:
-                print('  *** add stack to elements')
+        if self.laden_stack == 'rtg':
+            stack_data = container_defaults.rtg_stack_data
+        elif self.laden_stack == 'rmg':
+            stack_data = container_defaults.rmg_stack_data
+        elif self.laden_stack == 'sc':
+            stack_data = container_defaults.sc_stack_data
+        elif self.laden_stack == 'rs':
+            stack_data = container_defaults.rs_stack_data
 
-            if self.laden_stack == 'rtg':
-                stack = Laden_Stack(** container_defaults.rtg_stack_data)
-            elif self.laden_stack == 'rmg':
-                stack = Laden_Stack(** container_defaults.rmg_stack_data)
-            elif self.laden_stack == 'sc':
-                stack = Laden_Stack(**container_defaults.sc_stack_data)
-            elif self.laden_stack == 'rs':
-                stack = Laden_Stack(**container_defaults.rs_stack_data)
+        # add the number of stacks needed to cover the required capacity in one go
+        stacks = []
+        for i in range(core.required_elements(required_capacity, stack_capacity_planned, stack_data['capacity'])):
+
+            stack = Laden_Stack(**stack_data)
 
             reefer_slots = (self.reefer_perc/self.laden_perc) * stack.capacity
 
@@ -513,10 +569,12 @@ class System:
             # add cash flow information to quay_wall object in a dataframe
             stack = self.add_cashflow_data_to_element(stack)
 
-            self.elements.append(stack)
+            stacks.append(stack)
 
-            stack_capacity_planned, stack_capacity_online, required_capacity, total_ground_slots, laden_stack_area, \
-            reefer_slots = self.laden_reefer_stack_capacity(year)
+        self.elements.extend(stacks)
+        if stacks and self.trace is not None:
+            self.trace.record(year, 'stack_capacity', stack_capacity_planned, required_capacity, Laden_Stack,
+                              len(stacks))
 
     def empty_stack_invest(self, year):
 
@@ -535,9 +593,10 @@ class System:
             print('     Empty stack capacity required (@ start of year): {:.2f}'.format(empty_required_capacity))
             print('     Empty ground slots required (@ start of year): {:.2f}'.format(empty_ground_slots))
 
-        while empty_required_capacity > (empty_capacity_planned):
-            if self.debug:
-                print('  *** add empty stack to elements')
+        # add the number of stacks needed to cover the required capacity in one go
+        empty_stacks = []
+        for i in range(core.required_elements(empty_required_capacity, empty_capacity_planned,
+                                              container_defaults.empty_stack_data['capacity'])):
 
             empty_stack = Empty_Stack(**container_defaults.empty_stack_data)
 
@@ -568,11 +627,12 @@ class System:
             # add cash flow information to quay_wall object in a dataframe
             empty_stack = self.add_cashflow_data_to_element(empty_stack)
 
-            self.elements.append(empty_stack)
+            empty_stacks.append(empty_stack)
 
-            empty_capacity_planned, empty_capacity_online, empty_required_capacity, empty_ground_slots, \
-            empty_stack_area = self.empty_stack_capacity(
-                year)
+        self.elements.extend(empty_stacks)
+        if empty_stacks and self.trace is not None:
+            self.trace.record(year, 'empty_stack_capacity', empty_capacity_planned, empty_required_capacity,
+                              Empty_Stack, len(empty_stacks))
 
     def oog_stack_invest(self, year):
 
@@ -590,9 +650,10 @@ class System:
             print('     OOG slots online (@ start of year): {:.2f}'.format(oog_capacity_online))
             print('     OOG slots required (@ start of year): {:.2f}'.format(oog_required_capacity))
 
-        while oog_required_capacity > (oog_capacity_planned):
-            if self.debug:
-                print('  *** add empty stack to elements')
+        # add the number of stacks needed to cover the required capacity in one go
+        oog_stacks = []
+        for i in range(core.required_elements(oog_required_capacity, oog_capacity_planned,
+                                              container_defaults.oog_stack_data['capacity'])):
 
             oog_stack = OOG_Stack(**container_defaults.oog_stack_data)
 
@@ -622,9 +683,12 @@ class System:
             # add cash flow information to quay_wall object in a dataframe
                 oog_stack = self.add_cashflow_data_to_element(oog_stack)
 
-            self.elements.append(oog_stack)
+            oog_stacks.append(oog_stack)
 
-            oog_capacity_planned, oog_capacity_online, oog_required_capacity = self.oog_stack_capacity(year)
+        self.elements.extend(oog_stacks)
+        if oog_stacks and self.trace is not None:
+            self.trace.record(year, 'oog_stack_capacity', oog_capacity_planned, oog_required_capacity, OOG_Stack,
+                              len(oog_stacks))
 
     def stack_equipment_invest(self, year):
         """current strategy is to add stack equipment as soon as a service trigger is achieved
@@ -634,32 +698,22 @@ class System:
         - add equipment until service_trigger is no longer exceeded
         """
 
-        cranes = 0
-        equipment = 0
-        stack = 0
-        for element in self.elements:
-            if isinstance(element, Cyclic_Unloader):
-                if year >= element.year_online:
-                    cranes += 1
-            if isinstance(element, Stack_Equipment):
-                if year >= element.year_online:
-                    equipment += 1
-            if isinstance(element, Laden_Stack):
-                if year >= element.year_online:
-                    stack += 1
+        cranes = core.online_elements(self, Cyclic_Unloader, year)
+        equipment = core.online_elements(self, Stack_Equipment, year)
+        stack = core.online_elements(self, Laden_Stack, year)
 
         sts_cranes = cranes
         stack_equipment_online = equipment
-
+        stack_equipment_planned = core.planned_elements(self, Stack_Equipment)
 
         if self.stack_equipment == 'rtg':
-            stack_equipment = Stack_Equipment(**container_defaults.rtg_data)
+            stack_equipment_data = container_defaults.rtg_data
         elif self.stack_equipment == 'rmg':
-            stack_equipment = Stack_Equipment(**container_defaults.rmg_data)
+            stack_equipment_data = container_defaults.rmg_data
         elif self.stack_equipment == 'sc':
-            stack_equipment = Stack_Equipment(**container_defaults.sc_data)
+            stack_equipment_data = container_defaults.sc_data
         elif self.stack_equipment == 'rs':
-            stack_equipment = Stack_Equipment(**container_defaults.rs_data)
+            stack_equipment_data = container_defaults.rs_data
 
         if self.debug:
             print('     Number of stack equipment online (@ start of year): {}'.format(stack_equipment_online))
@@ -667,75 +721,22 @@ class System:
         if (self.stack_equipment == 'rtg' or
             self.stack_equipment == 'sc' or
             self.stack_equipment == 'rs'):
-            while sts_cranes > (stack_equipment_online//stack_equipment.required):
-
-                # add stack equipment when not enough to serve number of STS cranes
-                if self.debug:
-                    print('  *** add stack equipment to elements')
-
-
-                # - capex
-                unit_rate = stack_equipment.unit_rate
-                mobilisation = stack_equipment.mobilisation
-                stack_equipment.capex = int(unit_rate + mobilisation)
-
-                # - opex # todo calculate moves for energy costs
-                stack_equipment.insurance = unit_rate * stack_equipment.insurance_perc
-                stack_equipment.maintenance = unit_rate * stack_equipment.maintenance_perc
-
-
-                #   labour
-                labour = Labour(**container_defaults.labour_data)
-                stack_equipment.shift = stack_equipment.crew * labour.daily_shifts
-                stack_equipment.labour = stack_equipment.shift * labour.blue_collar_salary
-
-
-                if year == self.startyear:
-                    stack_equipment.year_online = year + stack_equipment.delivery_time + 1
-                else:
-                    stack_equipment.year_online = year + stack_equipment.delivery_time
-
-                # add cash flow information to tractor object in a dataframe
-                stack_equipment = self.add_cashflow_data_to_element(stack_equipment)
-
-                self.elements.append(stack_equipment)
-
-                list_of_elements_stack_equipment = self.find_elements(Stack_Equipment)
-                stack_equipment_online = len(list_of_elements_stack_equipment)
+            # add stack equipment when not enough to serve number of STS cranes
+            stack_equipment = core.ratio_elements(sts_cranes, stack_equipment_data['required'],
+                                                  stack_equipment_online, stack_equipment_planned)
+            self.ratio_invest(year, Stack_Equipment, stack_equipment_data, stack_equipment, insurance=True)
+            if stack_equipment and self.trace is not None:
+                self.trace.record(year, 'sts_cranes', sts_cranes,
+                                  stack_equipment_online // stack_equipment_data['required'], Stack_Equipment,
+                                  stack_equipment)
 
         if self.stack_equipment == 'rmg':
-            while stack > (stack_equipment_online * 0.5):
-
-                # add stack equipment when not enough to serve number of STS cranes
-                if self.debug:
-                    print('  *** add stack equipment to elements')
-
-                # - capex
-                unit_rate = stack_equipment.unit_rate
-                mobilisation = stack_equipment.mobilisation
-                stack_equipment.capex = int(unit_rate + mobilisation)
-
-                # - opex # todo calculate moves for energy costs
-                stack_equipment.insurance = unit_rate * stack_equipment.insurance_perc
-                stack_equipment.maintenance = unit_rate * stack_equipment.maintenance_perc
-
-                #   labour
-                labour = Labour(**container_defaults.labour_data)
-                stack_equipment.shift = stack_equipment.crew * labour.daily_shifts
-                stack_equipment.labour = stack_equipment.shift * labour.blue_collar_salary
-
-                if year == self.startyear:
-                    stack_equipment.year_online = year + stack_equipment.delivery_time + 1
-                else:
-                    stack_equipment.year_online = year + stack_equipment.delivery_time
-
-                # add cash flow information to tractor object in a dataframe
-                stack_equipment = self.add_cashflow_data_to_element(stack_equipment)
-
-                self.elements.append(stack_equipment)
-
-                list_of_elements_stack_equipment = self.find_elements(Stack_Equipment)
-                stack_equipment_online = len(list_of_elements_stack_equipment)
+            # add stack equipment when not enough to serve number of stacks (two per stack)
+            stack_equipment = core.ratio_elements(stack, 2, stack_equipment_online, stack_equipment_planned)
+            self.ratio_invest(year, Stack_Equipment, stack_equipment_data, stack_equipment, insurance=True)
+            if stack_equipment and self.trace is not None:
+                self.trace.record(year, 'laden_stacks', stack, stack_equipment_online * 0.5, Stack_Equipment,
+                                  stack_equipment)
 
     def gate_invest(self, year):
         """current strategy is to add gates as soon as trigger is achieved
@@ -753,14 +754,19 @@ class System:
             print('     Service rate planned (@ start of year): {:.2f}'.format(service_rate_planned))
             print('     Gate lane minutes  (@ start of year): {:.2f}'.format(total_design_gate_minutes))
 
-        while service_rate_planned > 1:
-            if self.debug:
-                print('  *** add gate to elements')
+        if service_rate_planned > 1:
+            # number of gate lanes needed for the design gate minutes (without gates a first lane is added regardless)
+            gates = max(1, core.required_elements(self.design_gate_minutes(year), gate_capacity_planned,
+                                                  container_defaults.gate_data['capacity']))
+        else:
+            gates = 0
 
-            gate = Gate(**container_defaults.gate_data)
+        labour = Labour(**container_defaults.labour_data)
 
+        new_gates = []
+        for i in range(gates):
 
-            tractor = Horizontal_Transport(**container_defaults.tractor_trailer_data)
+            gate = Gate(**container_defaults.gate_data)
 
             # - land use
             gate.land_use = gate.area
@@ -775,11 +781,7 @@ class System:
             # - opex
             gate.maintenance = unit_rate * gate.maintenance_perc
 
-
-
-
             #   labour
-            labour = Labour(**container_defaults.labour_data)
             gate.shift = gate.crew * labour.daily_shifts
             gate.labour = gate.shift * labour.blue_collar_salary
 
@@ -791,9 +793,11 @@ class System:
             # add cash flow information to tractor object in a dataframe
             gate = self.add_cashflow_data_to_element(gate)
 
-            self.elements.append(gate)
+            new_gates.append(gate)
 
-            gate_capacity_planned, gate_capacity_online, service_rate_planned, total_design_gate_minutes = self.calculate_gate_minutes(year)
+        self.elements.extend(new_gates)
+        if new_gates and self.trace is not None:
+            self.trace.record(year, 'gate_service_rate', service_rate_planned, 1, Gate, len(new_gates))
 
     def empty_handler_invest(self, year):
         """current strategy is to add empty hanlders as soon as a service trigger is achieved
@@ -802,97 +806,76 @@ class System:
         - find out how many empty handlers are needed
         - add empty handlers until service_trigger is no longer exceeded
         """
-        list_of_elements_empty_handler = self.find_elements(Empty_Handler)
-        list_of_elements_sts = self.find_elements(Cyclic_Unloader)
-        sts_cranes=len(list_of_elements_sts)
-        empty_handler_online=len(list_of_elements_empty_handler)
-
-
-        empty_handler = Empty_Handler(**container_defaults.empty_handler_data)
+        sts_cranes = core.planned_elements(self, Cyclic_Unloader)
+        empty_handler_online = core.planned_elements(self, Empty_Handler)
 
         if self.debug:
             # print('     Horizontal transport planned (@ start of year): {}'.format(tractor_planned))
             print('     Empty handlers online (@ start of year): {}'.format(empty_handler_online))
 
-        while sts_cranes > (empty_handler_online//empty_handler.required):
-            # add a tractor when not enough to serve number of STS cranes
-            if self.debug:
-                print('  *** add tractor to elements')
+        # add empty handlers when not enough to serve number of STS cranes
+        empty_handlers = core.ratio_elements(sts_cranes, container_defaults.empty_handler_data['required'],
+                                             empty_handler_online, empty_handler_online)
+        self.ratio_invest(year, Empty_Handler, container_defaults.empty_handler_data, empty_handlers)
+        if empty_handlers and self.trace is not None:
+            self.trace.record(year, 'sts_cranes', sts_cranes,
+                              empty_handler_online // container_defaults.empty_handler_data['required'],
+                              Empty_Handler, empty_handlers)
+
+    def ratio_invest(self, year, obj, data, number, insurance=False):
+        """Add a batch of number new elements of type obj (e.g. tractors, stack equipment or empty handlers, see
+        core.ratio_elements for the number) with the given default data, and return the new elements"""
+
+        labour = Labour(**container_defaults.labour_data)
+
+        new_elements = []
+        for i in range(number):
+
+            element = obj(**data)
 
             # - capex
-            unit_rate = empty_handler.unit_rate
-            mobilisation = empty_handler.mobilisation
-            empty_handler.capex = int(unit_rate + mobilisation)
+            unit_rate = element.unit_rate
+            mobilisation = element.mobilisation
+            element.capex = int(unit_rate + mobilisation)
 
             # - opex
-            empty_handler.maintenance = unit_rate * empty_handler.maintenance_perc
+            if insurance:
+                element.insurance = unit_rate * element.insurance_perc
+            element.maintenance = unit_rate * element.maintenance_perc
 
             #   labour
-            labour = Labour(**container_defaults.labour_data)
-            empty_handler.shift = empty_handler.crew * labour.daily_shifts
-            empty_handler.labour = empty_handler.shift * labour.blue_collar_salary
+            element.shift = element.crew * labour.daily_shifts
+            element.labour = element.shift * labour.blue_collar_salary
 
             if year == self.startyear:
-                empty_handler.year_online = year + empty_handler.delivery_time + 1
+                element.year_online = year + element.delivery_time + 1
             else:
-                empty_handler.year_online = year + empty_handler.delivery_time
+                element.year_online = year + element.delivery_time
 
-            # add cash flow information to tractor object in a dataframe
-            empty_handler = self.add_cashflow_data_to_element(empty_handler)
+            # add cash flow information to the element in a dataframe
+            element = self.add_cashflow_data_to_element(element)
+
+            new_elements.append(element)
 
-            self.elements.append(empty_handler)
+        self.elements.extend(new_elements)
 
-            list_of_elements_empty_handler = self.find_elements(Empty_Handler)
-            empty_handler_online = len(list_of_elements_empty_handler)
+        return new_elements
 
     def general_services_invest(self, year):
 
         laden_teu, reefer_teu, empty_teu, oog_teu = self.throughput_characteristics(year)
         throughput = laden_teu + reefer_teu + oog_teu + empty_teu
-        cranes = 0
-        general = 0
-        for element in self.elements:
-            if isinstance(element, Cyclic_Unloader):
-                if year >= element.year_online:
-                    cranes += 1
-            if isinstance(element, General_Services):
-                if year >= element.year_online:
-                    general += 1
+        cranes = core.online_elements(self, Cyclic_Unloader, year)
+        general = core.online_elements(self, General_Services, year)
         sts_cranes = cranes
 
         general = General_Services(**container_defaults.general_services_data)
 
-
-        quay_land_use=0
-        stack_land_use=0
-        empty_land_use=0
-        oog_land_use=0
-        gate_land_use=0
-
-        for element in self.elements:
-            if isinstance(element, Quay_wall):
-                if year >= element.year_online:
-                    quay_land_use += element.land_use
-            if isinstance(element, Laden_Stack):
-                if year >= element.year_online:
-                    stack_land_use += element.land_use
-            if isinstance(element, Empty_Stack):
-                if year >= element.year_online:
-                    empty_land_use += element.land_use
-            if isinstance(element, OOG_Stack):
-                if year >= element.year_online:
-                    oog_land_use += element.land_use
-            if isinstance(element, Gate):
-                if year >= element.year_online:
-                    gate_land_use += element.land_use
-
-        total_land_use=(quay_land_use+stack_land_use+empty_land_use+oog_land_use+gate_land_use + general.office
+        total_land_use=(self.total_land_use([year], exclude=('general',))[0] + general.office
                         + general.workshop + general.scanning_inspection_area + general.repair_building)*0.0001
 
         if year == (self.startyear+1):
             # add general services as soon as berth  is online
-            if self.debug:
-                print('  *** add general services to elements')
 
 
             # land use
@@ -928,112 +911,100 @@ class System:
             general = self.add_cashflow_data_to_element(general)
 
             self.elements.append(general)
+            if self.trace is not None:
+                self.trace.record(year, 'year', year, self.startyear + 1, general)
 
     # *** Energy costs, demurrage costs and revenue calculation methods
     def calculate_energy_cost(self, year): # todo voeg energy toe voor nieuwe elementen
-        """
+        """Energy costs of a single year (see calculate_energy_costs)"""
 
-        """
+        self.calculate_energy_costs([year])
 
-        sts_moves, stack_moves, empty_moves, tractor_moves = self.box_moves(year)
+    def calculate_energy_costs(self, years=None):
+        """Energy costs of the STS cranes, the stack equipment (rmg), the reefers in the laden stacks and the general
+        services (lighting, offices, gates and workshops) in the given years (default: the whole lifecycle)
+
+        The costs of all elements and years are calculated at once, as (elements x years) arrays based on the year
+        online of the elements and the box moves per year, and written to the ledger in bulk. Elements that are not
+        online get no energy costs, infinite costs are not written."""
+
+        if years is None:
+            years = self.ledger.years
+        years = np.asarray(years)
         energy_price = self.energy_price
 
-        '''STS crane energy costs'''
-        cranes = 0
-        for element in self.elements:
-            if isinstance(element, Cyclic_Unloader):
-                if year >= element.year_online:
-                    cranes += 1
+        # box moves and reefer throughput per year (calculated once per year, see box_moves and get_demand_throughput)
+        sts_moves = np.array([self.box_moves(year)[0] for year in years], dtype=float)
+        stack_moves = np.array([self.box_moves(year)[1] for year in years], dtype=float)
+        reefer_teu = np.array([self.get_demand_throughput(year)[1] for year in years], dtype=float)
 
-        for element in self.find_elements(Cyclic_Unloader):
-            if year >= element.year_online:
-                sts_moves_per_element = sts_moves / cranes
-                if element.consumption * sts_moves_per_element * energy_price != np.inf:
-                    element.df.loc[element.df['year'] == year, 'energy'] = \
-                        element.consumption * sts_moves_per_element * energy_price
-            else:
-                element.df.loc[element.df['year'] == year, 'energy'] = 0
+        # reefer slots in the laden stacks (see laden_reefer_stack_capacity) and land use of all years at once
+        reefer = Container(**container_defaults.reefer_container_data)
+        stack_data = container_defaults.rtg_stack_data
+        if self.laden_stack == 'rmg':
+            stack_data = container_defaults.rmg_stack_data
+        elif self.laden_stack == 'sc':
+            stack_data = container_defaults.sc_stack_data
+        elif self.laden_stack == 'rs':
+            stack_data = container_defaults.rs_stack_data
+        stack = Laden_Stack(**stack_data)
 
-        '''calculate stack equipment energy costs'''
-        if self.stack_equipment == 'rmg':
-            list_of_elements_Stack = self.find_elements(Stack_Equipment)
-            equipment = 0
-            for element in self.elements:
-                if isinstance(element, Stack_Equipment):
-                    if year >= element.year_online:
-                        equipment += 1
+        ts = self.transhipment_ratio
+        operational_days = self.operational_hours // 24
+        reefer_teu = (reefer_teu * ts * 0.5) + (reefer_teu * (1 - ts))
+        reefer_ground_slots = reefer_teu * reefer.peak_factor * reefer.dwell_time / reefer.stack_occupancy / \
+                              stack.height / operational_days * stack.reefer_factor
+        reefer_slots = reefer_ground_slots * stack.height
+        total_land_use = self.total_land_use(years)
 
-            for element in list_of_elements_Stack:
-                if year >= element.year_online:
-                    moves = stack_moves / equipment
-                    consumption = element.power_consumption
-                    costs = energy_price
-                    if consumption * costs * moves != np.inf:
-                        element.df.loc[element.df['year'] == year, 'energy'] = consumption * costs * moves
-                else:
-                    element.df.loc[element.df['year'] == year, 'energy'] = 0
-        # reefer energy costs
-        stack_capacity_planned, stack_capacity_online, required_capacity, total_ground_slots, laden_stack_area, \
-        reefer_slots = self.laden_reefer_stack_capacity(year)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            '''STS crane energy costs'''
+            cranes, online = self.online_matrix(Cyclic_Unloader, years)
+            if cranes:
+                consumption = np.array([element.consumption for element in cranes])
+                energy = consumption[:, np.newaxis] * (sts_moves / online.sum(axis=0)) * energy_price
+                self.set_energy(cranes, years, online, energy)
 
-        stacks = 0
-        for element in self.elements:
-            if isinstance(element, Laden_Stack):
-                if year >= element.year_online:
-                    stacks += 1
+            '''calculate stack equipment energy costs'''
+            if self.stack_equipment == 'rmg':
+                equipment, online = self.online_matrix(Stack_Equipment, years)
+                if equipment:
+                    consumption = np.array([element.power_consumption for element in equipment])
+                    energy = consumption[:, np.newaxis] * energy_price * (stack_moves / online.sum(axis=0))
+                    self.set_energy(equipment, years, online, energy)
 
-        for element in self.find_elements(Laden_Stack):
-            if year >= element.year_online:
-                slots_per_stack = reefer_slots / stacks
-                if slots_per_stack * element.reefers_present * energy_price * 24*365 != np.inf:
-                    element.df.loc[element.df['year'] == year, 'energy'] = slots_per_stack * element.reefers_present\
-                                                                           * energy_price * 24*365
-            else:
-                element.df.loc[element.df['year'] == year, 'energy'] = 0
+            # reefer energy costs
+            stacks, online = self.online_matrix(Laden_Stack, years)
+            if stacks:
+                reefers_present = np.array([element.reefers_present for element in stacks])
+                energy = (reefer_slots / online.sum(axis=0)) * reefers_present[:, np.newaxis] * energy_price * 24*365
+                self.set_energy(stacks, years, online, energy)
 
-        '''Calculate general power use'''
+            '''Calculate general power use'''
+            general = container_defaults.general_services_data
 
-        general = General_Services(**container_defaults.general_services_data)
+            #lighting
+            lighting = total_land_use * energy_price * general['lighting_consumption']
 
-        #lighting
-        quay_land_use=0
-        stack_land_use=0
-        empty_land_use=0
-        oog_land_use=0
-        gate_land_use=0
-        general_land_use=0
+            #Office, gates, workshops power use
+            general_consumption = general['general_consumption']*energy_price*self.operational_hours
+            services, online = self.online_matrix(General_Services, years)
+            if services:
+                energy = np.broadcast_to(lighting + general_consumption, online.shape)
+                self.set_energy(services, years, online, energy)
 
-        for element in self.elements:
-            if isinstance(element, Quay_wall):
-                if year >= element.year_online:
-                    quay_land_use += element.land_use
-            if isinstance(element, Laden_Stack):
-                if year >= element.year_online:
-                    stack_land_use += element.land_use
-            if isinstance(element, Empty_Stack):
-                if year >= element.year_online:
-                    empty_land_use += element.land_use
-            if isinstance(element, OOG_Stack):
-                if year >= element.year_online:
-                    oog_land_use += element.land_use
-            if isinstance(element, Gate):
-                if year >= element.year_online:
-                    gate_land_use += element.land_use
-            if isinstance(element, General_Services):
-                if year >= element.year_online:
-                    general_land_use += element.land_use
+    def online_matrix(self, obj, years):
+        """return the elements of type obj and a boolean array (elements x years) that tells if they are online"""
 
-        total_land_use=quay_land_use+stack_land_use+empty_land_use+oog_land_use+gate_land_use+general_land_use
-        lighting = total_land_use * energy_price * general.lighting_consumption
+        elements = self.find_elements(obj)
+        year_online = np.array([element.year_online for element in elements])
 
-        #Office, gates, workshops power use
-        general_consumption=general.general_consumption*energy_price*self.operational_hours
-        for element in self.find_elements(General_Services):
-            if year >= element.year_online:
-                if lighting +general_consumption != np.inf:
-                    element.df.loc[element.df['year'] == year, 'energy'] = lighting +general_consumption
-            else:
-                element.df.loc[element.df['year'] == year, 'energy'] = 0
+        return elements, years[np.newaxis, :] >= year_online[:, np.newaxis]
+
+    def set_energy(self, elements, years, online, energy):
+        """write the energy costs of online elements (unless infinite) and zero costs for elements that are not online"""
+
+        self.ledger.set_block(elements, years, 'energy', np.where(online, energy, 0), where=~online | (energy != np.inf))
 
     def calculate_general_labour_cost(self,year):
         '''General labour'''
@@ -1042,11 +1013,7 @@ class System:
         throughput = laden_teu + reefer_teu + oog_teu + empty_teu
         labour = Labour(**container_defaults.labour_data)
 
-        cranes = 0
-        for element in self.elements:
-            if isinstance(element, Cyclic_Unloader):
-                if year >= element.year_online:
-                    cranes += 1
+        cranes = core.online_elements(self, Cyclic_Unloader, year)
         sts_cranes = cranes
         if sts_cranes != 0:
             crew_required = np.ceil(throughput / general.crew_required)
@@ -1070,9 +1037,9 @@ class System:
             for element in list_of_elements_general:
                 if year >= element.year_online:
                     if fixed_labour + shift_labour != np.inf:
-                        element.df.loc[element.df['year'] == year, 'labour'] = fixed_labour + shift_labour
+                        self.ledger.set(element, year, 'labour', fixed_labour + shift_labour)
                 else:
-                    element.df.loc[element.df['year'] == year, 'labour'] = 0
+                    self.ledger.set(element, year, 'labour', 0)
 
     def calculate_fuel_cost(self, year):
         sts_moves, stack_moves, empty_moves, tractor_moves = self.box_moves(year)
@@ -1080,11 +1047,7 @@ class System:
 
         # calculate empty handler fuel costs
         list_of_elements_ech = self.find_elements(Empty_Handler)
-        equipment = 0
-        for element in self.elements:
-            if isinstance(element, Empty_Handler):
-                if year >= element.year_online:
-                    equipment += 1
+        equipment = core.online_elements(self, Empty_Handler, year)
 
         for element in list_of_elements_ech:
             if year >= element.year_online:
@@ -1092,18 +1055,14 @@ class System:
                 consumption = element.fuel_consumption
                 costs = fuel_price
                 if consumption * costs * moves != np.inf:
-                    element.df.loc[element.df['year'] == year, 'fuel'] = consumption * costs * moves
+                    self.ledger.set(element, year, 'fuel', consumption * costs * moves)
             else:
-                element.df.loc[element.df['year'] == year, 'fuel'] = 0
+                self.ledger.set(element, year, 'fuel', 0)
 
         # calculate stack equipment fuel costs
         if self.stack_equipment == 'rtg' or self.stack_equipment == 'rs' or self.stack_equipment == 'sc':
             list_of_elements_Stack = self.find_elements(Stack_Equipment)
-            equipment = 0
-            for element in self.elements:
-                if isinstance(element, Stack_Equipment):
-                    if year >= element.year_online:
-                        equipment += 1
+            equipment = core.online_elements(self, Stack_Equipment, year)
 
             for element in list_of_elements_Stack:
                 if year >= element.year_online:
@@ -1111,36 +1070,34 @@ class System:
                     consumption = element.fuel_consumption
                     costs = fuel_price
                     if consumption * costs * moves != np.inf:
-                        element.df.loc[element.df['year'] == year, 'fuel'] = consumption * costs * moves
+                        self.ledger.set(element, year, 'fuel', consumption * costs * moves)
                 else:
-                    element.df.loc[element.df['year'] == year, 'fuel'] = 0
+                    self.ledger.set(element, year, 'fuel', 0)
 
         # calculate tractor fuel consumption
         list_of_elements_Tractor = self.find_elements(Horizontal_Transport)
 
-        transport = 0
-        for element in self.elements:
-            if isinstance(element, Horizontal_Transport):
-                if year >= element.year_online:
-                    transport += 1
+        transport = core.online_elements(self, Horizontal_Transport, year)
 
         for element in list_of_elements_Tractor:
             if year >= element.year_online:
                 moves = tractor_moves / transport
                 if element.fuel_consumption * moves * fuel_price != np.inf:
-                    element.df.loc[element.df['year'] == year, 'fuel'] = \
-                        element.fuel_consumption * moves * fuel_price
+                    self.ledger.set(element, year, 'fuel',
+                                    element.fuel_consumption * moves * fuel_price)
 
             else:
-                element.df.loc[element.df['year'] == year, 'fuel'] = 0
+                self.ledger.set(element, year, 'fuel', 0)
 
     def calculate_demurrage_cost(self, year):
 
         """Find the demurrage cost per type of vessel and sum all demurrage cost"""
 
         handysize_calls, handymax_calls, panamax_calls, total_calls, total_vol = self.calculate_vessel_calls(year)
+        berth_occupancy_planned, berth_occupancy_online, crane_occupancy_planned, crane_occupancy_online = \
+            self.calculate_berth_occupancy(year, handysize_calls, handymax_calls, panamax_calls)
 
-        factor, waiting_time_occupancy = self.waiting_time(year)
+        factor, waiting_time_occupancy = self.waiting_time(year, berth_occupancy_online, crane_occupancy_online)
 
         # Find the service_rate per quay_wall to find the average service hours at the quay for a vessel
         quay_walls = len(self.find_elements(Quay_wall))
@@ -1221,74 +1178,27 @@ class System:
             # cash_flows['revenues'] = self.revenues
 
             # add labour component for years where revenues are not zero
-            for element in self.elements:
-                if hasattr(element, 'df'):
-                    for column in cash_flows.columns:
-                        if column in element.df.columns and column != "year":
-                            cash_flows[column] += element.df[column]
+            totals = self.ledger.totals(self.elements)
+            for column in cash_flows.columns:
+                if column in self.ledger.column:
+                    cash_flows[column] += totals[:, self.ledger.column[column]]
 
             cash_flows.fillna(0)
 
             # calculate WACC real cashflows
+            columns = [column for column in cash_flows.columns if column != "year"]
             cash_flows_WACC_real = pd.DataFrame()
             cash_flows_WACC_real['year'] = cash_flows['year']
-            for year in range(self.startyear, self.startyear + self.lifecycle):
-                for column in cash_flows.columns:
-                    if column != "year":
-                        cash_flows_WACC_real.loc[cash_flows_WACC_real['year'] == year, column] = \
-                            cash_flows.loc[
-                                cash_flows[
-                                    'year'] == year, column] / (
-                                    (1 + self.WACC_real()) ** (
-                                    year - self.startyear))
-
+            cash_flows_WACC_real[columns] = cash_flows[columns].to_numpy(dtype=float) * \
+                core.discount_factors(self.startyear, self.lifecycle, self.WACC_nominal())[:, np.newaxis]
 
             return cash_flows, cash_flows_WACC_real
 
     def add_cashflow_data_to_element(self, element):
 
-        """Place cashflow data in element dataframe"""
-
-        # years
-        years = list(range(self.startyear, self.startyear + self.lifecycle))
-
-        # capex
-        capex = element.capex
-
-        # opex
-        maintenance = element.maintenance
-        insurance = element.insurance
-        labour = element.labour
-
-        # year online
-        year_online = element.year_online
-        year_delivery = element.delivery_time
-
-        df = pd.DataFrame()
-
-        # years
-        df["year"] = years
-
-        # capex
-        if year_delivery > 1:
-            df.loc[df["year"] == year_online - 2, "capex"] = 0.6 * capex
-            df.loc[df["year"] == year_online - 1, "capex"] = 0.4 * capex
-        else:
-            df.loc[df["year"] == year_online - 1, "capex"] = capex
+        """Place cashflow data of the element in the cash flow ledger (available as element.df)"""
 
-        # opex
-        if maintenance:
-            df.loc[df["year"] >= year_online, "maintenance"] = maintenance
-        if insurance:
-            df.loc[df["year"] >= year_online, "insurance"] = insurance
-        if labour:
-            df.loc[df["year"] >= year_online, "labour"] = labour
-
-        df.fillna(0, inplace=True)
-
-        element.df = df
-
-        return element
+        return self.ledger.add(element)
 
     def WACC_nominal(self, Gearing=60, Re=.10, Rd=.30, Tc=.28):
         """Nominal cash flow is the true dollar amount of future revenues the company expects
@@ -1352,9 +1262,25 @@ class System:
 
         return NPV, capex_normal, opex_normal, labour_normal
 
+    def NPV_sensitivity(self, Gearing=60, Re=.10, Rd=.30, Tc=.28, inflation=0.02):
+        """NPV of the simulated terminal for a grid of financial parameters (see core.NPV_surface).
+        The investment plan does not depend on these parameters, so the terminal is not simulated again."""
+
+        # add cash flow information for each of the Terminal elements
+        cash_flows, cash_flows_WACC_real = self.add_cashflow_elements()
+
+        return core.NPV_surface(cash_flows, Gearing=Gearing, Re=Re, Rd=Rd, Tc=Tc, inflation=inflation)
+
     # *** General functions
     def find_elements(self, obj):
-        """return elements of type obj part of self.elements"""
+        """return elements of type obj part of self.elements
+
+        For an ElementStore these are a read-only view that follows the store (see ElementStore.find), take a copy
+        (list(...)) to keep or change the elements found at this point."""
+
+        # the element store keeps an index of the elements per class
+        if isinstance(self.elements, ElementStore):
+            return self.elements.find(obj)
 
         list_of_elements = []
         if self.elements != []:
@@ -1377,7 +1303,7 @@ class System:
         commodities = self.find_elements(Commodity)
         for commodity in commodities:
             try:
-                volume = commodity.scenario_data.loc[commodity.scenario_data['year'] == year]['volume'].item()
+                volume = commodity.scenario_volume(year)
                 handysize_vol += volume * commodity.handysize_perc / 100
                 handymax_vol += volume * commodity.handymax_perc / 100
                 panamax_vol += volume * commodity.panamax_perc / 100
@@ -1405,11 +1331,49 @@ class System:
         - Translate the total TEU/year to every container type troughput
         """
 
+        return self.get_demand_throughput(year)[:4]
+
+    def throughput_box(self, year):
+
+        """
+        - Find all commodities and the modal split
+        - Translate the total TEU/year to every container type troughput
+        """
+
+        return self.get_demand_throughput(year)[4:]
+
+    def demand_signature(self):
+        """inputs of the demand derived throughputs: the scenarios of the commodities and the container split"""
+
+        commodities = tuple((commodity.id, commodity.scenario_revision) for commodity in self.find_elements(Commodity))
+
+        return commodities, self.laden_perc, self.reefer_perc, self.empty_perc, self.oog_perc
+
+    def get_demand_throughput(self, year):
+        """return the throughputs of calculate_demand_throughput, calculated once per year"""
+
+        # forget the throughputs and box moves if the demand or the container split changed
+        signature = self.demand_signature()
+        if signature != self._demand_signature:
+            self.demand_throughput = {}
+            self._demand_signature = signature
+            self._box_moves = {}
+
+        if year not in self.demand_throughput:
+            self.demand_throughput[year] = self.calculate_demand_throughput(year)
+
+        return self.demand_throughput[year]
+
+    def calculate_demand_throughput(self, year):
+        """Throughput in TEU and in boxes per container type (laden, reefer, empty, oog) and the total number of boxes
+
+        returns laden_teu, reefer_teu, empty_teu, oog_teu, laden_box, reefer_box, empty_box, oog_box, throughput_box"""
+
         ''' Calculate the total throughput in TEU per year'''
         commodities = self.find_elements(Commodity)
         for commodity in commodities:
             try:
-                volume = commodity.scenario_data.loc[commodity.scenario_data['year'] == year]['volume'].item()
+                volume = commodity.scenario_volume(year)
             except:
                 pass
 
@@ -1421,19 +1385,8 @@ class System:
         empty_teu = volume * self.empty_perc
         oog_teu = volume * self.oog_perc
 
-        return laden_teu, reefer_teu, empty_teu, oog_teu
-
-    def throughput_box(self, year):
-
-        """
-        - Find all commodities and the modal split
-        - Translate the total TEU/year to every container type troughput
-        """
-
         '''import container throughputs'''
 
-        laden_teu, reefer_teu, empty_teu, oog_teu = self.throughput_characteristics(year)
-
         laden = Container(**container_defaults.laden_container_data)
         reefer = Container(**container_defaults.reefer_container_data)
         empty = Container(**container_defaults.empty_container_data)
@@ -1446,9 +1399,21 @@ class System:
 
         throughput_box = laden_box + reefer_box + empty_box + oog_box
 
-        return laden_box, reefer_box, empty_box, oog_box, throughput_box
+        return laden_teu, reefer_teu, empty_teu, oog_teu, laden_box, reefer_box, empty_box, oog_box, throughput_box
 
     def box_moves(self, year):
+        ''''Calculate the box moves as input for the power and fuel consumption (calculated once per year, see
+        calculate_box_moves)'''
+
+        self.get_demand_throughput(year)
+
+        key = year, self.laden_stack, self.transhipment_ratio
+        if key not in self._box_moves:
+            self._box_moves[key] = self.calculate_box_moves(year)
+
+        return self._box_moves[key]
+
+    def calculate_box_moves(self, year):
         ''''Calculate the box moves as input for the power and fuel consumption'''
 
         laden_box, reefer_box, empty_box, oog_box, throughput_box = self.throughput_box(year)
@@ -1495,38 +1460,44 @@ class System:
         return  sts_moves, stack_moves, empty_moves, tractor_moves
 
     def calculate_land_use(self, year):
+        """Total land use [m2] of the elements online in year"""
 
-        quay_land_use=0
-        stack_land_use=0
-        empty_land_use=0
-        oog_land_use=0
-        gate_land_use=0
-        general_land_use=0
+        return float(self.total_land_use([year])[0])
 
-        for element in self.elements:
-            if isinstance(element, Quay_wall):
-                if year >= element.year_online:
-                    quay_land_use += element.land_use
-            if isinstance(element, Laden_Stack):
-                if year >= element.year_online:
-                    stack_land_use += element.land_use
-            if isinstance(element, Empty_Stack):
-                if year >= element.year_online:
-                    empty_land_use += element.land_use
-            if isinstance(element, OOG_Stack):
-                if year >= element.year_online:
-                    oog_land_use += element.land_use
-            if isinstance(element, Gate):
-                if year >= element.year_online:
-                    gate_land_use += element.land_use
-            if isinstance(element, General_Services):
-                if year >= element.year_online:
-                    general_land_use += element.land_use
+    def land_use(self, years=None):
+        """Land use [m2] of the elements online per year (rows) and land use category (columns, in the order of
+        land_use_categories)
+
+        The land use follows from the timelines of the element store, which are extended when an element is
+        appended, so no elements are scanned. The land use of an element should be set before it is appended."""
+
+        if years is None:
+            years = self.ledger.years
+
+        return np.column_stack([core.online_series(self, obj, years, 'land_use')
+                                for obj in self.land_use_categories.values()]).astype(float)
+
+    def total_land_use(self, years=None, exclude=()):
+        """Total land use [m2] of the elements online per year, leaving out the categories in exclude"""
 
+        table = self.land_use(years)
 
-        total_land_use=quay_land_use+stack_land_use+empty_land_use+oog_land_use+gate_land_use+general_land_use
+        total = np.zeros(table.shape[0])
+        for column, category in enumerate(self.land_use_categories):
+            if category not in exclude:
+                total += table[:, column]
 
-        return total_land_use
+        return total
+
+    def land_use_frame(self, years=None):
+        """Land use [ha] per year and land use category, e.g. to export the land use of a simulated terminal and
+        compare land prices afterwards: the land taken into use in a year is land_use_frame().diff()"""
+
+        if years is None:
+            years = self.ledger.years
+
+        return pd.DataFrame(self.land_use(years) * 0.0001, columns=list(self.land_use_categories),
+                            index=pd.Index(years, name='year'))
 
     def laden_reefer_stack_capacity(self, year):
 
@@ -1535,16 +1506,10 @@ class System:
         """
 
 
-        list_of_elements = self.find_elements(Laden_Stack)
         # find the total stack capacity
-
-        stack_capacity_planned = 0
-        stack_capacity_online = 0
+        stack_capacity_planned = core.planned_elements(self, Laden_Stack, 'capacity')
+        stack_capacity_online = core.online_elements(self, Laden_Stack, year, 'capacity')
         required_capacity = 0
-        for element in list_of_elements:
-            stack_capacity_planned += element.capacity
-            if year >= element.year_online:
-                stack_capacity_online += element.capacity
 
         laden_teu, reefer_teu, empty_teu, oog_teu = self.throughput_characteristics(year)
 
@@ -1586,16 +1551,10 @@ class System:
         - #todo beschrijving empty stack
         """
 
-        list_of_elements = self.find_elements(Empty_Stack)
         # find the total stack capacity
-
-        empty_capacity_planned = 0
-        empty_capacity_online = 0
+        empty_capacity_planned = core.planned_elements(self, Empty_Stack, 'capacity')
+        empty_capacity_online = core.online_elements(self, Empty_Stack, year, 'capacity')
         empty_required_capacity = 0
-        for element in list_of_elements:
-            empty_capacity_planned += element.capacity
-            if year >= element.year_online:
-                empty_capacity_online += element.capacity
 
         ts=self.transhipment_ratio
 
@@ -1621,16 +1580,10 @@ class System:
         - #todo beschrijving oog stack
         """
 
-        list_of_elements = self.find_elements(OOG_Stack)
         # find the total stack capacity
-
-        oog_capacity_planned = 0
-        oog_capacity_online = 0
+        oog_capacity_planned = core.planned_elements(self, OOG_Stack, 'capacity')
+        oog_capacity_online = core.online_elements(self, OOG_Stack, year, 'capacity')
         oog_required_capacity = 0
-        for element in list_of_elements:
-            oog_capacity_planned += element.capacity
-            if year >= element.year_online:
-                oog_capacity_online += element.capacity
         ts=self.transhipment_ratio
 
         laden_teu, reefer_teu, empty_teu, oog_teu = self.throughput_characteristics(year)
@@ -1774,7 +1727,7 @@ class System:
         commodities = self.find_elements(Commodity)
         for commodity in commodities:
             try:
-                volume = commodity.scenario_data.loc[commodity.scenario_data['year'] == year]['volume'].item()
+                volume = commodity.scenario_volume(year)
             except:
                 pass
 
@@ -1847,148 +1800,75 @@ class System:
         - Occupancy is total_minutes_at_gate per hour divided by 1 hour
         """
 
-        # list all gate objects in system
-        list_of_elements = self.find_elements(Gate)
-
         # find the total service rate and determine the time at berth (in hours, per vessel type and in total)
-        capacity_planned = 0
-        capacity_online = 0
+        capacity_planned = core.planned_elements(self, Gate, 'capacity')
+        capacity_online = core.online_elements(self, Gate, year, 'capacity')
         total_design_gate_minutes = 0
-        if list_of_elements != []:
-            for element in list_of_elements:
-                capacity_planned += element.capacity
-                if year >= element.year_online:
-                    capacity_online += element.capacity
+        if self.find_elements(Gate) != []:
+            total_design_gate_minutes = self.design_gate_minutes(year)
 
-            # estimate time at gate lanes
-            '''Get input: import box moves en export box moves, translate to design gate lanes per hour.
-            Every gate is 60 minutes, which is the capacity. Dan is het gewoon while totaal is meer dan totale capacity gate toevoegen'''
+            service_rate_planend = total_design_gate_minutes / capacity_planned
 
+        else:
+            service_rate_planend = float("inf")
 
+        return capacity_planned, capacity_online, service_rate_planend, total_design_gate_minutes
 
-            ''' Calculate the total throughput in TEU per year'''
-            laden_box, reefer_box, empty_box, oog_box, throughput_box = self.throughput_box(year)
+    def design_gate_minutes(self, year):
+        """Total design gate lane minutes per hour (entry and exit) for the import and export boxes of a year"""
 
-            import_box_moves = (throughput_box * (1-self.transhipment_ratio)) * 0.5 #assume import / export is always 50/50
-            export_box_moves = (throughput_box * (1 - self.transhipment_ratio)) * 0.5 #assume import / export is always 50/50
-            weeks_year = 52
+        # estimate time at gate lanes
+        '''Get input: import box moves en export box moves, translate to design gate lanes per hour.
+        Every gate is 60 minutes, which is the capacity. Dan is het gewoon while totaal is meer dan totale capacity gate toevoegen'''
 
-            gate = Gate(**container_defaults.gate_data)
+        ''' Calculate the total throughput in TEU per year'''
+        laden_box, reefer_box, empty_box, oog_box, throughput_box = self.throughput_box(year)
 
-            design_exit_gate_minutes = import_box_moves*gate.truck_moves / weeks_year * gate.peak_factor * gate.peak_day * gate.peak_hour * \
-                                       gate.exit_inspection_time * gate.design_capacity
+        import_box_moves = (throughput_box * (1-self.transhipment_ratio)) * 0.5 #assume import / export is always 50/50
+        export_box_moves = (throughput_box * (1 - self.transhipment_ratio)) * 0.5 #assume import / export is always 50/50
+        weeks_year = 52
 
-            design_entry_gate_minutes = export_box_moves * gate.truck_moves / weeks_year * gate.peak_factor * gate.peak_day * gate.peak_hour * \
-                                       gate.entry_inspection_time * gate.design_capacity
+        # gate properties from the defaults (no need to create a Gate)
+        gate = container_defaults.gate_data
 
-            total_design_gate_minutes = design_entry_gate_minutes + design_exit_gate_minutes
+        design_exit_gate_minutes = import_box_moves*gate['truck_moves'] / weeks_year * gate['peak_factor'] * \
+                                   gate['peak_day'] * gate['peak_hour'] * gate['exit_inspection_time'] * gate['design_capacity']
 
-            service_rate_planend = total_design_gate_minutes / capacity_planned
+        design_entry_gate_minutes = export_box_moves * gate['truck_moves'] / weeks_year * gate['peak_factor'] * \
+                                    gate['peak_day'] * gate['peak_hour'] * gate['entry_inspection_time'] * gate['design_capacity']
 
-        else:
-            service_rate_planend = float("inf")
+        total_design_gate_minutes = design_entry_gate_minutes + design_exit_gate_minutes
 
-        return capacity_planned, capacity_online, service_rate_planend, total_design_gate_minutes
+        return total_design_gate_minutes
 
     def occupancy_to_waitingfactor(self, occupancy=.3, nr_of_servers_chk=4, poly_order=6):
         """Waiting time factor (E2/E2/n Erlang queueing theory using 6th order polynomial regression)"""
 
-        # Create dataframe with data from Groenveld (2007) - Table V
-        utilisation = np.array([.1, .2, .3, .4, .5, .6, .7, .8, .9])
-        nr_of_servers = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
-        data = np.array([
-            [0.0166, 0.0006, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000],
-            [0.0604, 0.0065, 0.0011, 0.0002, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000],
-            [0.1310, 0.0235, 0.0062, 0.0019, 0.0007, 0.0002, 0.0001, 0.0000, 0.0000, 0.0000],
-            [0.2355, 0.0576, 0.0205, 0.0085, 0.0039, 0.0019, 0.0009, 0.0005, 0.0003, 0.0001],
-            [0.3904, 0.1181, 0.0512, 0.0532, 0.0142, 0.0082, 0.0050, 0.0031, 0.0020, 0.0013],
-            [0.6306, 0.2222, 0.1103, 0.0639, 0.0400, 0.0265, 0.0182, 0.0128, 0.0093, 0.0069],
-            [1.0391, 0.4125, 0.2275, 0.1441, 0.0988, 0.0712, 0.0532, 0.0407, 0.0319, 0.0258],
-            [1.8653, 0.8300, 0.4600, 0.3300, 0.2300, 0.1900, 0.1400, 0.1200, 0.0900, 0.0900],
-            [4.3590, 2.0000, 1.2000, 0.9200, 0.6500, 0.5700, 0.4400, 0.4000, 0.3200, 0.3000]
-            ])
-        df = pd.DataFrame(data, index=utilisation, columns=nr_of_servers)
-
-        # Create a 6th order polynomial fit through the data (for nr_of_stations_chk)
-        target = df.loc[:, nr_of_servers_chk]
-        p_p = np.polyfit(target.index, target.values, poly_order)
-
-        waiting_factor = np.polyval(p_p, occupancy)
-        #todo: when the nr of servers > 10 the waiting factor should be set to inf (definitively more equipment needed)
-
-        # Return waiting factor
-        return waiting_factor
+        return core.occupancy_to_waitingfactor(occupancy=occupancy, nr_of_servers_chk=nr_of_servers_chk,
+                                               poly_order=poly_order, kendall='E2/E2/n')
 
     def waitingfactor_to_occupancy(self, factor=.3, nr_of_servers_chk=4, poly_order=6):
-        """Waiting time factor (E2/E2/n Erlang queueing theory using 6th order polynomial regression)"""
+        """Occupancy that results in a given waiting time factor (E2/E2/n Erlang queueing theory)"""
+
+        return core.waitingfactor_to_occupancy(factor=factor, nr_of_servers_chk=nr_of_servers_chk,
+                                               poly_order=poly_order, kendall='E2/E2/n')
 
-        # Create dataframe with data from Groenveld (2007) - Table V
-        utilisation = np.array([.1, .2, .3, .4, .5, .6, .7, .8, .9])
-        nr_of_servers = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
-        data = np.array([
-            [0.0166, 0.0006, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000],
-            [0.0604, 0.0065, 0.0011, 0.0002, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000],
-            [0.1310, 0.0235, 0.0062, 0.0019, 0.0007, 0.0002, 0.0001, 0.0000, 0.0000, 0.0000],
-            [0.2355, 0.0576, 0.0205, 0.0085, 0.0039, 0.0019, 0.0009, 0.0005, 0.0003, 0.0001],
-            [0.3904, 0.1181, 0.0512, 0.0532, 0.0142, 0.0082, 0.0050, 0.0031, 0.0020, 0.0013],
-            [0.6306, 0.2222, 0.1103, 0.0639, 0.0400, 0.0265, 0.0182, 0.0128, 0.0093, 0.0069],
-            [1.0391, 0.4125, 0.2275, 0.1441, 0.0988, 0.0712, 0.0532, 0.0407, 0.0319, 0.0258],
-            [1.8653, 0.8300, 0.4600, 0.3300, 0.2300, 0.1900, 0.1400, 0.1200, 0.0900, 0.0900],
-            [4.3590, 2.0000, 1.2000, 0.9200, 0.6500, 0.5700, 0.4400, 0.4000, 0.3200, 0.3000]
-        ])
-        df = pd.DataFrame(data, index=utilisation, columns=nr_of_servers)
-
-        # Create a 6th order polynomial fit through the data (for nr_of_stations_chk)
-        target = df.loc[:, nr_of_servers_chk]
-        p_p = np.polyfit(target.values, target.index, poly_order)
-        print(p_p)
-
-        occupancy = np.polyval(p_p, factor)
-
-        # Return occupancy
-        return occupancy
-
-    def waiting_time(self, year):
+    def waiting_time(self, year, berth_occupancy_online=None, crane_occupancy_online=None):
         """
-       - Import the berth occupancy of every year
+       - Import the berth occupancy of every year (or use the berth and crane occupancy already computed for the year)
        - Find the factor for the waiting time with the E2/E/n quing theory using 4th order polynomial regression
        - Waiting time is the factor times the crane occupancy
        """
-        # todo: fix the waiting time method to use
-        handysize_calls, handymax_calls, panamax_calls, total_calls, total_vol = self.calculate_vessel_calls(year)
-        berth_occupancy_planned, berth_occupancy_online, crane_occupancy_planned, crane_occupancy_online= self.calculate_berth_occupancy(
-            year, handysize_calls, handymax_calls, panamax_calls)
+        if berth_occupancy_online is None or crane_occupancy_online is None:
+            handysize_calls, handymax_calls, panamax_calls, total_calls, total_vol = self.calculate_vessel_calls(year)
+            berth_occupancy_planned, berth_occupancy_online, crane_occupancy_planned, crane_occupancy_online = \
+                self.calculate_berth_occupancy(year, handysize_calls, handymax_calls, panamax_calls)
 
-        # find the different factors which are linked to the number of berths
+        # find the factor which is linked to the number of berths
         berths = len(self.find_elements(Berth))
+        factor = waiting_time_factor(berth_occupancy_online, berths).item()
 
-        if berths == 1:
-            factor = max(0,
-                         79.726 * berth_occupancy_online ** 4 - 126.47 * berth_occupancy_online ** 3 + 70.660 * berth_occupancy_online ** 2 - 14.651 * berth_occupancy_online + 0.9218)
-        elif berths == 2:
-            factor = max(0,
-                         29.825 * berth_occupancy_online ** 4 - 46.489 * berth_occupancy_online ** 3 + 25.656 * berth_occupancy_online ** 2 - 5.3517 * berth_occupancy_online + 0.3376)
-        elif berths == 3:
-            factor = max(0,
-                         19.362 * berth_occupancy_online ** 4 - 30.388 * berth_occupancy_online ** 3 + 16.791 * berth_occupancy_online ** 2 - 3.5457 * berth_occupancy_online + 0.2253)
-        elif berths == 4:
-            factor = max(0,
-                         17.334 * berth_occupancy_online ** 4 - 27.745 * berth_occupancy_online ** 3 + 15.432 * berth_occupancy_online ** 2 - 3.2725 * berth_occupancy_online + 0.2080)
-        elif berths == 5:
-            factor = max(0,
-                         11.149 * berth_occupancy_online ** 4 - 17.339 * berth_occupancy_online ** 3 + 9.4010 * berth_occupancy_online ** 2 - 1.9687 * berth_occupancy_online + 0.1247)
-        elif berths == 6:
-            factor = max(0,
-                         10.512 * berth_occupancy_online ** 4 - 16.390 * berth_occupancy_online ** 3 + 8.8292 * berth_occupancy_online ** 2 - 1.8368 * berth_occupancy_online + 0.1158)
-        elif berths == 7:
-            factor = max(0,
-                         8.4371 * berth_occupancy_online ** 4 - 13.226 * berth_occupancy_online ** 3 + 7.1446 * berth_occupancy_online ** 2 - 1.4902 * berth_occupancy_online + 0.0941)
-        else:
-            # if there are no berths the occupancy is 'infinite' so a berth is certainly needed
-            factor = float("inf")
-
-        waiting_time_hours = factor * crane_occupancy_online * self.operational_hours / total_calls
-        waiting_time_occupancy = waiting_time_hours * total_calls / self.operational_hours
+        waiting_time_occupancy = factor * crane_occupancy_online
 
         return factor, waiting_time_occupancy
 
@@ -2124,51 +2004,15 @@ class System:
     def land_use_plot(self, width=0.25, alpha=0.6, fontsize=20):
         """Gather data from Terminal and plot which elements come online when"""
 
-        # get land use
-        years = []
-        quay_land_use = []
-        stack_land_use = []
-        empty_land_use = []
-        oog_land_use = []
-        gate_land_use = []
-        general_land_use = []
-
-        for year in range(self.startyear, self.startyear + self.lifecycle):
-
-            years.append(year)
-            quay_land_use.append(0)
-            stack_land_use.append(0)
-            empty_land_use.append(0)
-            oog_land_use.append(0)
-            gate_land_use.append(0)
-            general_land_use.append(0)
-
-            for element in self.elements:
-                if isinstance(element, Quay_wall):
-                    if year >= element.year_online:
-                        quay_land_use[-1] += element.land_use
-                if isinstance(element, Laden_Stack):
-                    if year >= element.year_online:
-                        stack_land_use[-1] += element.land_use
-                if isinstance(element, Empty_Stack):
-                    if year >= element.year_online:
-                        empty_land_use[-1] += element.land_use
-                if isinstance(element, OOG_Stack):
-                    if year >= element.year_online:
-                        oog_land_use[-1] += element.land_use
-                if isinstance(element, Gate):
-                    if year >= element.year_online:
-                        gate_land_use[-1] += element.land_use
-                if isinstance(element, General_Services):
-                    if year >= element.year_online:
-                        general_land_use[-1] += element.land_use
-
-        quay_land_use = [x * 0.0001 for x in quay_land_use]
-        stack_land_use = [x * 0.0001 for x in stack_land_use]
-        empty_land_use = [x * 0.0001 for x in empty_land_use]
-        oog_land_use = [x * 0.0001 for x in oog_land_use]
-        gate_land_use = [x * 0.0001 for x in gate_land_use]
-        general_land_use = [x * 0.0001 for x in general_land_use]
+        # get land use [ha]
+        land_use = self.land_use_frame()
+        years = land_use.index.tolist()
+        quay_land_use = land_use['quay'].tolist()
+        stack_land_use = land_use['stack'].tolist()
+        empty_land_use = land_use['empty'].tolist()
+        oog_land_use = land_use['oog'].tolist()
+        gate_land_use = land_use['gate'].tolist()
+        general_land_use = land_use['general'].tolist()
 
         quay_stack = np.add(quay_land_use, stack_land_use).tolist()
         quay_stack_empty = np.add(quay_stack, empty_land_use).tolist()
@@ -2400,4 +2244,54 @@ class System:
         ax.set_title('Overview of Opex')
         ax.set_xticks([x for x in years])
         ax.set_xticklabels(years)
-        ax.legend()
\ No newline at end of file
+        ax.legend()
+
+
+# *** Design space sweep
+def sweep(elements, stack_equipment=('rs',), laden_stack=('rs',), energy_price=(0.17,), fuel_price=(1,),
+          land_price=(0,), processes=None, **kwargs):
+    """Simulate a container terminal for every combination of stack equipment, laden stack, energy price, fuel price
+    and land price
+
+    elements: the elements every terminal starts with (commodities and vessels), these are copied per terminal
+    stack_equipment, laden_stack, energy_price, fuel_price, land_price: the values to combine
+    processes: number of worker processes (default: number of cpus, 1 runs in the current process)
+    kwargs: other inputs of System (startyear, lifecycle, container split, etc.), equal for all terminals
+
+    The throughputs that only depend on the demand (see calculate_demand_throughput) are calculated once and shared
+    by all terminals.
+
+    returns a dataframe with a row per combination, with the inputs and the land, labour, opex, capex and NPV that
+    simulate returns"""
+
+    grid = list(itertools.product(stack_equipment, laden_stack, energy_price, fuel_price, land_price))
+
+    # demand derived throughputs, equal for all combinations
+    terminal = System(elements=copy.deepcopy(elements), **kwargs)
+    for year in range(terminal.startyear, terminal.startyear + terminal.lifecycle):
+        terminal.get_demand_throughput(year)
+    demand_throughput = terminal._demand_signature, terminal.demand_throughput
+
+    # the inputs of the sweep are handed to each worker once, not with every combination
+    state = {'elements': elements, 'demand_throughput': demand_throughput, 'kwargs': kwargs}
+    results = list(montecarlo.map_tasks(_simulate_sweep, grid, state, processes))
+
+    columns = ['stack_equipment', 'laden_stack', 'energy_price', 'fuel_price', 'land_price',
+               'land', 'labour', 'opex', 'capex', 'NPV']
+
+    return pd.DataFrame({column: [result[i] for result in results] for i, column in enumerate(columns)})
+
+
+def _simulate_sweep(state, combination):
+    """simulate the terminal of a single combination of the sweep"""
+
+    stack_equipment, laden_stack, energy_price, fuel_price, land_price = combination
+
+    terminal = System(elements=copy.deepcopy(state['elements']), stack_equipment=stack_equipment,
+                      laden_stack=laden_stack, energy_price=energy_price, fuel_price=fuel_price,
+                      land_price=land_price, **state['kwargs'])
+    terminal._demand_signature, terminal.demand_throughput = state['demand_throughput']
+
+    NPV, data = terminal.simulate()
+
+    return combination + (data['land'], data['labour'], data['opex'], data['capex'], NPV)
@@ -1,7 +1,13 @@
 # package(s) for data handling
+import functools
+
 import pandas as pd
 import numpy as np
 
+# opentisim package
+from opentisim import queueing
+from opentisim.element_store import ElementStore
+
 
 # *** General functions
 def report_element(Terminal, Element, year):
@@ -10,11 +16,9 @@ def report_element(Terminal, Element, year):
     element_name = []
     list_of_elements = find_elements(Terminal, Element)
     if list_of_elements != []:
-        for element in list_of_elements:
-            element_name = element.name
-            elements += 1
-            if year >= element.year_online:
-                elements_online += 1
+        element_name = list_of_elements[-1].name
+        elements = len(list_of_elements)
+        elements_online = online_elements(Terminal, Element, year)
 
     if Terminal.debug:
         if elements_online or elements:
@@ -24,7 +28,14 @@ def report_element(Terminal, Element, year):
 
 
 def find_elements(Terminal, obj):
-    """return elements of type obj part of Terminal.elements"""
+    """return elements of type obj part of Terminal.elements
+
+    For an ElementStore these are a read-only view that follows the store (see ElementStore.find), take a copy
+    (list(...)) to keep or change the elements found at this point."""
+
+    # the element store of the System keeps an index of the elements per class
+    if isinstance(Terminal.elements, ElementStore):
+        return Terminal.elements.find(obj)
 
     list_of_elements = []
     if Terminal.elements != []:
@@ -35,50 +46,85 @@ def find_elements(Terminal, obj):
     return list_of_elements
 
 
-def add_cashflow_data_to_element(Terminal, element):
-    """Place cashflow data in element dataframe
-    Elements that take two years to build are assign 60% to year one and 40% to year two."""
+def online_elements(Terminal, obj, year, attribute=None):
+    """return the number of elements of type obj that are online in year (year >= year_online),
+    or the sum of the given attribute (e.g. 'capacity') of these elements"""
+
+    # the element store of the System keeps a timeline of the elements per class
+    if isinstance(Terminal.elements, ElementStore):
+        return Terminal.elements.online(obj, year, attribute)
+
+    total = 0
+    for element in find_elements(Terminal, obj):
+        if year >= element.year_online:
+            total += 1 if attribute is None else getattr(element, attribute)
+
+    return total
+
+
+def online_series(Terminal, obj, years, attribute=None):
+    """return an array with the result of online_elements(Terminal, obj, year, attribute) for each of the given years"""
+
+    # the element store of the System keeps a timeline of the elements per class
+    if isinstance(Terminal.elements, ElementStore):
+        return Terminal.elements.online_series(obj, years, attribute)
+
+    return np.array([online_elements(Terminal, obj, year, attribute) for year in years])
 
-    # years
-    years = list(range(Terminal.startyear, Terminal.startyear + Terminal.lifecycle))
 
-    # capex
-    capex = element.capex
+def planned_elements(Terminal, obj, attribute=None):
+    """return the number of elements of type obj (online or not),
+    or the sum of the given attribute (e.g. 'capacity') of these elements"""
 
-    # opex
-    maintenance = element.maintenance
-    insurance = element.insurance
-    labour = element.labour
+    # the element store of the System keeps a timeline of the elements per class
+    if isinstance(Terminal.elements, ElementStore):
+        return Terminal.elements.planned(obj, attribute)
 
-    # year online
-    year_online = element.year_online
-    year_delivery = element.delivery_time
+    total = 0
+    for element in find_elements(Terminal, obj):
+        total += 1 if attribute is None else getattr(element, attribute)
 
-    df = pd.DataFrame()
+    return total
 
-    # years
-    df["year"] = years
 
-    # capex
-    if year_delivery > 1:
-        df.loc[df["year"] == year_online - 2, "capex"] = 0.6 * capex
-        df.loc[df["year"] == year_online - 1, "capex"] = 0.4 * capex
-    else:
-        df.loc[df["year"] == year_online - 1, "capex"] = capex
+def required_elements(required_capacity, capacity_planned, capacity):
+    """return the number of elements of the given capacity to add to capacity_planned to reach required_capacity
 
-    # opex
-    if maintenance:
-        df.loc[df["year"] >= year_online, "maintenance"] = maintenance
-    if insurance:
-        df.loc[df["year"] >= year_online, "insurance"] = insurance
-    if labour:
-        df.loc[df["year"] >= year_online, "labour"] = labour
+    This is the number of times a loop 'while required_capacity > capacity_planned: add an element' would add an
+    element, without recalculating the capacities after each addition."""
 
-    df.fillna(0, inplace=True)
+    if required_capacity <= capacity_planned:
+        return 0
 
-    element.df = df
+    # the division may be off by one due to rounding, the result is corrected to match the loop exactly
+    number = int(np.ceil((required_capacity - capacity_planned) / capacity))
+    while required_capacity > capacity_planned + number * capacity:
+        number += 1
+    while number > 1 and required_capacity <= capacity_planned + (number - 1) * capacity:
+        number -= 1
 
-    return element
+    return number
+
+
+def ratio_elements(served, ratio, online, planned):
+    """return the number of elements to add to have ratio elements per served element (e.g. tractors per STS crane)
+
+    This is the number of times a loop 'while served > online // ratio: add an element' would add an element, where
+    the loop counts the elements online at first and the elements planned after the first addition."""
+
+    required = served * ratio
+    if online >= required:
+        return 0
+
+    return max(1, required_elements(required, planned, 1))
+
+
+def add_cashflow_data_to_element(Terminal, element):
+    """Place cashflow data of the element in the cash flow ledger of the Terminal
+    Elements that take two years to build are assign 60% to year one and 40% to year two.
+    The cash flows remain available as a read-only dataframe via element.df"""
+
+    return Terminal.ledger.add(element)
 
 
 def add_cashflow_elements(Terminal, labour):
@@ -104,24 +150,17 @@ def add_cashflow_elements(Terminal, labour):
                        'revenues'] != 0, 'labour'] = labour.international_staff * labour.international_salary + labour.local_staff * labour.local_salary
     # todo: check the labour costs of the container terminals (they are not included now)
 
-    for element in Terminal.elements:
-        if hasattr(element, 'df'):
-            for column in cash_flows.columns:
-                if column in element.df.columns and column != "year":
-                    cash_flows[column] += element.df[column]
+    totals = Terminal.ledger.totals(Terminal.elements)
+    for column in cash_flows.columns:
+        if column in Terminal.ledger.column:
+            cash_flows[column] += totals[:, Terminal.ledger.column[column]]
 
     # calculate WACC real cashflows
+    columns = [column for column in cash_flows.columns if column != "year"]
     cash_flows_WACC_real = pd.DataFrame()
     cash_flows_WACC_real['year'] = cash_flows['year']
-    for year in range(Terminal.startyear, Terminal.startyear + Terminal.lifecycle):
-        for column in cash_flows.columns:
-            if column != "year":
-                cash_flows_WACC_real.loc[cash_flows_WACC_real['year'] == year, column] = \
-                    cash_flows.loc[
-                        cash_flows[
-                            'year'] == year, column] / (
-                            (1 + WACC_real()) ** (
-                            year - Terminal.startyear))
+    cash_flows_WACC_real[columns] = cash_flows[columns].to_numpy(dtype=float) * \
+        discount_factors(Terminal.startyear, Terminal.lifecycle)[:, np.newaxis]
 
     cash_flows = cash_flows.fillna(0)
     cash_flows_WACC_real = cash_flows_WACC_real.fillna(0)
@@ -155,6 +194,41 @@ def NPV(Terminal, labour):
     return df
 
 
+def NPV_sensitivity(Terminal, labour, Gearing=60, Re=.10, Rd=.30, Tc=.28, inflation=0.02):
+    """NPV of a simulated Terminal for a grid of financial parameters (see NPV_surface).
+    The investment plan does not depend on these parameters, so the Terminal is not simulated again."""
+
+    # add cash flow information for each of the Terminal elements
+    cash_flows, cash_flows_WACC_real = add_cashflow_elements(Terminal, labour)
+
+    return NPV_surface(cash_flows, Gearing=Gearing, Re=Re, Rd=Rd, Tc=Tc, inflation=inflation)
+
+
+def NPV_surface(cash_flows, Gearing=60, Re=.10, Rd=.30, Tc=.28, inflation=0.02):
+    """Evaluate the NPV of undiscounted cash flows for every combination of the financial parameters
+    of WACC_nominal and WACC_real. Each parameter is a single value or a sequence of values.
+
+    All grid points are discounted at once as a single matrix product of a (points x years) matrix of
+    discount factors with the net cash flow per year (revenues minus all other cash flow columns).
+    Returns a dataframe with one row per grid point and the columns Gearing, Re, Rd, Tc, inflation and NPV."""
+
+    # net cash flow per year
+    revenues = np.nan_to_num(cash_flows['revenues'].to_numpy(dtype=float)) if 'revenues' in cash_flows else 0
+    costs = [column for column in cash_flows.columns if column not in ['year', 'revenues']]
+    net_cash_flow = revenues - np.nan_to_num(cash_flows[costs].to_numpy(dtype=float)).sum(axis=1)
+
+    # all combinations of the financial parameters
+    grid = np.meshgrid(*[np.atleast_1d(np.asarray(parameter, dtype=float))
+                         for parameter in [Gearing, Re, Rd, Tc, inflation]], indexing='ij')
+    Gearing, Re, Rd, Tc, inflation = [parameter.ravel() for parameter in grid]
+
+    WACC_real = (WACC_nominal(Gearing=Gearing, Re=Re, Rd=Rd, Tc=Tc) + 1) / (inflation + 1) - 1
+    factors = (1 + WACC_real)[:, np.newaxis] ** -np.arange(len(cash_flows), dtype=float)
+
+    return pd.DataFrame({'Gearing': Gearing, 'Re': Re, 'Rd': Rd, 'Tc': Tc, 'inflation': inflation,
+                         'NPV': factors @ net_cash_flow})
+
+
 def WACC_nominal(Gearing=60, Re=.10, Rd=.30, Tc=.28):
     """Nominal cash flow is the true dollar amount of future revenues the company expects
     to receive and expenses it expects to pay out, including inflation.
@@ -183,15 +257,31 @@ def WACC_real(inflation=0.02):  # old: interest=0.0604
     return WACC_real
 
 
-def occupancy_to_waitingfactor(occupancy=.3, nr_of_servers_chk=4, poly_order=6, kendall='E2/E2/n'):
-    """Waiting time factor (E2/E2/n or M/E2/n) queueing theory using 6th order polynomial regression)"""
-
-    if kendall == 'E2/E2/n':
-        # Create dataframe with data from Groenveld (2007) - Table V
-        # See also PIANC 2014 Table 6.2
-        utilisation = np.array([.1, .2, .3, .4, .5, .6, .7, .8, .9])
-        nr_of_servers = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
-        data = np.array([
+@functools.lru_cache(maxsize=128)
+def discount_factors(startyear, lifecycle, WACC=None, inflation=0.02):
+    """Return the discount factors 1 / (1 + WACC_real) ** (year - startyear) for each year of the lifecycle.
+    WACC is the nominal WACC (default: WACC_nominal()), which is converted to a real WACC as in WACC_real.
+    The vectors are cached per (startyear, lifecycle, WACC, inflation) and returned read-only."""
+
+    if WACC is None:
+        WACC = WACC_nominal()
+
+    WACC_real = (WACC + 1) / (inflation + 1) - 1
+
+    factors = 1 / (1 + WACC_real) ** np.arange(lifecycle)
+    factors.setflags(write=False)
+
+    return factors
+
+
+# *** Queueing theory
+# Waiting time factors (waiting time / service time) as (utilisation, nr_of_servers, data) per kendall notation
+waitingfactor_tables = {
+    # Groenveld (2007) - Table V, see also PIANC 2014 Table 6.2
+    'E2/E2/n': (
+        np.array([.1, .2, .3, .4, .5, .6, .7, .8, .9]),
+        np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10]),
+        np.array([
             [0.0166, 0.0006, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000],
             [0.0604, 0.0065, 0.0011, 0.0002, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000],
             [0.1310, 0.0235, 0.0062, 0.0019, 0.0007, 0.0002, 0.0001, 0.0000, 0.0000, 0.0000],
@@ -201,14 +291,12 @@ def occupancy_to_waitingfactor(occupancy=.3, nr_of_servers_chk=4, poly_order=6,
             [1.0391, 0.4125, 0.2275, 0.1441, 0.0988, 0.0712, 0.0532, 0.0407, 0.0319, 0.0258],
             [1.8653, 0.8300, 0.4600, 0.3300, 0.2300, 0.1900, 0.1400, 0.1200, 0.0900, 0.0900],
             [4.3590, 2.0000, 1.2000, 0.9200, 0.6500, 0.5700, 0.4400, 0.4000, 0.3200, 0.3000]
-        ])
-
-    elif kendall == 'M/E2/n':
-        # Create dataframe with data from Groenveld (2007) - Table IV
-        # See also PIANC 2014 Table 6.1
-        utilisation = np.array([.1, .15, .2, .25, .3, .35, .4, .45, .5, .55, .6, .65, .7, .75, .8, .85, .9])
-        nr_of_servers = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14])
-        data = np.array([
+        ])),
+    # Groenveld (2007) - Table IV, see also PIANC 2014 Table 6.1
+    'M/E2/n': (
+        np.array([.1, .15, .2, .25, .3, .35, .4, .45, .5, .55, .6, .65, .7, .75, .8, .85, .9]),
+        np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14]),
+        np.array([
             [0.08, 0.01, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00],
             [0.13, 0.02, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00],
             [0.19, 0.03, 0.01, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00],
@@ -226,75 +314,136 @@ def occupancy_to_waitingfactor(occupancy=.3, nr_of_servers_chk=4, poly_order=6,
             [3.00, 1.34, 0.82, 0.57, 0.42, 0.33, 0.27, 0.22, 0.18, 0.16, 0.13, 0.11, 0.10, 0.09],
             [4.50, 2.00, 1.34, 0.90, 0.70, 0.54, 0.46, 0.39, 0.34, 0.30, 0.26, 0.23, 0.20, 0.18],
             [6.75, 3.14, 2.01, 1.45, 1.12, 0.91, 0.76, 0.65, 0.56, 0.50, 0.45, 0.40, 0.36, 0.33]
-        ])
+        ]))
+}
+
+# polynomial coefficients fitted through the waiting time factors per (kendall, nr_of_servers, poly_order)
+waitingfactor_coefficients = {}
+
+
+def occupancy_to_waitingfactor_coefficients(nr_of_servers_chk=4, poly_order=6, kendall='E2/E2/n'):
+    """Coefficients of the polynomial fit of the waiting time factor as a function of the occupancy.
+    The fit is made once per (kendall, nr_of_servers_chk, poly_order) and kept in waitingfactor_coefficients."""
+
+    key = (kendall, int(nr_of_servers_chk), poly_order)
+    if key not in waitingfactor_coefficients:
+        utilisation, nr_of_servers, data = waitingfactor_tables[kendall]
+        if key[1] not in nr_of_servers:
+            raise KeyError(nr_of_servers_chk)
+
+        # Create a polynomial fit through the data (for nr_of_servers_chk)
+        target = data[:, list(nr_of_servers).index(key[1])]
+        p_p = np.polyfit(utilisation, target, poly_order)
+        p_p.setflags(write=False)
 
-    df = pd.DataFrame(data, index=utilisation, columns=nr_of_servers)
+        waitingfactor_coefficients[key] = p_p
 
-    # Create a 6th order polynomial fit through the data (for nr_of_stations_chk)
-    target = df.loc[:, nr_of_servers_chk]
-    p_p = np.polyfit(target.index, target.values, poly_order)
+    return waitingfactor_coefficients[key]
 
-    waiting_factor = np.polyval(p_p, occupancy)
-    # todo: when the nr of servers > 10 the waiting factor should be set to inf (definitively more equipment needed)
+
+def occupancy_to_waitingfactor(occupancy=.3, nr_of_servers_chk=4, poly_order=6, kendall='E2/E2/n'):
+    """Waiting time factor (E2/E2/n or M/E2/n) queueing theory using 6th order polynomial regression)
+
+    occupancy and nr_of_servers_chk may also be arrays (broadcast against each other), in which case
+    all waiting factors are evaluated in one go. Numbers of servers outside the Groenveld (2007) tables
+    are evaluated with the analytic approximation of queueing.waiting_factor."""
+
+    nr_of_servers = waitingfactor_tables[kendall][1]
+
+    if np.ndim(occupancy) == 0 and np.ndim(nr_of_servers_chk) == 0:
+        if nr_of_servers_chk not in nr_of_servers:
+            return queueing.waiting_factor(occupancy, nr_of_servers_chk, kendall)
+        return np.polyval(occupancy_to_waitingfactor_coefficients(nr_of_servers_chk, poly_order, kendall), occupancy)
+
+    occupancy, nr_of_servers_chk = np.broadcast_arrays(np.asarray(occupancy, dtype=float),
+                                                       np.asarray(nr_of_servers_chk))
+    occupancy = occupancy.ravel()
+    in_table = np.isin(nr_of_servers_chk.ravel(), nr_of_servers)
+
+    # coefficients for each occupancy, fitted (or looked up) once per distinct number of servers
+    servers, index = np.unique(nr_of_servers_chk.ravel()[in_table], return_inverse=True)
+    coefficients = np.array([occupancy_to_waitingfactor_coefficients(n, poly_order, kendall)
+                             for n in servers]).reshape(len(servers), poly_order + 1)[index.ravel()]
+
+    # Horner evaluation of all polynomials at once
+    waiting_factor = np.zeros(in_table.sum())
+    for coefficient in coefficients.T:
+        waiting_factor = waiting_factor * occupancy[in_table] + coefficient
+
+    waiting_factors = np.empty(occupancy.size)
+    waiting_factors[in_table] = waiting_factor
+    waiting_factors[~in_table] = queueing.waiting_factor(occupancy[~in_table],
+                                                         nr_of_servers_chk.ravel()[~in_table], kendall)
 
     # Return waiting factor
-    return waiting_factor
+    return waiting_factors.reshape(nr_of_servers_chk.shape)
 
 
-def waitingfactor_to_occupancy(factor=.3, nr_of_servers_chk=4, poly_order=6):
-    """Waiting time factor (E2/E2/n or M/E2/n) queueing theory using 6th order polynomial regression)"""
+# monotone (occupancy, waiting factor) interpolation tables per (kendall, nr_of_servers, poly_order)
+occupancy_tables = {}
 
-    if kendall == 'E2/E2/n':
-        # Create dataframe with data from Groenveld (2007) - Table V
-        # See also PIANC 2014 Table 6.2
-        utilisation = np.array([.1, .2, .3, .4, .5, .6, .7, .8, .9])
-        nr_of_servers = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
-        data = np.array([
-            [0.0166, 0.0006, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000],
-            [0.0604, 0.0065, 0.0011, 0.0002, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000, 0.0000],
-            [0.1310, 0.0235, 0.0062, 0.0019, 0.0007, 0.0002, 0.0001, 0.0000, 0.0000, 0.0000],
-            [0.2355, 0.0576, 0.0205, 0.0085, 0.0039, 0.0019, 0.0009, 0.0005, 0.0003, 0.0001],
-            [0.3904, 0.1181, 0.0512, 0.0532, 0.0142, 0.0082, 0.0050, 0.0031, 0.0020, 0.0013],
-            [0.6306, 0.2222, 0.1103, 0.0639, 0.0400, 0.0265, 0.0182, 0.0128, 0.0093, 0.0069],
-            [1.0391, 0.4125, 0.2275, 0.1441, 0.0988, 0.0712, 0.0532, 0.0407, 0.0319, 0.0258],
-            [1.8653, 0.8300, 0.4600, 0.3300, 0.2300, 0.1900, 0.1400, 0.1200, 0.0900, 0.0900],
-            [4.3590, 2.0000, 1.2000, 0.9200, 0.6500, 0.5700, 0.4400, 0.4000, 0.3200, 0.3000]
-        ])
-    elif kendall == 'M/E2/n':
-        # Create dataframe with data from Groenveld (2007) - Table IV
-        # See also PIANC 2014 Table 6.1
-        utilisation = np.array([.1, .15, .2, .25, .3, .35, .4, .45, .5, .55, .6, .65, .7, .75, .8, .85, .9])
-        nr_of_servers = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14])
-        data = np.array([
-            [0.08, 0.01, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00],
-            [0.13, 0.02, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00],
-            [0.19, 0.03, 0.01, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00],
-            [0.25, 0.05, 0.02, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00],
-            [0.32, 0.08, 0.03, 0.01, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00],
-            [0.40, 0.11, 0.04, 0.02, 0.01, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00],
-            [0.50, 0.15, 0.06, 0.03, 0.02, 0.01, 0.01, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00],
-            [0.60, 0.20, 0.08, 0.05, 0.03, 0.02, 0.01, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00],
-            [0.75, 0.26, 0.12, 0.07, 0.04, 0.03, 0.02, 0.01, 0.01, 0.01, 0.00, 0.00, 0.00, 0.00],
-            [0.91, 0.33, 0.16, 0.10, 0.06, 0.04, 0.03, 0.02, 0.02, 0.01, 0.01, 0.01, 0.00, 0.00],
-            [1.13, 0.43, 0.23, 0.14, 0.09, 0.06, 0.05, 0.03, 0.03, 0.02, 0.02, 0.01, 0.01, 0.01],
-            [1.38, 0.55, 0.30, 0.19, 0.12, 0.09, 0.07, 0.05, 0.04, 0.03, 0.03, 0.02, 0.02, 0.02],
-            [1.75, 0.73, 0.42, 0.27, 0.19, 0.14, 0.11, 0.09, 0.07, 0.06, 0.05, 0.04, 0.03, 0.03],
-            [2.22, 0.96, 0.59, 0.39, 0.28, 0.21, 0.17, 0.14, 0.12, 0.10, 0.08, 0.07, 0.06, 0.05],
-            [3.00, 1.34, 0.82, 0.57, 0.42, 0.33, 0.27, 0.22, 0.18, 0.16, 0.13, 0.11, 0.10, 0.09],
-            [4.50, 2.00, 1.34, 0.90, 0.70, 0.54, 0.46, 0.39, 0.34, 0.30, 0.26, 0.23, 0.20, 0.18],
-            [6.75, 3.14, 2.01, 1.45, 1.12, 0.91, 0.76, 0.65, 0.56, 0.50, 0.45, 0.40, 0.36, 0.33]
-        ])
 
-    df = pd.DataFrame(data, index=utilisation, columns=nr_of_servers)
+def waitingfactor_to_occupancy_table(nr_of_servers_chk=4, poly_order=6, kendall='E2/E2/n'):
+    """Table of occupancies and (monotone non-decreasing) waiting factors used to invert
+    occupancy_to_waitingfactor, computed once per (kendall, nr_of_servers_chk, poly_order).
+    Within the Groenveld (2007) tables the occupancy range of the table is used, otherwise 0 - 0.99."""
+
+    key = (kendall, int(nr_of_servers_chk), poly_order)
+    if key not in occupancy_tables:
+        utilisation, nr_of_servers, data = waitingfactor_tables[kendall]
+        if key[1] in nr_of_servers:
+            occupancy = np.linspace(utilisation.min(), utilisation.max(), 201)
+        else:
+            occupancy = np.linspace(0, .99, 201)
+
+        factor = np.maximum.accumulate(occupancy_to_waitingfactor(occupancy, key[1], poly_order, kendall))
+        occupancy.setflags(write=False)
+        factor.setflags(write=False)
+
+        occupancy_tables[key] = (occupancy, factor)
+
+    return occupancy_tables[key]
+
+
+def waitingfactor_to_occupancy(factor=.3, nr_of_servers_chk=4, poly_order=6, kendall='E2/E2/n', iterations=30):
+    """Occupancy that results in a given waiting time factor (E2/E2/n or M/E2/n), the inverse of
+    occupancy_to_waitingfactor.
+
+    The target factor is bracketed in a precomputed monotone interpolation table, after which the occupancy
+    is refined by bisection. factor and nr_of_servers_chk may be arrays (broadcast against each other).
+    Factors outside the range of the table return the lowest or highest occupancy of the table."""
+
+    scalar = np.ndim(factor) == 0 and np.ndim(nr_of_servers_chk) == 0
+
+    factor, nr_of_servers_chk = np.broadcast_arrays(np.asarray(factor, dtype=float),
+                                                    np.asarray(nr_of_servers_chk))
+    occupancy = np.empty(factor.shape)
+
+    for servers in np.unique(nr_of_servers_chk):
+        select = nr_of_servers_chk == servers
+        target = factor[select]
+        table_occupancy, table_factor = waitingfactor_to_occupancy_table(servers, poly_order, kendall)
+
+        # bracket the target factor in the table
+        index = np.clip(np.searchsorted(table_factor, target), 1, len(table_factor) - 1)
+        low = table_occupancy[index - 1]
+        high = table_occupancy[index]
 
-    # Create a 6th order polynomial fit through the data (for nr_of_stations_chk)
-    target = df.loc[:, nr_of_servers_chk]
-    p_p = np.polyfit(target.values, target.index, poly_order)
-    print(p_p)
+        # bisection refinement
+        for _ in range(iterations):
+            middle = (low + high) / 2
+            below = occupancy_to_waitingfactor(middle, servers, poly_order, kendall) < target
+            low = np.where(below, middle, low)
+            high = np.where(below, high, middle)
 
-    occupancy = np.polyval(p_p, factor)
+        result = (low + high) / 2
+        result[target <= table_factor[0]] = table_occupancy[0]
+        result[target >= table_factor[-1]] = table_occupancy[-1]
+        occupancy[select] = result
 
     # Return occupancy
+    if scalar:
+        return occupancy.item()
     return occupancy
 
 # def waiting_time(self, year):
@@ -0,0 +1,209 @@
+"""Element store used as the collection of terminal objects of the System classes.
+
+The store is a plain list of elements that also keeps an index of the elements per class, so that
+find_elements does not have to scan the whole list with isinstance on every call, and a timeline of
+the year_online values per class, so that the number of elements (or the sum of one of their attributes)
+online in a year follows from a bisect instead of a scan. find hands out read-only views of the index, so that
+callers cannot corrupt it.
+"""
+
+# packages for the timeline index
+import bisect
+from collections.abc import Sequence
+
+import numpy as np
+
+
+class ElementStore(list):
+    """List of terminal elements with an index of the elements per class
+
+    find(obj) returns the elements that are an instance of obj, in list order, as a read-only view of the
+    index (see ElementView) that follows the store. online(obj, year) and planned(obj) return the number of
+    these elements that are online in year, or in total, or the sum of one of their attributes (e.g.
+    capacity). The index for a class is built with a single scan the first time that class is asked for,
+    after which appended elements are added to the index directly. Other changes to the list (insert, remove,
+    item assignment, etc.) reset the index and increase revision."""
+
+    def __init__(self, iterable=()):
+        super().__init__(iterable)
+        self._index = {}
+        self._timeline = {}
+        self.revision = 0
+
+    def find(self, obj):
+        """return elements of type obj
+
+        The returned view follows the store: elements of type obj that are added to the store later on show up in
+        it, so take a copy (list(...)) to keep the elements found at this point."""
+
+        return ElementView(self, obj)
+
+    def _find(self, obj):
+        """the index of the elements of type obj (a list that is private to the store)"""
+
+        if obj not in self._index:
+            self._index[obj] = [element for element in self if isinstance(element, obj)]
+
+        return self._index[obj]
+
+    def online(self, obj, year, attribute=None):
+        """return the number of elements of type obj that are online in year (year >= year_online),
+        or the sum of the given attribute of these elements"""
+
+        years, totals = self._get_timeline(obj, attribute)
+
+        return totals[bisect.bisect_right(years, year)]
+
+    def online_series(self, obj, years, attribute=None):
+        """return an array with the result of online(obj, year, attribute) for each of the given years"""
+
+        years_online, totals = self._get_timeline(obj, attribute)
+
+        return np.asarray(totals)[np.searchsorted(years_online, np.asarray(years), side='right')]
+
+    def planned(self, obj, attribute=None):
+        """return the number of elements of type obj, or the sum of the given attribute of these elements"""
+
+        years, totals = self._get_timeline(obj, attribute)
+
+        return totals[-1]
+
+    def _get_timeline(self, obj, attribute):
+        """sorted year_online values and prefix sums (of 1 or the attribute) of the elements of type obj
+
+        The timeline assumes that year_online and the attribute of an element do not change after it has
+        been appended to the store."""
+
+        key = (obj, attribute)
+        if key not in self._timeline:
+            elements = sorted(self._find(obj), key=lambda element: element.year_online)
+
+            years = []
+            totals = [0]
+            for element in elements:
+                years.append(element.year_online)
+                totals.append(totals[-1] + (1 if attribute is None else getattr(element, attribute)))
+
+            self._timeline[key] = (years, totals)
+
+        return self._timeline[key]
+
+    def _invalidate(self):
+        self._index = {}
+        self._timeline = {}
+        self.revision += 1
+
+    def append(self, element):
+        super().append(element)
+
+        # the index is extended in place
+        for obj, elements in self._index.items():
+            if isinstance(element, obj):
+                elements.append(element)
+
+        # elements are mostly appended in order of year_online, in which case the timeline is simply extended
+        for (obj, attribute), (years, totals) in list(self._timeline.items()):
+            if isinstance(element, obj):
+                if years and element.year_online < years[-1]:
+                    del self._timeline[(obj, attribute)]
+                else:
+                    years.append(element.year_online)
+                    totals.append(totals[-1] + (1 if attribute is None else getattr(element, attribute)))
+
+    def extend(self, iterable):
+        for element in iterable:
+            self.append(element)
+
+    def __iadd__(self, iterable):
+        self.extend(iterable)
+        return self
+
+    def __reduce__(self):
+        # the index is rebuilt when needed, so only the elements are pickled (and copied)
+        return type(self), (list(self),)
+
+    def insert(self, index, element):
+        super().insert(index, element)
+        self._invalidate()
+
+    def remove(self, element):
+        super().remove(element)
+        self._invalidate()
+
+    def pop(self, index=-1):
+        element = super().pop(index)
+        self._invalidate()
+        return element
+
+    def clear(self):
+        super().clear()
+        self._invalidate()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._invalidate()
+
+    def reverse(self):
+        super().reverse()
+        self._invalidate()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._invalidate()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._invalidate()
+
+    def __imul__(self, n):
+        result = super().__imul__(n)
+        self._invalidate()
+        return result
+
+
+class ElementView(Sequence):
+    """Read-only view of the elements of type obj in an ElementStore
+
+    The view looks up the index of the store on every access, so it follows the store (also after changes that
+    reset the index) and has no methods that change it. Like the lists that find_elements used to return, a view
+    compares equal to a list with the same elements (e.g. view != []) and can be added to a list or another view,
+    which gives a new list."""
+
+    def __init__(self, store, obj):
+        self._store = store
+        self._obj = obj
+
+    def _elements(self):
+        return self._store._find(self._obj)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._elements()[index].copy()
+
+        return self._elements()[index]
+
+    def __len__(self):
+        return len(self._elements())
+
+    def __iter__(self):
+        return iter(self._elements())
+
+    def __contains__(self, element):
+        return element in self._elements()
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, ElementView)):
+            return self._elements() == list(other)
+
+        return NotImplemented
+
+    __hash__ = None
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self._elements())
@@ -40,6 +40,7 @@ Jetty = type('Jetty', (hydrogen_mixins.identifiable_properties_mixin,  # Give it
                                hydrogen_mixins.history_properties_mixin,  # Give it procurement history
                                hydrogen_mixins.hascapex_properties_mixin,  # Give it capex info
                                hydrogen_mixins.hasopex_properties_mixin,  # Give it opex info
+                               hydrogen_mixins.hascashflow_properties_mixin,  # Give it a cash flow view
                                hydrogen_mixins.hasrevenue_properties_mixin,  # Give it revenue info
                                hydrogen_mixins.hastriggers_properties_mixin),  # Give it investment triggers (lambda?)
                  {})  # The dictionary is empty because the site type is generic
@@ -50,6 +51,7 @@ Berth = type('Berth', (hydrogen_mixins.identifiable_properties_mixin,  # Give it
                        hydrogen_mixins.berth_properties_mixin,
                        hydrogen_mixins.hascapex_properties_mixin,  # Give it capex info
                        hydrogen_mixins.hasopex_properties_mixin,  # Give it opex info
+                       hydrogen_mixins.hascashflow_properties_mixin,  # Give it a cash flow view
                        hydrogen_mixins.hasrevenue_properties_mixin,  # Give it revenue info
                        hydrogen_mixins.hastriggers_properties_mixin),  # Give it investment triggers (lambda?)
              {})  # The dictionary is empty because the site type is generic
@@ -63,6 +65,7 @@ Pipeline_Jetty = type('Pipeline_Jetty', (hydrogen_mixins.identifiable_properties
                              hydrogen_mixins.pipeline_properties_mixin,
                              hydrogen_mixins.hascapex_properties_mixin,  # Give it capex info
                              hydrogen_mixins.hasopex_properties_mixin,  # Give it opex info
+                             hydrogen_mixins.hascashflow_properties_mixin,  # Give it a cash flow view
                              hydrogen_mixins.hasrevenue_properties_mixin,  # Give it revenue info
                              hydrogen_mixins.hastriggers_properties_mixin),  # Give it investment triggers (lambda?)
                 {})  # The dictionary is empty because the site type is generic
@@ -72,6 +75,7 @@ Pipeline_Hinter = type('Pipeline_Hinter', (hydrogen_mixins.identifiable_properti
                              hydrogen_mixins.pipeline_properties_mixin,
                              hydrogen_mixins.hascapex_properties_mixin,  # Give it capex info
                              hydrogen_mixins.hasopex_properties_mixin,  # Give it opex info
+                             hydrogen_mixins.hascashflow_properties_mixin,  # Give it a cash flow view
                              hydrogen_mixins.hasrevenue_properties_mixin,  # Give it revenue info
                              hydrogen_mixins.hastriggers_properties_mixin),  # Give it investment triggers (lambda?)
                 {})  # The dictionary is empty because the site type is generic
@@ -85,6 +89,7 @@ Storage = type('Storage', (hydrogen_mixins.identifiable_properties_mixin,  # Giv
                            hydrogen_mixins.storage_properties_mixin,
                            hydrogen_mixins.hascapex_properties_mixin,  # Give it capex info
                            hydrogen_mixins.hasopex_properties_mixin,  # Give it opex info
+                           hydrogen_mixins.hascashflow_properties_mixin,  # Give it a cash flow view
                            hydrogen_mixins.hasrevenue_properties_mixin,  # Give it revenue info
                            hydrogen_mixins.hastriggers_properties_mixin),  # Give it investment triggers (lambda?)
                {})  # The dictionary is empty because the site type is generic
@@ -99,6 +104,7 @@ H2retrieval = type('H2retrieval', (hydrogen_mixins.identifiable_properties_mixin
                            hydrogen_mixins.h2retrieval_properties_mixin,
                            hydrogen_mixins.hascapex_properties_mixin,  # Give it capex info
                            hydrogen_mixins.hasopex_properties_mixin,  # Give it opex info
+                           hydrogen_mixins.hascashflow_properties_mixin,  # Give it a cash flow view
                            hydrogen_mixins.hasrevenue_properties_mixin,  # Give it revenue info
                            hydrogen_mixins.hastriggers_properties_mixin),  # Give it investment triggers (lambda?)
                {})  # The dictionary is empty because the site type is generic
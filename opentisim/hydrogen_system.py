@@ -1,4 +1,6 @@
 # package(s) for data handling
+import copy
+
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -8,17 +10,20 @@ import matplotlib
 from opentisim.hydrogen_objects import *
 from opentisim import hydrogen_defaults
 from opentisim import core
+from opentisim.ledger import CashflowLedger
+from opentisim.element_store import ElementStore
+from opentisim.trace import DecisionTrace
 
 class System:
     """This class implements the 'complete supply chain' concept (Van Koningsveld et al, 2020) for hydrogen terminals.
     The module allows variation of the commodity type, the storage type and the h2retrieval type. Terminal development
     is governed by three triggers: the allowable berth occupancy, the allowable dwell time and an h2retrieval
     trigger."""
-    def __init__(self, startyear=2019, lifecycle=20, operational_hours=5840, debug=False, elements=[],
+    def __init__(self, startyear=2019, lifecycle=20, operational_hours=5840, debug=False, elements=None,
                  commodity_type_defaults=hydrogen_defaults.commodity_ammonia_data,
                  storage_type_defaults=hydrogen_defaults.storage_nh3_data,
                  h2retrieval_type_defaults=hydrogen_defaults.h2retrieval_nh3_data,
-                 allowable_berth_occupancy=0.5, allowable_dwelltime=14 / 365, h2retrieval_trigger=1):
+                 allowable_berth_occupancy=0.5, allowable_dwelltime=14 / 365, h2retrieval_trigger=1, trace=None):
         # time inputs
         self.startyear = startyear
         self.lifecycle = lifecycle
@@ -27,8 +32,15 @@ class System:
         # provide intermediate outputs via print statements if debug = True
         self.debug = debug
 
-        # collection of all terminal objects
-        self.elements = elements
+        # record of the investment decisions (see trace.DecisionTrace), None records nothing; with debug = True and
+        # without a trace the investment decisions are printed through a trace that echoes them
+        self.trace = DecisionTrace(echo=True) if trace is None and debug else trace
+
+        # collection of all terminal objects (indexed per class, see find_elements)
+        self.elements = ElementStore(elements if elements is not None else [])
+
+        # cash flows of all terminal elements (elements x years x categories)
+        self.ledger = CashflowLedger(startyear, lifecycle)
 
         # default values to use in selecting which commodity is imported
         self.commodity_type_defaults = commodity_type_defaults
@@ -44,7 +56,7 @@ class System:
         self.revenues = []
 
     # *** Overall terminal investment strategy for terminal class.
-    def simulate(self):
+    def simulate(self, year_from=None, year_to=None):
         """The 'simulate' method implements the terminal investment strategy for this terminal class.
 
         This method automatically generates investment decisions, parametrically derived from overall demand trends and
@@ -74,9 +86,22 @@ class System:
            7. collect all cash flows (capex, opex, revenues)
            8. calculate PV's and aggregate to NPV
 
+        The investment loop (steps 1 and 2) can be limited to the years year_from up to year_to. Steps 3 to 8 are only
+        carried out once the loop has reached the end of the lifecycle. This allows to simulate a terminal up to year
+        K, fork it (see fork) and resume each fork from year K with its own demand scenario:
+
+           terminal.simulate(year_to=K)
+           branch = terminal.fork()
+           branch.simulate(year_from=K)
+
         """
 
-        for year in range(self.startyear, self.startyear + self.lifecycle):
+        if year_from is None:
+            year_from = self.startyear
+        if year_to is None:
+            year_to = self.startyear + self.lifecycle
+
+        for year in range(year_from, year_to):
             """
             The simulate method is designed according to the following overall objectives for the terminal:
             - strategic objective: To maintain a profitable enterprise (NPV > 0) over the terminal lifecycle
@@ -126,6 +151,10 @@ class System:
                 print('$$$ Check pipeline hinterland ----------------------')
             self.pipeline_hinter_invest(year)
 
+        # the remainder of the lifecycle is simulated when the terminal is resumed
+        if year_to < self.startyear + self.lifecycle:
+            return
+
         # 3. for each year calculate the energy costs (requires insight in realized demands)
         for year in range(self.startyear, self.startyear + self.lifecycle):
             self.calculate_energy_cost(year)
@@ -149,7 +178,13 @@ class System:
         # cash_flows, cash_flows_WACC_nominal = self.add_cashflow_elements()
 
         # 8. calculate PV's and aggregate to NPV
-        core.NPV(self, Labour(**hydrogen_defaults.labour_data))
+        return core.NPV(self, Labour(**hydrogen_defaults.labour_data))
+
+    def fork(self):
+        """Return an independent copy of the terminal, including its elements, cash flows, demurrage and revenues.
+        Forking a partially simulated terminal allows to branch it into several futures (see simulate)."""
+
+        return copy.deepcopy(self)
 
     # *** Individual investment methods for terminal elements
     def berth_invest(self, year):
@@ -226,11 +261,12 @@ class System:
         while berth_occupancy_planned > self.allowable_berth_occupancy:
 
             # while planned berth occupancy is too large add a berth when no crane slots are available
-            if self.debug:
-                    print('  *** add Berth to elements')
             berth = Berth(**hydrogen_defaults.berth_data)
             berth.year_online = year + berth.delivery_time
             self.elements.append(berth)
+            if self.trace is not None:
+                self.trace.record(year, 'berth_occupancy', berth_occupancy_planned, self.allowable_berth_occupancy,
+                                  berth)
 
             berth_occupancy_planned, berth_occupancy_online, unloading_occupancy_planned, unloading_occupancy_online = \
                 self.calculate_berth_occupancy(year, smallhydrogen_calls, largehydrogen_calls, smallammonia_calls, largeammonia_calls,  handysize_calls, panamax_calls, vlcc_calls, smallhydrogen_calls_planned,  largehydrogen_calls_planned, smallammonia_calls_planned, largeammonia_calls_planned,   handysize_calls_planned, panamax_calls_planned, vlcc_calls_planned)
@@ -258,6 +294,8 @@ class System:
                 # - depth
                 jetty = Jetty(**hydrogen_defaults.jetty_data)
                 self.jetty_invest(year, nrofdolphins)
+                if self.trace is not None:
+                    self.trace.record(year, 'berths', berths, jettys, Jetty)
 
                 berth_occupancy_planned, berth_occupancy_online, unloading_occupancy_planned, unloading_occupancy_online = self.calculate_berth_occupancy(
                     year, smallhydrogen_calls, largehydrogen_calls, smallammonia_calls, largeammonia_calls,
@@ -281,8 +319,6 @@ class System:
             - jetty_wall.freeboard must be high enough to accommodate largest expected vessel
         """
 
-        if self.debug:
-            print('  *** add jetty to elements')
         # add a Jetty element
         jetty = Jetty(**hydrogen_defaults.jetty_data)
 
@@ -334,8 +370,6 @@ class System:
         pipelines = len(core.find_elements(self, Pipeline_Jetty))
         jettys = len(core.find_elements(self, Jetty))
         if jettys > pipelines:
-            if self.debug:
-                print('  *** add jetty pipeline to elements')
             pipeline_jetty = Pipeline_Jetty(**hydrogen_defaults.jetty_pipeline_data)
 
             # - capex
@@ -387,6 +421,8 @@ class System:
             pipeline_jetty = core.add_cashflow_data_to_element(self, pipeline_jetty)
 
             self.elements.append(pipeline_jetty)
+            if self.trace is not None:
+                self.trace.record(year, 'jettys', jettys, pipelines, pipeline_jetty)
 
     def storage_invest(self, year, hydrogen_defaults_storage_data):
         """current strategy is to add storage as long as target storage is not yet achieved
@@ -417,7 +453,7 @@ class System:
         Demand = []
         for commodity in core.find_elements(self, Commodity):
             try:
-                Demand = commodity.scenario_data.loc[commodity.scenario_data['year'] == year]['volume'].item()
+                Demand = commodity.scenario_volume(year)
             except:
                 pass
 
@@ -430,8 +466,6 @@ class System:
         #  or
         # check if sufficient storage capacity is available
         while storage_capacity < max_vessel_call_size or (storage_capacity < storage_capacity_dwelltime_demand and storage_capacity < storage_capacity_dwelltime_throughput):
-            if self.debug:
-                print('  *** add storage to elements')
 
             # add storage object
             storage = Storage(**hydrogen_defaults_storage_data)
@@ -464,6 +498,9 @@ class System:
             storage = core.add_cashflow_data_to_element(self, storage)
 
             self.elements.append(storage)
+            if self.trace is not None:
+                self.trace.record(year, 'storage_capacity', storage_capacity, max(max_vessel_call_size, min(
+                    storage_capacity_dwelltime_demand, storage_capacity_dwelltime_throughput)), storage)
 
             storage_capacity += storage.capacity
 
@@ -488,8 +525,6 @@ class System:
         # check if sufficient h2retrieval capacity is available
         while plant_occupancy_planned > self.h2retrieval_trigger:
 
-            if self.debug:
-                print('  *** add h2retrieval to elements')
 
             # add h2retrieval object
             h2retrieval = H2retrieval(**hydrogen_defaults_h2retrieval_data)
@@ -522,6 +557,9 @@ class System:
             h2retrieval = core.add_cashflow_data_to_element(self, h2retrieval)
 
             self.elements.append(h2retrieval)
+            if self.trace is not None:
+                self.trace.record(year, 'plant_occupancy', plant_occupancy_planned, self.h2retrieval_trigger,
+                                  h2retrieval)
 
             plant_occupancy_planned, plant_occupancy_online, h2retrieval_capacity_planned, h2retrieval_capacity_online = self.calculate_h2retrieval_occupancy(year, hydrogen_defaults_h2retrieval_data)
 
@@ -557,8 +595,6 @@ class System:
 
         # check if total planned length is smaller than target length, if so add a pipeline
         while service_rate > service_capacity:
-            if self.debug:
-                print('  *** add Hinter Pipeline to elements')
 
             pipeline_hinter = Pipeline_Hinter(**hydrogen_defaults.hinterland_pipeline_data)
 
@@ -593,6 +629,8 @@ class System:
             pipeline_hinter = core.add_cashflow_data_to_element(self, pipeline_hinter)
 
             self.elements.append(pipeline_hinter)
+            if self.trace is not None:
+                self.trace.record(year, 'hinter_pipeline_capacity', service_capacity, service_rate, pipeline_hinter)
 
             service_capacity += pipeline_hinter.capacity
 
@@ -623,10 +661,10 @@ class System:
                 consumption = throughput_online/pipelinesj * element.consumption_coefficient
 
                 if consumption * energy.price != np.inf:
-                    element.df.loc[element.df['year'] == year, 'energy'] = consumption * energy.price
+                    self.ledger.set(element, year, 'energy', consumption * energy.price)
 
             else:
-                element.df.loc[element.df['year'] == year, 'energy'] = 0
+                self.ledger.set(element, year, 'energy', 0)
 
         # calculate storage energy
         list_of_elements_Storage = core.find_elements(self, Storage)
@@ -643,10 +681,10 @@ class System:
                 capacity = max(max_vessel_call_size, storage_capacity_dwelltime_throughput)
 
                 if consumption * capacity * hours * energy.price != np.inf:
-                    element.df.loc[element.df['year'] == year, 'energy'] = consumption * capacity * energy.price
+                    self.ledger.set(element, year, 'energy', consumption * capacity * energy.price)
 
             else:
-                element.df.loc[element.df['year'] == year, 'energy'] = 0
+                self.ledger.set(element, year, 'energy', 0)
 
         # calculate H2 retrieval energy
         list_of_elements_H2retrieval = core.find_elements(self, H2retrieval)
@@ -662,9 +700,9 @@ class System:
                 capacity = element.capacity * self.operational_hours
 
                 if consumption * throughput_online * energy.price != np.inf:
-                    element.df.loc[element.df['year'] == year, 'energy'] = consumption * plant_occupancy_online * capacity * energy.price
+                    self.ledger.set(element, year, 'energy', consumption * plant_occupancy_online * capacity * energy.price)
             else:
-                element.df.loc[element.df['year'] == year, 'energy'] = 0
+                self.ledger.set(element, year, 'energy', 0)
 
         # calculate hinterland pipeline energy
         list_of_elements_hinter = core.find_elements(self, Pipeline_Hinter)
@@ -679,9 +717,9 @@ class System:
                 consumption = element.consumption_coefficient
 
                 if consumption  * energy.price != np.inf:
-                    element.df.loc[element.df['year'] == year, 'energy'] = consumption * throughput_online/pipelines * energy.price
+                    self.ledger.set(element, year, 'energy', consumption * throughput_online/pipelines * energy.price)
             else:
-                element.df.loc[element.df['year'] == year, 'energy'] = 0
+                self.ledger.set(element, year, 'energy', 0)
 
     def calculate_demurrage_cost(self, year):
         """Find the demurrage cost per type of vessel and sum all demurrage cost"""
@@ -799,7 +837,7 @@ class System:
         commodities = core.find_elements(self, Commodity)
         for commodity in commodities:
             try:
-                volume = commodity.scenario_data.loc[commodity.scenario_data['year'] == year]['volume'].item()
+                volume = commodity.scenario_volume(year)
                 smallhydrogen_vol += volume/volume * throughput_online  * commodity.smallhydrogen_perc / 100
                 largehydrogen_vol += volume/volume * throughput_online * commodity.largehydrogen_perc / 100
                 smallammonia_vol += volume/volume * throughput_online * commodity.smallammonia_perc / 100
@@ -834,7 +872,7 @@ class System:
 
         for commodity in commodities:
             try:
-                volume = commodity.scenario_data.loc[commodity.scenario_data['year'] == year]['volume'].item()
+                volume = commodity.scenario_volume(year)
                 smallhydrogen_vol_planned += volume * commodity.smallhydrogen_perc / 100
                 largehydrogen_vol_planned += volume * commodity.largehydrogen_perc / 100
                 smallammonia_vol_planned += volume * commodity.smallammonia_perc / 100
@@ -1000,7 +1038,7 @@ class System:
         Demand = []
         for commodity in core.find_elements(self, Commodity):
             try:
-                Demand = commodity.scenario_data.loc[commodity.scenario_data['year'] == year]['volume'].item()
+                Demand = commodity.scenario_volume(year)
             except:
                 pass
 
@@ -1046,24 +1084,15 @@ class System:
         """
 
         #Find jetty capacity
-        Jetty_cap_planned = 0
-        Jetty_cap = 0
-        for element in core.find_elements(self, Jetty):
-            Jetty_cap_planned += ((hydrogen_defaults.smallhydrogen_data["pump_capacity"] +
-                                 hydrogen_defaults.largehydrogen_data["pump_capacity"] +
-                                 hydrogen_defaults.smallammonia_data["pump_capacity"] +
-                                 hydrogen_defaults.largeammonia_data["pump_capacity"] +
-                                 hydrogen_defaults.handysize_data["pump_capacity"] +
-                                 hydrogen_defaults.panamax_data["pump_capacity"] +
-                                 hydrogen_defaults.vlcc_data["pump_capacity"])/7 * self.operational_hours)
-            if year >= element.year_online:
-                Jetty_cap += ((hydrogen_defaults.smallhydrogen_data["pump_capacity"] +
-                                 hydrogen_defaults.largehydrogen_data["pump_capacity"] +
-                                 hydrogen_defaults.smallammonia_data["pump_capacity"] +
-                                 hydrogen_defaults.largeammonia_data["pump_capacity"] +
-                                 hydrogen_defaults.handysize_data["pump_capacity"] +
-                                 hydrogen_defaults.panamax_data["pump_capacity"] +
-                                 hydrogen_defaults.vlcc_data["pump_capacity"])/7 * self.operational_hours)
+        jetty_pump_capacity = ((hydrogen_defaults.smallhydrogen_data["pump_capacity"] +
+                                hydrogen_defaults.largehydrogen_data["pump_capacity"] +
+                                hydrogen_defaults.smallammonia_data["pump_capacity"] +
+                                hydrogen_defaults.largeammonia_data["pump_capacity"] +
+                                hydrogen_defaults.handysize_data["pump_capacity"] +
+                                hydrogen_defaults.panamax_data["pump_capacity"] +
+                                hydrogen_defaults.vlcc_data["pump_capacity"])/7 * self.operational_hours)
+        Jetty_cap_planned = core.planned_elements(self, Jetty) * jetty_pump_capacity
+        Jetty_cap = core.online_elements(self, Jetty, year) * jetty_pump_capacity
 
         # Find pipeline jetty capacity
         pipelineJ_capacity_planned = 0
@@ -1076,14 +1105,8 @@ class System:
                     pipelineJ_capacity_online += element.capacity * self.operational_hours
 
         # Find storage capacity
-        storage_capacity_planned = 0
-        storage_capacity_online = 0
-        list_of_elements = core.find_elements(self, Storage)
-        if list_of_elements != []:
-            for element in list_of_elements:
-                storage_capacity_planned += element.capacity
-                if year >= element.year_online:
-                    storage_capacity_online += element.capacity
+        storage_capacity_planned = core.planned_elements(self, Storage, 'capacity')
+        storage_capacity_online = core.online_elements(self, Storage, year, 'capacity')
 
         storage_cap_planned = storage_capacity_planned / self.allowable_dwelltime / 1.1
         storage_cap_online = storage_capacity_online / self.allowable_dwelltime/ 1.1
@@ -1112,7 +1135,7 @@ class System:
         Demand = []
         for commodity in core.find_elements(self, Commodity):
             try:
-                Demand = commodity.scenario_data.loc[commodity.scenario_data['year'] == year]['volume'].item()
+                Demand = commodity.scenario_volume(year)
             except:
                 pass
 
@@ -0,0 +1,218 @@
+"""Cash flow ledger shared by the terminal System classes.
+
+All element cash flows of a System are stored in one contiguous array of shape
+(elements x years x categories). Elements registered in the ledger expose a read-only
+``element.df`` view (see the hascashflow_properties_mixin of the various mixin modules).
+"""
+
+# package(s) for data handling
+import numpy as np
+import pandas as pd
+
+
+class CashflowLedger:
+    """Array backed store of the cash flows of terminal elements
+
+    startyear: first year of the terminal lifecycle
+    lifecycle: number of years in the terminal lifecycle
+    capacity: number of element rows to allocate up front (the array grows when needed)"""
+
+    categories = ('capex', 'maintenance', 'insurance', 'energy', 'labour', 'fuel')
+
+    def __init__(self, startyear, lifecycle, capacity=64):
+        self.startyear = startyear
+        self.lifecycle = lifecycle
+        self.years = np.arange(startyear, startyear + lifecycle)
+        self.column = {category: i for i, category in enumerate(self.categories)}
+
+        self.data = np.zeros((capacity, lifecycle, len(self.categories)))
+        self.size = 0
+
+        # running totals of the elements of the tracked list of elements (each row counts as often as it is listed)
+        self._elements = None
+        self._revision = None
+        self._folded = 0
+        self._foreign = []
+        self._count = np.zeros(capacity, dtype=int)
+        self._totals = np.zeros(self.data.shape[1:])
+
+    def _allocate(self):
+        """return the index of a new (empty) element row, growing the array when it is full"""
+
+        if self.size == self.data.shape[0]:
+            data = np.zeros((max(2 * self.size, 1),) + self.data.shape[1:])
+            data[:self.size] = self.data[:self.size]
+            self.data = data
+
+            count = np.zeros(data.shape[0], dtype=int)
+            count[:self.size] = self._count[:self.size]
+            self._count = count
+
+        row = self.size
+        self.size += 1
+
+        return row
+
+    def __getstate__(self):
+        # copies (e.g. System.fork) and pickles rebuild the running totals for their own list of elements
+        state = self.__dict__.copy()
+        state.update(_elements=None, _revision=None, _folded=0, _foreign=[],
+                     _count=np.zeros_like(self._count), _totals=np.zeros_like(self._totals))
+
+        return state
+
+    def add(self, element):
+        """Place the capex and opex of an element in the ledger
+        Elements that take two years to build are assign 60% to year one and 40% to year two."""
+
+        if getattr(element, '_ledger', None) is self:
+            row = element._ledger_row
+        else:
+            row = self._allocate()
+            element._ledger = self
+            element._ledger_row = row
+
+        cashflows = np.zeros(self.data.shape[1:])
+
+        # capex
+        capex = element.capex
+
+        # opex
+        maintenance = element.maintenance
+        insurance = element.insurance
+        labour = element.labour
+
+        # year online
+        year_online = element.year_online
+        year_delivery = element.delivery_time
+
+        # capex
+        if year_delivery > 1:
+            self._put(cashflows, year_online - 2, 'capex', 0.6 * capex)
+            self._put(cashflows, year_online - 1, 'capex', 0.4 * capex)
+        else:
+            self._put(cashflows, year_online - 1, 'capex', capex)
+
+        # opex
+        online = slice(max(year_online - self.startyear, 0), None)
+        if maintenance:
+            cashflows[online, self.column['maintenance']] = maintenance
+        if insurance:
+            cashflows[online, self.column['insurance']] = insurance
+        if labour:
+            cashflows[online, self.column['labour']] = labour
+
+        # update the running totals if the element is already counted in them
+        if self._count[row]:
+            self._totals += self._count[row] * (cashflows - self.data[row])
+        self.data[row] = cashflows
+
+        return element
+
+    def _put(self, cashflows, year, category, value):
+        """Set a value in a (years x categories) array (years outside the lifecycle are ignored)"""
+
+        index = year - self.startyear
+        if 0 <= index < self.lifecycle:
+            cashflows[index, self.column[category]] = value
+
+    def set(self, element, year, category, value):
+        """Set the cash flow of an element in a given year (years outside the lifecycle are ignored)"""
+
+        index = year - self.startyear
+        if 0 <= index < self.lifecycle:
+            row = element._ledger_row
+            column = self.column[category]
+            previous = self.data[row, index, column]
+            self.data[row, index, column] = value
+
+            # update the running totals if the element is already counted in them
+            count = self._count[row]
+            if count:
+                if np.isfinite(previous) and np.isfinite(value):
+                    self._totals[index, column] += count * (value - previous)
+                else:
+                    counted = self._count[:self.size] > 0
+                    self._totals[index, column] = \
+                        self._count[:self.size][counted] @ self.data[:self.size][counted, index, column]
+
+    def set_block(self, elements, years, category, values, where=None):
+        """Set the cash flows of several elements in several years at once (years outside the lifecycle are ignored)
+
+        values: array of shape (elements x years)
+        where: optional boolean array of the same shape, only the values where it is True are set
+
+        An element that is listed more than once is set once (with the values of its first listing)."""
+
+        index = np.asarray(years) - self.startyear
+        inside = (index >= 0) & (index < self.lifecycle)
+
+        rows = np.array([element._ledger_row for element in elements], dtype=int)
+        values = np.broadcast_to(values, (len(rows), len(index)))
+        where = np.ones(values.shape, dtype=bool) if where is None else np.broadcast_to(where, values.shape)
+
+        rows, first = np.unique(rows, return_index=True)
+        index = index[inside]
+        values = values[first][:, inside]
+        where = where[first][:, inside]
+
+        column = self.column[category]
+        previous = self.data[rows[:, np.newaxis], index, column]
+        cashflows = np.where(where, values, previous)
+        self.data[rows[:, np.newaxis], index, column] = cashflows
+
+        # update the running totals if some of the elements are already counted in them
+        count = self._count[rows]
+        if count.any():
+            if np.isfinite(previous).all() and np.isfinite(cashflows).all():
+                self._totals[index, column] += count @ (cashflows - previous)
+            else:
+                counted = self._count[:self.size] > 0
+                self._totals[index, column] = \
+                    self._count[:self.size][counted] @ self.data[:self.size][counted][:, index, column]
+
+    def frame(self, element):
+        """Return a copy of the cash flows of an element as a dataframe with a 'year' column"""
+
+        df = pd.DataFrame(self.data[element._ledger_row].copy(), columns=list(self.categories))
+        df.insert(0, 'year', self.years)
+
+        return df
+
+    def totals(self, elements):
+        """Sum the cash flows of the given elements (an element that is listed twice counts twice)
+
+        The ledger keeps running totals for the list of elements of the System. Elements appended to
+        that list are added to the totals when they are read and cash flows written with set() update
+        the totals directly, so reading the totals takes O(years) regardless of the number of elements.
+        Passing another list, a list that got shorter or an element store that was changed other than by
+        appending elements (see element_store.ElementStore.revision) rebuilds the totals.
+
+        returns an array of shape (years x categories)"""
+
+        revision = getattr(elements, 'revision', None)
+        if elements is not self._elements or revision != self._revision or len(elements) < self._folded:
+            self._elements = elements
+            self._revision = revision
+            self._folded = 0
+            self._foreign = []
+            self._count[:] = 0
+            self._totals = np.zeros(self.data.shape[1:])
+
+        # add the elements appended since the last call
+        for element in elements[self._folded:]:
+            ledger = getattr(element, '_ledger', None)
+            if ledger is self:
+                row = element._ledger_row
+                self._count[row] += 1
+                self._totals += self.data[row]
+            elif ledger is not None and ledger.lifecycle == self.lifecycle:
+                # element registered with another System (e.g. a shared list of elements)
+                self._foreign.append(element)
+        self._folded = len(elements)
+
+        totals = self._totals.copy()
+        for element in self._foreign:
+            totals += element._ledger.data[element._ledger_row]
+
+        return totals
@@ -0,0 +1,204 @@
+"""Monte Carlo simulation of terminals over random demand scenarios.
+
+run() simulates a terminal for each of n random demand scenarios and yields a summary per run (NPV, capex, opex
+and the number of elements online per year). The runs are spread over a pool of processes. Each run draws its
+demand from its own numpy.random.Generator, spawned from a single seed, so the results do not depend on the
+number of processes. Example:
+
+    def factory():
+        return container_system.System(startyear=2020, lifecycle=10, elements=[container] + vessels)
+
+    def scenario(terminal, generator):
+        for commodity in terminal.find_elements(container_objects.Commodity):
+            commodity.scenario_random(startyear=2020, lifecycle=10, seed=generator)
+
+    summaries = list(montecarlo.run(factory, scenario, n=1000, seed=42))
+    montecarlo.percentiles(summaries)
+
+compare() runs several terminal configurations over the same scenarios (common random numbers, optionally with
+antithetic scenarios) and reports the NPV differences with confidence intervals.
+
+The process pool is provided by map_tasks, which is also used by container_system.sweep. On Linux the worker
+processes are forked, so factory and scenario may be closures or lambdas. Elsewhere they have to be picklable
+(module level functions).
+"""
+
+# package(s) for data handling
+import multiprocessing
+import os
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# opentisim package
+from opentisim import scenarios
+
+# function and shared inputs of the tasks in a worker process (see map_tasks)
+_worker = {}
+
+
+def map_tasks(function, tasks, state, processes=None, chunksize=None):
+    """Apply function(state, task) to each task on a pool of processes and yield the results in order of the tasks
+
+    function: module level function that performs a task
+    tasks: list of (picklable) tasks
+    state: inputs shared by all tasks, handed to each worker process once instead of with every task
+    processes: number of worker processes (default: number of cpus, 1 runs in the current process)
+    chunksize: number of tasks handed to a worker at once (default: about 4 chunks per worker)"""
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    if processes == 1:
+        for task in tasks:
+            yield function(state, task)
+        return
+
+    if chunksize is None:
+        chunksize = max(1, len(tasks) // (4 * processes))
+
+    # forked workers inherit the state, so it does not have to be picklable
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+    else:
+        context = multiprocessing.get_context()
+
+    with context.Pool(processes, initializer=_initialize, initargs=(function, state)) as pool:
+        for result in pool.imap(_perform, tasks, chunksize):
+            yield result
+
+
+def _initialize(function, state):
+    """store the function and shared inputs of the tasks in the worker process"""
+
+    _worker.update(function=function, state=state)
+
+
+def _perform(task):
+    """perform a single task in a worker process"""
+
+    return _worker['function'](_worker['state'], task)
+
+
+def summarize(terminal, result):
+    """Summary of a simulated terminal
+
+    terminal: the simulated System
+    result: the value returned by terminal.simulate()
+
+    returns a dict with the NPV (as calculated by the System), the total capex and opex (not discounted, opex
+    includes demurrage) and per element type the number of elements online in each year"""
+
+    # the container System returns (NPV, data), the agribulk and hydrogen Systems the PV per year
+    if isinstance(result, tuple):
+        NPV = float(result[0])
+    else:
+        NPV = float(result['PV'].sum())
+
+    ledger = terminal.ledger
+    totals = np.nan_to_num(ledger.totals(terminal.elements))
+    opex = [ledger.column[category] for category in ledger.categories if category != 'capex']
+    demurrage = np.nan_to_num(np.asarray(getattr(terminal, 'demurrage', 0), dtype=float))
+
+    # number of elements online per year (elements without a year online, e.g. vessels, are left out)
+    years = ledger.years
+    year_online = {}
+    for element in terminal.elements:
+        year = getattr(element, 'year_online', None)
+        if isinstance(year, (int, np.integer)):
+            year_online.setdefault(type(element).__name__, []).append(year)
+    elements = {name: np.searchsorted(np.sort(online), years, side='right') for name, online in year_online.items()}
+
+    return {'NPV': NPV,
+            'capex': float(totals[:, ledger.column['capex']].sum()),
+            'opex': float(totals[:, opex].sum() + demurrage.sum()),
+            'elements': elements}
+
+
+def run(factory, scenario, n, seed=None, antithetic=False, processes=None, chunksize=None, summary=summarize):
+    """Simulate n terminals with random demand scenarios and yield the summary of each run, in order of the runs
+
+    factory: callable that returns a new (not yet simulated) System
+    scenario: callable(terminal, generator) that sets the demand scenario(s) of the terminal, drawing random numbers
+              from the numpy.random.Generator of the run
+    n: number of runs
+    seed: seed of the runs, run i draws from the i-th generator spawned from numpy.random.SeedSequence(seed)
+    antithetic: follow each run by its antithetic run, which draws from scenarios.Antithetic(generator)
+    processes: number of worker processes (default: number of cpus, 1 runs in the current process)
+    chunksize: number of runs handed to a worker at once (default: about 4 chunks per worker)
+    summary: callable(terminal, result) that summarizes a run (see summarize)
+
+    Each summary is a dict with the run number, whether it is an antithetic run and the items of the summary."""
+
+    seed_sequence = np.random.SeedSequence(seed)
+    tasks = [(run, child, mirror) for run, child in enumerate(seed_sequence.spawn(n))
+             for mirror in ((False, True) if antithetic else (False,))]
+
+    state = {'factory': factory, 'scenario': scenario, 'summary': summary}
+    for result in map_tasks(_simulate, tasks, state, processes, chunksize):
+        yield result
+
+
+def _simulate(state, task):
+    """simulate a single run"""
+
+    run, seed_sequence, antithetic = task
+
+    generator = np.random.default_rng(seed_sequence)
+    if antithetic:
+        generator = scenarios.Antithetic(generator)
+
+    terminal = state['factory']()
+    state['scenario'](terminal, generator)
+    result = terminal.simulate()
+
+    return dict({'run': run, 'antithetic': antithetic}, **state['summary'](terminal, result))
+
+
+def percentiles(summaries, q=(5, 25, 50, 75, 95), columns=('NPV', 'capex', 'opex')):
+    """Percentiles of the NPV, capex and opex over a list of run summaries
+
+    returns a dataframe with a row per percentile and a column per item of the summaries"""
+
+    data = {column: [summary[column] for summary in summaries] for column in columns}
+
+    return pd.DataFrame({column: np.percentile(values, q) for column, values in data.items()},
+                        index=pd.Index(q, name='percentile'))
+
+
+def compare(factories, scenario, n, seed=None, antithetic=False, confidence=0.95, **kwargs):
+    """Paired comparison of the NPV of terminal configurations over common random demand scenarios
+
+    Every configuration is simulated with the same n demand scenarios (run i of each configuration draws from the
+    same generator, see run), so the differences in NPV are due to the configurations rather than to the demand.
+    With antithetic=True each scenario is also simulated mirrored and the two NPVs are averaged.
+
+    factories: dict with a factory per configuration, e.g. {'rtg': ..., 'rmg': ...}, the first is the reference
+    scenario, n, seed: see run (n should be at least 2)
+    confidence: confidence level of the interval of the NPV differences
+    kwargs: passed on to run (processes, chunksize)
+
+    returns a dataframe with per configuration the mean NPV and the mean difference with the NPV of the reference
+    configuration, its standard error and confidence interval (Student t)"""
+
+    NPV = {}
+    for configuration, factory in factories.items():
+        summaries = run(factory, scenario, n, seed, antithetic, **kwargs)
+        NPV[configuration] = np.array([summary['NPV'] for summary in summaries]).reshape(n, -1).mean(axis=1)
+
+    reference = NPV[next(iter(factories))]
+    t = stats.t.ppf((1 + confidence) / 2, n - 1)
+
+    rows = []
+    for configuration, values in NPV.items():
+        difference = values - reference
+        standard_error = difference.std(ddof=1) / np.sqrt(n)
+        rows.append({'configuration': configuration,
+                     'NPV': values.mean(),
+                     'difference': difference.mean(),
+                     'standard_error': standard_error,
+                     'lower': difference.mean() - t * standard_error,
+                     'upper': difference.mean() + t * standard_error})
+
+    return pd.DataFrame(rows).set_index('configuration')
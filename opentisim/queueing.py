@@ -0,0 +1,81 @@
+"""Analytic multi-server queueing functions.
+
+The waiting factor is the mean waiting time in the queue divided by the mean service time, as in
+the Groenveld (2007) tables of core.occupancy_to_waitingfactor. Unlike those tables these functions
+are not limited to a fixed number of servers (berths).
+
+- M/M/n: exact, from the Erlang-C formula
+- E2/E2/n, M/E2/n: Allen-Cunneen approximation, (ca^2 + cs^2) / 2 times the M/M/n waiting factor, with
+  the Kraemer and Langenbach-Belz correction for arrival processes that are more regular than Poisson
+  (ca^2 < 1). Compared to Groenveld (2007) Table IV (M/E2/n) the approximation is within 12% (median 3%)
+  for occupancies of 0.3 and more. Compared to Table V (E2/E2/n) it is within 30% for occupancies of 0.6
+  and more and it errs on the conservative (high) side.
+"""
+
+# package(s) for data handling
+import functools
+
+import numpy as np
+
+# squared coefficients of variation of the inter arrival times and the service times per kendall notation
+variation = {'M/M/n': (1.0, 1.0),
+             'M/E2/n': (1.0, 0.5),
+             'E2/E2/n': (0.5, 0.5)}
+
+
+def erlang_c(occupancy, nr_of_servers):
+    """Probability that an arriving customer has to wait in an M/M/n queue (Erlang-C formula)
+
+    occupancy: utilisation per server (rho), nr_of_servers: number of servers (n).
+    Both may be arrays, the Erlang-B recursion is evaluated for all of them at once."""
+
+    occupancy, nr_of_servers = np.broadcast_arrays(np.asarray(occupancy, dtype=float),
+                                                   np.asarray(nr_of_servers, dtype=int))
+    load = occupancy * nr_of_servers
+
+    # Erlang-B recursion: B(0) = 1, B(k) = a B(k-1) / (k + a B(k-1))
+    erlang_b = np.ones(load.shape)
+    for k in range(1, int(nr_of_servers.max(initial=0)) + 1):
+        erlang_b = np.where(k <= nr_of_servers, load * erlang_b / (k + load * erlang_b), erlang_b)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return erlang_b / (1 - occupancy * (1 - erlang_b))
+
+
+def waiting_factor(occupancy, nr_of_servers, kendall='E2/E2/n'):
+    """Waiting time factor (waiting time / service time) for M/M/n, M/E2/n or E2/E2/n queues
+
+    occupancy and nr_of_servers may be arrays (broadcast against each other). Occupancies of 1 or more,
+    and zero servers, give an infinite waiting factor."""
+
+    if np.ndim(occupancy) == 0 and np.ndim(nr_of_servers) == 0:
+        return _waiting_factor(float(occupancy), int(nr_of_servers), kendall)
+
+    ca2, cs2 = variation[kendall]
+
+    occupancy, nr_of_servers = np.broadcast_arrays(np.asarray(occupancy, dtype=float),
+                                                   np.asarray(nr_of_servers, dtype=int))
+    stable = (occupancy < 1) & (nr_of_servers > 0)
+    occupancy_stable = np.where(stable, occupancy, 0.5)
+    servers_stable = np.where(stable, nr_of_servers, 1)
+
+    # M/M/n waiting factor
+    factor = erlang_c(occupancy_stable, servers_stable) / (servers_stable * (1 - occupancy_stable))
+
+    # Allen-Cunneen approximation
+    factor = factor * (ca2 + cs2) / 2
+
+    # Kraemer and Langenbach-Belz correction for regular arrivals
+    if ca2 < 1:
+        with np.errstate(divide='ignore'):
+            factor = factor * np.exp(-2 * (1 - occupancy_stable) * (1 - ca2) ** 2 /
+                                     (3 * occupancy_stable * (ca2 + cs2)))
+
+    return np.where(stable, np.maximum(factor, 0), np.inf)
+
+
+@functools.lru_cache(maxsize=4096)
+def _waiting_factor(occupancy, nr_of_servers, kendall):
+    """memoized scalar version of waiting_factor"""
+
+    return float(waiting_factor(np.array([occupancy]), np.array([nr_of_servers]), kendall)[0])
@@ -0,0 +1,118 @@
+"""Batch generation of demand scenarios.
+
+The functions in this module generate many demand paths at once, as an array of shape (paths x lifecycle), instead
+of one path per call of hasscenario_properties_mixin.scenario_random. Random numbers are drawn from a
+numpy.random.Generator. Independent and reproducible streams (e.g. one per worker of a Monte Carlo study) follow
+from a single seed with generators(seed, n). Large sets of paths can be kept in a memory-mapped ScenarioBank.
+"""
+
+# package(s) for data handling
+import os
+
+import numpy as np
+
+
+def generators(seed, n):
+    """Return n independent random generators derived from one seed
+
+    The generators are spawned from a numpy.random.SeedSequence, so the streams do not overlap and the same seed
+    gives the same n streams on every run."""
+
+    return [np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(n)]
+
+
+def random_growth(volume, lifecycle=20, n=1, rate=1.02, mu=0.01, sigma=0.065, seed=None):
+    """Demand paths generated from random growth rate increments (see scenario_random)
+
+    volume: demand in the year before the first year of the paths
+    lifecycle: number of years per path
+    n: number of paths
+    rate, mu, sigma: the growth rate of each year is rate + N(mu, sigma)
+    seed: seed, numpy.random.Generator or Antithetic generator to draw from (None draws from the global numpy.random
+          state)
+
+    returns an integer array of shape (n x lifecycle)"""
+
+    if seed is None:
+        random = np.random
+    elif hasattr(seed, 'normal'):
+        random = seed
+    else:
+        random = np.random.default_rng(seed)
+    rates = rate + random.normal(mu, sigma, (n, lifecycle))
+
+    # multiply year by year, as scenario_random did, so a single path gives the same volumes
+    volumes = np.multiply.accumulate(np.concatenate((np.full((n, 1), float(volume)), rates), axis=1), axis=1)
+
+    return volumes[:, 1:].astype(np.int64)
+
+
+class Antithetic:
+    """Antithetic counterpart of a numpy.random.Generator
+
+    The normal and uniform draws are mirrored around their mean (e.g. x -> 2 mu - x), so a scenario drawn from
+    Antithetic(generator) is the mirror image of the scenario drawn from an identical generator. Averaging the
+    results of both scenarios reduces the variance of Monte Carlo estimates (see montecarlo.compare). Other methods
+    are passed on to the generator unchanged.
+
+    generator: the numpy.random.Generator to mirror"""
+
+    def __init__(self, generator):
+        self.generator = generator
+
+    def normal(self, loc=0.0, scale=1.0, size=None):
+        return 2 * np.asarray(loc) - self.generator.normal(loc, scale, size)
+
+    def standard_normal(self, size=None, *args, **kwargs):
+        return -self.generator.standard_normal(size, *args, **kwargs)
+
+    def uniform(self, low=0.0, high=1.0, size=None):
+        return np.asarray(low) + high - self.generator.uniform(low, high, size)
+
+    def random(self, size=None, *args, **kwargs):
+        return 1 - self.generator.random(size, *args, **kwargs)
+
+    def __getattr__(self, name):
+        if name == 'generator':
+            raise AttributeError(name)
+        return getattr(self.generator, name)
+
+
+class ScenarioBank:
+    """Demand paths stored in files and memory-mapped, so that many paths can be shared by processes without loading
+    or pickling them
+
+    The bank is a directory with the arrays years.npy (consecutive years) and volumes.npy (paths x years), see save.
+    bank[path] returns the volumes of a path as a read-only view of the file. A commodity can use a path as its
+    scenario with commodity.bind_scenario(bank, path). Pickling a bank only pickles the directory name, so a bank
+    sent to a worker process is opened there again instead of being copied.
+
+    path: directory of the bank"""
+
+    def __init__(self, path):
+        self.path = path
+        self.years = np.load(os.path.join(path, 'years.npy'))
+        self.volumes = np.load(os.path.join(path, 'volumes.npy'), mmap_mode='r')
+
+    @staticmethod
+    def save(path, volumes, startyear):
+        """Save demand paths (paths x years, e.g. from random_growth) as a scenario bank and return the bank"""
+
+        volumes = np.asarray(volumes)
+        if volumes.ndim != 2:
+            raise ValueError('the volumes of a scenario bank should be an array of paths x years')
+
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, 'years.npy'), np.arange(startyear, startyear + volumes.shape[1]))
+        np.save(os.path.join(path, 'volumes.npy'), volumes)
+
+        return ScenarioBank(path)
+
+    def __len__(self):
+        return self.volumes.shape[0]
+
+    def __getitem__(self, path):
+        return self.volumes[path]
+
+    def __reduce__(self):
+        return type(self), (self.path,)
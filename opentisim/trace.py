@@ -0,0 +1,119 @@
+"""Structured trace of the investment decisions of the terminal System classes.
+
+A System that is given a DecisionTrace (System(..., trace=DecisionTrace())) records an event for every element that
+its investment methods add: the run, the year, the trigger (e.g. 'berth_occupancy'), the value of the trigger metric,
+the threshold it was compared with, the element type and the number of elements added. The events are kept in columns
+(one list per field) and can be read as a dataframe, be written as they come to a JSON lines file, and be printed as
+they come (echo). A System with debug=True and without a trace prints its investments through a DecisionTrace with
+echo=True. Without a trace the investment methods only check that System.trace is None. Example:
+
+    with DecisionTrace('trace.jsonl', run='base') as trace:
+        terminal = container_system.System(startyear=2020, lifecycle=10, elements=elements, trace=trace)
+        terminal.simulate()
+    trace.frame()
+
+Copies of a trace (e.g. by System.fork) keep the recorded events and the run, but record in memory only: the JSON
+lines file belongs to the original. Set the run of a branch to tell its events apart, e.g. branch.trace.run = 'high'.
+"""
+
+# package(s) for data handling
+import json
+
+import numpy as np
+import pandas as pd
+
+
+class DecisionTrace:
+    """Columnar buffer of investment decisions
+
+    path: optional JSON lines file to which each event is appended as it is recorded
+    run: identifier of the run or branch that is stored with each event (e.g. a scenario name)
+    echo: print each event as it is recorded (see System debug)"""
+
+    fields = ('run', 'year', 'trigger', 'value', 'threshold', 'element', 'count')
+
+    def __init__(self, path=None, run=None, echo=False):
+        self.columns = {field: [] for field in self.fields}
+        self.path = path
+        self.run = run
+        self.echo = echo
+        self._file = None
+
+    def record(self, year, trigger, value, threshold, element, count=1):
+        """Record that count elements of the given type (a class, an element or a name) were added in year because
+        the trigger metric had the given value compared to the threshold"""
+
+        if isinstance(element, type):
+            element = element.__name__
+        elif not isinstance(element, str):
+            element = type(element).__name__
+
+        event = {'run': self.run,
+                 'year': int(year),
+                 'trigger': trigger,
+                 'value': None if value is None else float(value),
+                 'threshold': None if threshold is None else float(threshold),
+                 'element': element,
+                 'count': int(count)}
+
+        for field, column in self.columns.items():
+            column.append(event[field])
+
+        if self.echo:
+            print('  *** add {} {} to elements ({}: {}, threshold {})'.format(
+                event['count'], element, trigger, _format(event['value']), _format(event['threshold'])))
+
+        if self.path is not None:
+            if self._file is None:
+                self._file = open(self.path, 'a')
+            # infinite values (e.g. the waiting time factor without berths) are written as null
+            self._file.write(json.dumps({field: None if isinstance(item, float) and not np.isfinite(item) else item
+                                         for field, item in event.items()}) + '\n')
+
+    def __len__(self):
+        return len(self.columns['year'])
+
+    def frame(self):
+        """Return the events as a dataframe with a column per field"""
+
+        return pd.DataFrame(self.columns, columns=list(self.fields))
+
+    def to_jsonl(self, path):
+        """Write the events to a JSON lines file"""
+
+        self.frame().to_json(path, orient='records', lines=True)
+
+    def to_parquet(self, path):
+        """Write the events to a Parquet file (requires pyarrow or fastparquet)"""
+
+        self.frame().to_parquet(path, index=False)
+
+    def close(self):
+        """Close the JSON lines file (it is opened again when another event is recorded)"""
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getstate__(self):
+        # copies (e.g. System.fork) and pickles record in memory only, so that they do not interleave their events
+        # with those of the original in its JSON lines file
+        if self._file is not None:
+            self._file.flush()
+        state = self.__dict__.copy()
+        state['path'] = None
+        state['_file'] = None
+
+        return state
+
+
+def _format(number):
+    """Format a trigger value or threshold of an echoed event"""
+
+    return '-' if number is None else '{:.3g}'.format(number)
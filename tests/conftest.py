@@ -1,11 +1,45 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 """
-    Dummy conftest.py for opentisim.
+    conftest.py for opentisim, with the fixtures shared by the tests.
 
-    If you don't know what this is for, just leave it empty.
     Read more about conftest.py under:
     https://pytest.org/latest/plugins.html
 """
 
-# import pytest
+import pytest
+
+
+@pytest.fixture
+def container_terminal():
+    """Factory of container terminals with a container commodity and a handysize, handymax and panamax vessel
+
+    The factory takes the startyear and lifecycle, the demand (None for a demand that steps up from 300,000 to 750,000
+    TEU halfway the lifecycle, or a constant volume) and other inputs of container_system.System (e.g. stack_equipment
+    or trace). The demand of the first year is also the historic volume of the year before."""
+
+    import pandas as pd
+    from opentisim import container_objects
+    from opentisim import container_defaults
+    from opentisim import container_system
+
+    def factory(startyear=2020, lifecycle=10, demand=None, **kwargs):
+        years = list(range(startyear, startyear + lifecycle))
+        if demand is None:
+            volumes = [300_000 if year <= startyear + lifecycle // 2 else 750_000 for year in years]
+        else:
+            volumes = [demand] * lifecycle
+
+        container_data = dict(container_defaults.container_data,
+                              historic_data=pd.DataFrame(data={'year': [startyear - 1], 'volume': volumes[:1]}))
+        container = container_objects.Commodity(**container_data)
+        container.scenario_data = pd.DataFrame(data={'year': years, 'volume': volumes})
+
+        vessels = [container_objects.Vessel(**container_defaults.handysize_data),
+                   container_objects.Vessel(**container_defaults.handymax_data),
+                   container_objects.Vessel(**container_defaults.panamax_data)]
+
+        return container_system.System(startyear=startyear, lifecycle=lifecycle, elements=[container] + vessels,
+                                       **kwargs)
+
+    return factory
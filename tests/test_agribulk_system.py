@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the agribulk terminal System of `opentisim`."""
+
+
+def test_occupancy():
+    """Test that the vessel calls and occupancies are recalculated only when a crane, berth or station is added"""
+
+    import pandas as pd
+    from opentisim import agribulk_objects
+    from opentisim import agribulk_defaults
+    from opentisim import agribulk_system
+
+    maize_data = dict(agribulk_defaults.maize_data, historic_data=[])
+    maize = agribulk_objects.Commodity(**maize_data)
+    maize.scenario_data = pd.DataFrame(data={'year': [2020, 2021], 'volume': [750_000, 800_000]})
+    vessels = [agribulk_objects.Vessel(**agribulk_defaults.handysize_data),
+               agribulk_objects.Vessel(**agribulk_defaults.handymax_data),
+               agribulk_objects.Vessel(**agribulk_defaults.panamax_data)]
+
+    terminal = agribulk_system.System(startyear=2020, lifecycle=2, elements=[maize] + vessels)
+    calls = terminal.vessel_calls(2020)
+    assert calls == terminal.calculate_vessel_calls(2020)
+
+    occupancy = terminal.berth_occupancy(2020, *calls[:3])
+    assert occupancy[0] == float('inf')
+    assert terminal.berth_occupancy(2020, *calls[:3]) is occupancy
+
+    # storage does not change the occupancies, a crane does
+    terminal.elements.append(agribulk_objects.Storage(**agribulk_defaults.silo_data))
+    assert terminal.berth_occupancy(2020, *calls[:3]) is occupancy
+
+    crane = agribulk_objects.Cyclic_Unloader(**agribulk_defaults.mobile_crane_data)
+    crane.year_online = 2020
+    terminal.elements.append(crane)
+    assert terminal.berth_occupancy(2020, *calls[:3]) == terminal.calculate_berth_occupancy(2020, *calls[:3])
+    assert terminal.berth_occupancy(2020, *calls[:3])[0] < float('inf')
+
+    maize.scenario_data = pd.DataFrame(data={'year': [2020], 'volume': [1_500_000]})
+    assert terminal.vessel_calls(2020)[4] == 1_500_000
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the container terminal System of `opentisim`."""
+
+
+def test_fork(container_terminal):
+    """Test that a forked terminal resumed halfway the lifecycle gives the same result as a full simulation"""
+
+    import pytest
+
+    NPV, data = container_terminal().simulate()
+
+    terminal = container_terminal()
+    assert terminal.simulate(year_to=2024) is None
+    elements = len(terminal.elements)
+
+    branch = terminal.fork()
+    NPV_branch, data_branch = branch.simulate(year_from=2024)
+
+    assert NPV_branch == pytest.approx(NPV)
+    assert len(terminal.elements) == elements
+    assert not set(map(id, branch.elements)) & set(map(id, terminal.elements))
+
+
+def test_default_elements():
+    """Test that terminals do not share their (default) list of elements"""
+
+    from opentisim import container_defaults
+    from opentisim import container_system
+
+    terminal = container_system.System()
+    terminal.elements.append(container_system.Gate(**container_defaults.gate_data))
+    assert container_system.System().elements == []
+
+
+def test_sweep(container_terminal):
+    """Test that a sweep gives the same results as simulating the terminals one by one"""
+
+    import pytest
+    from opentisim import container_system
+
+    elements = list(container_terminal().elements)
+    table = container_system.sweep(elements, stack_equipment=('rs', 'rtg'), laden_stack=('rtg',),
+                                   energy_price=(0.17, 0.2), processes=1, startyear=2020, lifecycle=10)
+
+    assert len(table) == 4
+    row = table[(table.stack_equipment == 'rs') & (table.energy_price == 0.2)].iloc[0]
+
+    terminal = container_terminal()
+    terminal.stack_equipment, terminal.laden_stack, terminal.energy_price = 'rs', 'rtg', 0.2
+    NPV, data = terminal.simulate()
+    assert row['NPV'] == pytest.approx(NPV)
+    assert row['capex'] == pytest.approx(data['capex'])
+
+
+def test_demand_throughput(container_terminal):
+    """Test that the throughputs per year are recalculated when the demand or the container split changes"""
+
+    import pandas as pd
+    from opentisim import container_objects
+
+    terminal = container_terminal()
+    commodity = terminal.find_elements(container_objects.Commodity)[0]
+
+    laden_teu = terminal.throughput_characteristics(2020)[0]
+    moves = terminal.box_moves(2020)
+    assert terminal.throughput_characteristics(2020)[0] == laden_teu and terminal.box_moves(2020) is moves
+
+    commodity.scenario_data = pd.DataFrame(data={'year': [2020], 'volume': [600_000]})
+    assert terminal.throughput_characteristics(2020)[0] == 2 * laden_teu
+
+    terminal.laden_perc = terminal.laden_perc / 2
+    assert terminal.throughput_characteristics(2020)[0] == laden_teu
+    assert terminal.box_moves(2020) is not moves
+
+
+def test_land_use(container_terminal):
+    """Test that the land use per category adds up to the land use of the elements online"""
+
+    import pytest
+    from opentisim import container_system
+
+    terminal = container_terminal()
+    terminal.simulate()
+
+    table = terminal.land_use()
+    assert table.shape == (10, len(terminal.land_use_categories))
+    assert table[:, 1].sum() > 0 and (table[1:] >= table[:-1]).all()
+
+    for i, year in enumerate(terminal.ledger.years):
+        assert terminal.calculate_land_use(year) == pytest.approx(sum(
+            element.land_use for element in terminal.elements
+            if isinstance(element, tuple(terminal.land_use_categories.values())) and year >= element.year_online))
+
+    frame = terminal.land_use_frame()
+    assert frame.loc[2025, 'gate'] == pytest.approx(table[5, 4] * 0.0001)
+    assert container_system.System().land_use().shape == (20, 6)
+
+
+def test_stack_equipment(container_terminal):
+    """Test that every unit of stack equipment is a separate element"""
+
+    from opentisim import container_objects
+
+    terminal = container_terminal()
+    terminal.simulate()
+
+    equipment = terminal.find_elements(container_objects.Stack_Equipment)
+    assert len(equipment) > 1 and len(set(map(id, equipment))) == len(equipment)
+
+
+def test_waiting_time_factor(container_terminal):
+    """Test that the waiting time factor is 0 in a year without berth capacity online (infinite occupancy)"""
+
+    import warnings
+    import numpy as np
+    from opentisim import container_system
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', RuntimeWarning)
+        factor = container_system.waiting_time_factor([np.inf, 0.5, np.inf], [1, 1, 0])
+    assert factor[0] == 0 and factor[1] > 0 and factor[2] == np.inf
+
+    # the berths planned in the first year are not online yet
+    terminal = container_terminal()
+    terminal.simulate(year_to=2021)
+    assert terminal.waiting_time(2020)[0] == 0
+
+
+def test_reefer_energy(container_terminal):
+    """Test that the reefer energy costs of the laden stacks follow the reefer slots of laden_reefer_stack_capacity"""
+
+    import pytest
+    from opentisim import container_objects
+
+    terminal = container_terminal(laden_stack='rmg', stack_equipment='rmg')
+    terminal.simulate()
+
+    stacks = terminal.find_elements(container_objects.Laden_Stack)
+    for year in [2021, 2025, 2029]:
+        online = [stack for stack in stacks if year >= stack.year_online]
+        reefer_slots = terminal.laden_reefer_stack_capacity(year)[5]
+        for stack in online:
+            energy = terminal.ledger.frame(stack).set_index('year').loc[year, 'energy']
+            assert energy == pytest.approx(reefer_slots / len(online) * stack.reefers_present * terminal.energy_price
+                                           * 24 * 365)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the `opentisim.core` functions."""
+
+
+def test_NPV_surface():
+    """Test that the NPV surface matches discounting each grid point separately"""
+
+    import numpy as np
+    import pandas as pd
+    from opentisim import core
+
+    cash_flows = pd.DataFrame({'year': [2020, 2021, 2022],
+                               'capex': [100., 50., 0.],
+                               'maintenance': [0., 10., 10.],
+                               'revenues': [0., 80., 90.]})
+
+    surface = core.NPV_surface(cash_flows, Gearing=[40, 60], inflation=[0.01, 0.02, 0.03])
+    assert len(surface) == 6
+
+    for point in surface.itertuples():
+        WACC_real = (core.WACC_nominal(Gearing=point.Gearing) + 1) / (point.inflation + 1) - 1
+        net_cash_flow = np.array([-100., 20., 80.])
+        assert np.isclose(point.NPV, np.sum(net_cash_flow / (1 + WACC_real) ** np.arange(3)))
+
+
+def test_occupancy_to_waitingfactor_vectorized():
+    """Test that arrays of occupancies and servers give the same waiting factors as scalar calls"""
+
+    import numpy as np
+    from opentisim import core
+
+    occupancy = np.array([.2, .4, .6, .8])
+    nr_of_servers = np.array([1, 3, 3, 10])
+
+    waiting_factor = core.occupancy_to_waitingfactor(occupancy=occupancy, nr_of_servers_chk=nr_of_servers)
+    expected = [core.occupancy_to_waitingfactor(occupancy=o, nr_of_servers_chk=n)
+                for o, n in zip(occupancy, nr_of_servers)]
+
+    assert np.allclose(waiting_factor, expected)
+    assert ('E2/E2/n', 3, 6) in core.waitingfactor_coefficients
+
+
+def test_waitingfactor_to_occupancy():
+    """Test that waitingfactor_to_occupancy inverts occupancy_to_waitingfactor"""
+
+    import numpy as np
+    from opentisim import core
+
+    occupancy = np.array([.45, .6, .75, .85])
+    for kendall, nr_of_servers in [('E2/E2/n', 4), ('M/E2/n', 2), ('E2/E2/n', 12)]:
+        factor = core.occupancy_to_waitingfactor(occupancy, nr_of_servers, kendall=kendall)
+        assert np.allclose(core.waitingfactor_to_occupancy(factor, nr_of_servers, kendall=kendall), occupancy)
+
+
+def test_required_elements():
+    """Test that the number of required elements matches adding elements one at a time"""
+
+    from opentisim import core
+
+    for required_capacity, capacity_planned, capacity in [(0, 0, 320), (1000, 0, 320), (960, 0, 320), (10.3, 0.1, 0.1),
+                                                          (5000.5, 4000, 480), (100, 200, 100)]:
+        number = 0
+        while required_capacity > capacity_planned + number * capacity:
+            number += 1
+        assert core.required_elements(required_capacity, capacity_planned, capacity) == number
+
+
+def test_ratio_elements():
+    """Test that the number of elements per served element matches adding elements one at a time"""
+
+    from opentisim import core
+
+    for served, ratio, online, planned in [(0, 5, 0, 0), (1, 5, 0, 0), (3, 4, 5, 12), (3, 4, 12, 12), (2, 3, 4, 7),
+                                           (4, 0.5, 0, 1)]:
+        number = 0
+        elements = online
+        while served > elements // ratio:
+            number += 1
+            elements = planned + number
+        assert core.ratio_elements(served, ratio, online, planned) == number
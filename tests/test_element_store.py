@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the element store of `opentisim`."""
+
+
+def test_element_store_find():
+    """Test that the per class index follows the list"""
+
+    import pickle
+    from opentisim import container_objects
+    from opentisim import container_defaults
+    from opentisim.element_store import ElementStore
+
+    elements = ElementStore([container_objects.Berth(**container_defaults.berth_data)])
+    assert len(elements.find(container_objects.Berth)) == 1
+    assert elements.find(container_objects.Gate) == []
+
+    found = elements.find(container_objects.Berth)
+    snapshot = list(found)
+    elements.append(container_objects.Berth(**container_defaults.berth_data))
+    elements.append(container_objects.Gate(**container_defaults.gate_data))
+    assert len(snapshot) == 1 and len(found) == 2 and found == elements.find(container_objects.Berth)
+    assert len(elements.find(container_objects.Berth)) == 2
+    assert len(elements.find(container_objects.Gate)) == 1
+
+    del elements[0]
+    assert len(elements.find(container_objects.Berth)) == 1
+    assert elements.revision == 1
+
+    copy = pickle.loads(pickle.dumps(elements))
+    assert isinstance(copy, ElementStore) and len(copy.find(container_objects.Gate)) == 1
+
+
+def test_element_store_view():
+    """Test that the elements found cannot be changed and that changing a copy leaves the index intact"""
+
+    import pytest
+    from opentisim import container_objects
+    from opentisim import container_defaults
+    from opentisim.element_store import ElementStore
+
+    elements = ElementStore([container_objects.Berth(**container_defaults.berth_data),
+                             container_objects.Gate(**container_defaults.gate_data)])
+    berths = elements.find(container_objects.Berth)
+    with pytest.raises(AttributeError):
+        berths.clear()
+    with pytest.raises(TypeError):
+        berths[0] = None
+
+    copy = list(berths)
+    copy.clear()
+    berths[:].clear()
+    (berths + elements.find(container_objects.Gate)).clear()
+    assert len(elements.find(container_objects.Berth)) == 1 and elements.planned(container_objects.Berth) == 1
+    assert berths != [] and berths == elements[:1]
+
+
+def test_element_store_online():
+    """Test that the year online timeline matches a scan of the elements"""
+
+    from opentisim import container_objects
+    from opentisim import container_defaults
+    from opentisim.element_store import ElementStore
+
+    elements = ElementStore()
+    for year_online, capacity in [(2020, 10), (2022, 20), (2021, 40)]:
+        berth = container_objects.Berth(**container_defaults.berth_data)
+        berth.year_online = year_online
+        berth.capacity = capacity
+        elements.append(berth)
+
+        for year in range(2019, 2024):
+            assert elements.online(container_objects.Berth, year) == \
+                sum(year >= element.year_online for element in elements)
+            assert elements.online(container_objects.Berth, year, 'capacity') == \
+                sum(element.capacity for element in elements if year >= element.year_online)
+
+    assert elements.planned(container_objects.Berth) == 3
+    assert elements.planned(container_objects.Berth, 'capacity') == 70
+    assert elements.online(container_objects.Gate, 2030) == 0
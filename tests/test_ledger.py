@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the cash flow ledger of `opentisim`."""
+
+
+def test_ledger_cashflows():
+    """Test that the ledger reproduces the per element cash flows"""
+
+    from opentisim import agribulk_objects
+    from opentisim import agribulk_defaults
+    from opentisim.ledger import CashflowLedger
+
+    ledger = CashflowLedger(startyear=2020, lifecycle=5)
+
+    berth = agribulk_objects.Quay_wall(**agribulk_defaults.quay_wall_data)
+    berth.capex = 1000
+    berth.maintenance = 10
+    berth.insurance = 5
+    berth.labour = 0
+    berth.delivery_time = 2
+    berth.year_online = 2022
+    ledger.add(berth)
+    ledger.set(berth, 2023, 'energy', 3)
+
+    df = berth.df
+    assert list(df['year']) == [2020, 2021, 2022, 2023, 2024]
+    assert list(df['capex']) == [600, 400, 0, 0, 0]
+    assert list(df['maintenance']) == [0, 0, 10, 10, 10]
+    assert list(df['energy']) == [0, 0, 0, 3, 0]
+
+    # an element that is listed twice counts twice
+    totals = ledger.totals([berth, berth])
+    assert totals[:, ledger.column['insurance']].tolist() == [0, 0, 10, 10, 10]
+
+
+def test_ledger_running_totals():
+    """Test that the running totals follow appended elements and changed cash flows"""
+
+    from opentisim import agribulk_objects
+    from opentisim import agribulk_defaults
+    from opentisim.ledger import CashflowLedger
+
+    ledger = CashflowLedger(startyear=2020, lifecycle=3)
+    elements = []
+
+    for year_online in [2021, 2022]:
+        conveyor = agribulk_objects.Conveyor_Quay(**agribulk_defaults.quay_conveyor_data)
+        conveyor.capex = 100
+        conveyor.maintenance = 1
+        conveyor.insurance = 0
+        conveyor.labour = 0
+        conveyor.delivery_time = 1
+        conveyor.year_online = year_online
+        ledger.add(conveyor)
+        elements.append(conveyor)
+
+        ledger.set(conveyor, 2022, 'energy', 5)
+        assert ledger.totals(elements)[:, ledger.column['energy']].tolist() == [0, 0, 5 * len(elements)]
+
+    ledger.set(elements[0], 2022, 'energy', 2)
+    totals = ledger.totals(elements)
+    assert totals[:, ledger.column['energy']].tolist() == [0, 0, 7]
+    assert totals[:, ledger.column['capex']].tolist() == [100, 100, 0]
+    assert totals[:, ledger.column['maintenance']].tolist() == [0, 1, 2]
+
+    # the third row repeats the first element and is ignored, 2023 is outside the lifecycle
+    values = [[1, 2, 3, 4], [5, 6, 7, 8], [0, 0, 0, 0]]
+    where = [[True, True, False, True], [True, True, True, True], [True, True, True, True]]
+    ledger.set_block(elements + [elements[0]], [2020, 2021, 2022, 2023], 'energy', values, where=where)
+    assert ledger.totals(elements)[:, ledger.column['energy']].tolist() == [6, 8, 9]
+    assert ledger.frame(elements[0])['energy'].tolist() == [1, 2, 2]
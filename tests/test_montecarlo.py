@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the Monte Carlo runner of `opentisim`."""
+
+
+def container_scenario(terminal, generator):
+    """Random demand scenario of a container terminal"""
+
+    from opentisim import container_objects
+
+    for commodity in terminal.find_elements(container_objects.Commodity):
+        commodity.scenario_random(startyear=2020, lifecycle=8, seed=generator)
+
+
+def test_run(container_terminal):
+    """Test that the runs do not depend on the number of processes"""
+
+    from opentisim import montecarlo
+
+    def factory():
+        return container_terminal(lifecycle=8, demand=400_000)
+
+    summaries = list(montecarlo.run(factory, container_scenario, 4, seed=7, processes=1))
+    assert [summary['run'] for summary in summaries] == [0, 1, 2, 3]
+    assert len(set(summary['NPV'] for summary in summaries)) == 4
+    assert len(summaries[0]['elements']['Berth']) == 8
+
+    parallel = list(montecarlo.run(factory, container_scenario, 4, seed=7, processes=2))
+    assert [summary['NPV'] for summary in parallel] == [summary['NPV'] for summary in summaries]
+
+    table = montecarlo.percentiles(summaries, q=(0, 50, 100))
+    assert table.loc[0, 'NPV'] == min(summary['NPV'] for summary in summaries)
+
+
+def test_compare(container_terminal):
+    """Test that configurations are compared over common random numbers"""
+
+    import pytest
+    from opentisim import montecarlo
+
+    def factory(stack_equipment):
+        return lambda: container_terminal(lifecycle=8, demand=400_000, stack_equipment=stack_equipment,
+                                          laden_stack=stack_equipment)
+
+    factories = {'rs': factory('rs'), 'rs again': factory('rs'), 'rtg': factory('rtg')}
+    table = montecarlo.compare(factories, container_scenario, 3, seed=5, antithetic=True, processes=1)
+
+    assert table.loc['rs again', 'difference'] == 0 and table.loc['rs again', 'upper'] == 0
+    assert table.loc['rtg', 'difference'] == pytest.approx(table.loc['rtg', 'NPV'] - table.loc['rs', 'NPV'])
+    assert table.loc['rtg', 'lower'] <= table.loc['rtg', 'difference'] <= table.loc['rtg', 'upper']
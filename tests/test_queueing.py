@@ -0,0 +1,30 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the `opentisim.queueing` module."""
+
+
+def test_erlang_c():
+    """Test the Erlang-C formula against a hand calculation (M/M/2 at 50% occupancy)"""
+
+    import numpy as np
+    from opentisim import queueing
+
+    assert np.isclose(queueing.erlang_c(.5, 2), 1 / 3)
+    assert np.isclose(queueing.waiting_factor(.5, 2, 'M/M/n'), 1 / 3)
+
+
+def test_waiting_factor_groenveld():
+    """Test the approximations against the Groenveld (2007) tables"""
+
+    import numpy as np
+    from opentisim import core
+    from opentisim import queueing
+
+    for kendall, min_occupancy, tolerance in [('M/E2/n', .3, .12), ('E2/E2/n', .6, .3)]:
+        utilisation, nr_of_servers, data = core.waitingfactor_tables[kendall]
+        occupancy, servers = np.meshgrid(utilisation, nr_of_servers, indexing='ij')
+        factor = queueing.waiting_factor(occupancy, servers, kendall)
+
+        check = (occupancy >= min_occupancy) & (data > .05)
+        assert np.all(np.abs(factor[check] - data[check]) <= tolerance * data[check])
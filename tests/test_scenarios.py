@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the scenario generation of `opentisim`."""
+
+
+def test_scenario_random():
+    """Test that scenario_random gives the same volumes as the year by year loop it replaced"""
+
+    import numpy as np
+    import pandas as pd
+    from opentisim import container_objects
+    from opentisim import container_defaults
+
+    container = container_objects.Commodity(**container_defaults.container_data)
+    container.historic_data = pd.DataFrame(data={'year': [2018], 'volume': [1_000_000]})
+
+    np.random.seed(3)
+    container.scenario_random(startyear=2019, lifecycle=10)
+
+    np.random.seed(3)
+    volume, volumes = 1_000_000, []
+    for year in range(10):
+        volume = volume * (1.02 + np.random.normal(0.01, 0.065, 1))
+        volumes.append(int(volume[0]))
+
+    assert container.scenario_data['volume'].tolist() == volumes
+    assert container.scenario_data['year'].tolist() == list(range(2019, 2029))
+
+
+def test_random_growth():
+    """Test that batches are reproducible and that spawned streams are independent"""
+
+    import numpy as np
+    from opentisim import scenarios
+
+    paths = scenarios.random_growth(1000, lifecycle=5, n=100, seed=42)
+    assert paths.shape == (100, 5)
+    assert np.array_equal(paths, scenarios.random_growth(1000, lifecycle=5, n=100, seed=42))
+
+    first, second = scenarios.generators(42, 2)
+    assert not np.array_equal(scenarios.random_growth(1000, 5, 100, seed=first),
+                              scenarios.random_growth(1000, 5, 100, seed=second))
+    assert np.array_equal(scenarios.random_growth(1000, 5, 100, seed=scenarios.generators(42, 2)[1]),
+                          scenarios.random_growth(1000, 5, 100, seed=scenarios.generators(42, 2)[1]))
+
+
+def test_scenario_volume():
+    """Test that the year index of the scenario volumes follows a reassigned scenario"""
+
+    import pandas as pd
+    import pytest
+    from opentisim import agribulk_objects
+    from opentisim import agribulk_defaults
+
+    maize = agribulk_objects.Commodity(**agribulk_defaults.maize_data)
+    maize.scenario_data = pd.DataFrame(data={'year': [2020, 2021, 2023], 'volume': [100, 200, 300]})
+    assert maize.scenario_volume(2021) == 200
+    with pytest.raises(ValueError):
+        maize.scenario_volume(2022)
+
+    maize.scenario_data = pd.DataFrame(data={'year': [2021, 2022], 'volume': [400, 500]})
+    assert maize.scenario_volume(2022) == 500
+    with pytest.raises(ValueError):
+        maize.scenario_volume(2020)
+
+
+def test_scenario_bank(tmp_path):
+    """Test that a commodity bound to a path of a scenario bank uses the volumes of that path"""
+
+    import pickle
+    import numpy as np
+    from opentisim import agribulk_objects
+    from opentisim import agribulk_defaults
+    from opentisim import scenarios
+
+    volumes = scenarios.random_growth(1000, lifecycle=5, n=10, seed=1)
+    bank = scenarios.ScenarioBank.save(str(tmp_path / 'bank'), volumes, startyear=2020)
+    assert isinstance(bank.volumes, np.memmap)
+    assert len(bank) == 10 and np.array_equal(bank[3], volumes[3])
+
+    maize = agribulk_objects.Commodity(**agribulk_defaults.maize_data)
+    maize.bind_scenario(pickle.loads(pickle.dumps(bank)), 3)
+    assert maize.scenario_volume(2022) == volumes[3, 2]
+    assert maize.scenario_data['volume'].tolist() == volumes[3].tolist()
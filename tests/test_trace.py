@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the decision trace of `opentisim`."""
+
+
+def test_decision_trace(tmp_path, container_terminal):
+    """Test that the trace records every element added by the investment methods"""
+
+    import json
+    from opentisim import container_objects
+    from opentisim.trace import DecisionTrace
+
+    path = tmp_path / 'trace.jsonl'
+    terminal = container_terminal(demand=400_000, trace=DecisionTrace(path))
+    terminal.simulate()
+    terminal.trace.close()
+
+    frame = terminal.trace.frame()
+    assert list(frame.columns) == list(DecisionTrace.fields)
+    counts = frame.groupby('element')['count'].sum()
+    for obj in [container_objects.Berth, container_objects.Quay_wall, container_objects.Laden_Stack,
+                container_objects.Stack_Equipment, container_objects.Horizontal_Transport, container_objects.Gate]:
+        assert counts[obj.__name__] == len(terminal.find_elements(obj))
+
+    berths = frame[frame.element == 'Berth']
+    assert (berths.trigger == 'berth_occupancy').all() and (berths.value > berths.threshold).all()
+
+    with open(path) as file:
+        events = [json.loads(line) for line in file]
+    assert len(events) == len(terminal.trace) and events[0]['year'] == 2020
+
+
+def test_decision_trace_copies(tmp_path, container_terminal):
+    """Test that the trace closes its file as a context manager and that forks record in memory only"""
+
+    from opentisim.trace import DecisionTrace
+
+    path = tmp_path / 'trace.jsonl'
+    with DecisionTrace(path, run='base') as trace:
+        terminal = container_terminal(trace=trace)
+        terminal.simulate(year_to=2024)
+        branch = terminal.fork()
+    assert trace._file is None
+
+    branch.trace.run = 'branch'
+    branch.simulate(year_from=2025)
+    assert branch.trace.path is None and len(branch.trace) > len(trace)
+    assert set(branch.trace.frame().run) == {'base', 'branch'}
+
+    with open(path) as file:
+        assert len(file.readlines()) == len(trace)
+
+
+def test_decision_trace_echo(capsys, container_terminal):
+    """Test that a terminal with debug = True prints its investment decisions through an echoing trace"""
+
+    terminal = container_terminal(demand=400_000, debug=True)
+    assert terminal.trace.echo
+
+    terminal.simulate(year_to=2021)
+    output = capsys.readouterr().out
+    assert '  *** add 1 Berth to elements (berth_occupancy: ' in output
+    assert output.count('  *** add ') == len(terminal.trace)